@@ -3,10 +3,16 @@
 # APPLICATION STREAMLIT : ANALYSE DE DISCOURS
 # ============================================
 
+import html
+import os
+
 import streamlit as st
 from src.analyzer import SpeechAnalyzer
 from src.feedback_generator import FeedbackGenerator
-from nltk.tokenize import word_tokenize
+from src.cache import ResultCache
+from src.editing import EditSession
+from src.sentences import LONG_SENTENCE_TOKENS, SentenceIndex
+from src.server import AnalysisClient
 import nltk
 
 # Télécharger les ressources NLTK nécessaires
@@ -22,6 +28,88 @@ def download_nltk_data():
 # Exécuter le téléchargement au démarrage
 download_nltk_data()
 
+# Cache des résultats partagé entre les reruns et les sessions :
+# un discours déjà analysé n'est pas réanalysé
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(max_entries=256)
+
+# Analyseur et générateur de feedback créés une seule fois pour toutes
+# les sessions : lexiques, expressions compilées et modèles NLTK sont
+# prêts avant la première analyse
+@st.cache_resource
+def get_analyzer():
+    return SpeechAnalyzer(cache=get_result_cache()).warmup()
+
+@st.cache_resource
+def get_feedback_generator():
+    return FeedbackGenerator(cache=get_result_cache())
+
+# Service d'analyse partagé (python -m src.server) si SPEECH_ANALYSIS_URL
+# est défini : les modèles y sont déjà chargés pour toutes les interfaces
+@st.cache_resource
+def get_analysis_client():
+    url = os.environ.get('SPEECH_ANALYSIS_URL')
+    return AnalysisClient(url) if url else None
+
+def analyze_locally(text: str):
+    results = get_edit_session().analyze(text, sentence_index=True)
+    return results, get_feedback_generator().generate(
+        {key: value for key, value in results.items() if key != 'sentences'})
+
+def analyze_text(text: str):
+    """
+    Analyse le discours et génère le feedback, sur le service partagé
+    s'il est configuré (repli sur l'analyse locale s'il ne répond pas).
+    """
+    client = get_analysis_client()
+    if client is None:
+        return analyze_locally(text)
+    try:
+        response = client.analyze(text, sentence_index=True)
+    except Exception as e:
+        st.warning(f"Service d'analyse indisponible ({e}) : analyse locale")
+        return analyze_locally(text)
+    return response['analysis'], response['feedback']
+
+# Session d'édition propre à chaque utilisateur : entre deux analyses,
+# seules les phrases modifiées sont retokenisées
+def get_edit_session():
+    if 'edit_session' not in st.session_state:
+        st.session_state.edit_session = EditSession(get_analyzer())
+    return st.session_state.edit_session
+
+def highlight_text(text: str, index: SentenceIndex) -> str:
+    """
+    Met en forme le discours en HTML : phrases trop longues surlignées
+    en orange, mots de remplissage en rouge (positions de l'index).
+    """
+    long_sentences = {sentence['index'] for sentence in index.long_sentences()}
+    fillers = index.fillers()
+    parts = []
+    position = 0
+    filler = 0
+    for sentence in index:
+        start, end = sentence['start'], sentence['end']
+        parts.append(html.escape(text[position:start]))
+        segment = []
+        cursor = start
+        while filler < len(fillers) and fillers[filler][0] < end:
+            filler_start, filler_end = fillers[filler]
+            segment.append(html.escape(text[cursor:filler_start]))
+            segment.append('<mark style="background-color:#ffb3b3">'
+                           f'{html.escape(text[filler_start:filler_end])}</mark>')
+            cursor = filler_end
+            filler += 1
+        segment.append(html.escape(text[cursor:end]))
+        segment = ''.join(segment)
+        if sentence['index'] in long_sentences:
+            segment = f'<span style="background-color:#ffe0b3">{segment}</span>'
+        parts.append(segment)
+        position = end
+    parts.append(html.escape(text[position:]))
+    return ''.join(parts)
+
 # Configuration de la page
 st.set_page_config(
     page_title="Analyse de Discours IA",
@@ -74,7 +162,7 @@ text_input = st.text_area(
 
 # Compteur de mots
 if text_input:
-    word_count = len(word_tokenize(text_input, language='french'))
+    word_count = get_edit_session().word_count(text_input)
     st.caption(f"📊 {word_count} mots")
 
 # Bouton d'analyse
@@ -88,10 +176,8 @@ if analyze_button:
         st.warning("⚠️ Le texte est trop court (minimum 10 mots)")
     else:
         with st.spinner("Analyse en cours..."):
-            analyzer = SpeechAnalyzer()
-            feedback_gen = FeedbackGenerator()
-            results = analyzer.analyze(text_input)
-            feedback = feedback_gen.generate(results)
+            results, feedback = analyze_text(text_input)
+            sentences = SentenceIndex.from_dict(results.pop('sentences'))
         
         st.success("✅ Analyse terminée !")
         st.divider()
@@ -139,6 +225,26 @@ if analyze_button:
             for i, reco in enumerate(feedback['recommandations'], 1):
                 st.info(f"**{i}.** {reco}")
         
+        # Phrases à revoir : surlignage à partir de l'index des phrases
+        st.divider()
+        st.subheader("🔦 Phrases à revoir")
+        st.caption(f"🟧 Phrase de plus de {LONG_SENTENCE_TOKENS} mots · 🟥 Mot de remplissage")
+        st.markdown(highlight_text(text_input, sentences), unsafe_allow_html=True)
+        longest = [sentence for sentence in sentences.worst(3)
+                   if sentence['token_count'] > LONG_SENTENCE_TOKENS]
+        if longest:
+            st.markdown("**Phrases les plus longues :**")
+            for sentence in longest:
+                st.warning(f"({sentence['token_count']} mots) "
+                           f"{text_input[sentence['start']:sentence['end']]}")
+        
+        # Lisibilité
+        clarity = results['clarity']
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Lisibilité (Kandel-Moles)", clarity['readability_score'])
+        col_b.metric("Syllabes par mot", clarity['syllables_per_word'])
+        col_c.metric("Mots longs", f"{clarity['long_word_ratio']} %")
+
         # Détails techniques
         st.divider()
         with st.expander("📈 Détails de l'analyse (avancé)"):
@@ -152,6 +258,8 @@ if analyze_button:
             st.json(results['clarity'])
             st.markdown("### Structure")
             st.json(results['structure'])
+            st.markdown("### Cache")
+            st.json(get_result_cache().stats())
 
 # Pied de page
 st.divider()
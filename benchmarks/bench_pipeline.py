@@ -0,0 +1,195 @@
+# coding: utf-8
+# ============================================
+# BANCS D'ESSAI : PIPELINE D'ANALYSE
+# ============================================
+# Mesure le temps (débit en mots/s) et la mémoire maximale de chaque
+# étape du pipeline sur des discours synthétiques de 100 à 100 000 mots
+# construits à partir de data/exemples_discours.txt.
+#
+# Utilisation (depuis la racine du projet) :
+#   python -m benchmarks.bench_pipeline
+#   python -m benchmarks.bench_pipeline --sizes 100 1000 --output bench.json
+#   python -m benchmarks.bench_pipeline --baseline bench.json --max-regression 0.25
+#
+# Avec --baseline, le script se termine en erreur (code 1) si une mesure
+# est plus lente que la référence au-delà de la tolérance : il sert de
+# garde-fou avant de toucher aux parties critiques.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.analyzer import SpeechAnalyzer  # noqa: E402
+from src.document import Document  # noqa: E402
+from src.feedback_generator import FeedbackGenerator  # noqa: E402
+from src.utils import clean_text  # noqa: E402
+
+SAMPLE_PATH = os.path.join(ROOT, 'data', 'exemples_discours.txt')
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+# Phrases ajoutées au texte d'exemple pour solliciter toutes les étapes
+# (mots de remplissage, mots de sentiment, transitions)
+VARIATIONS = [
+    "Euh, du coup, c'est un excellent résultat.",
+    "Cependant, en fait, ce problème reste difficile.",
+    "Bon, voilà, nous avons un projet efficace et réussi.",
+    "Par conséquent, disons que la qualité est au rendez-vous.",
+]
+
+
+def build_transcript(n_words: int) -> str:
+    """
+    Construit un discours synthétique d'environ n_words mots.
+
+    Le texte d'exemple alterne avec des phrases de variation, de façon
+    déterministe pour que les mesures restent comparables.
+    """
+    with open(SAMPLE_PATH, encoding='utf-8') as f:
+        sample = clean_text(f.read())
+    blocks = [sample] + VARIATIONS
+    parts = []
+    count = 0
+    index = 0
+    while count < n_words:
+        block = blocks[index % len(blocks)]
+        parts.append(block)
+        count += len(block.split())
+        index += 1
+    return ' '.join(parts)
+
+
+def build_cases(analyzer: SpeechAnalyzer, feedback_generator: FeedbackGenerator, text: str):
+    """
+    Retourne les mesures à effectuer : nom -> fonction sans argument.
+    """
+    doc = Document(text)
+    results = analyzer.analyze(text)
+    return {
+        'clean_text': lambda: clean_text(text),
+        'document': lambda: Document(text),
+        'stats': lambda: analyzer._get_basic_stats(doc),
+        'sentiment': lambda: analyzer._analyze_sentiment(doc),
+        'fillers': lambda: analyzer._detect_fillers(doc),
+        'clarity': lambda: analyzer._analyze_clarity(doc),
+        'structure': lambda: analyzer._analyze_structure(doc),
+        'analyze': lambda: analyzer.analyze(text),
+        'generate': lambda: feedback_generator.generate(results),
+    }
+
+
+def time_case(func, min_time: float = 0.5, min_runs: int = 3, max_runs: int = 1000) -> list:
+    """
+    Exécute func plusieurs fois et retourne les durées mesurées (secondes).
+    """
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < max_runs and (
+            len(durations) < min_runs or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def peak_memory(func) -> int:
+    """
+    Mesure la mémoire maximale allouée (octets) pendant un appel.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes: list, min_time: float = 0.5) -> list:
+    """
+    Lance toutes les mesures et retourne une ligne par (étape, taille).
+    """
+    analyzer = SpeechAnalyzer().warmup()
+    feedback_generator = FeedbackGenerator()
+    rows = []
+    for size in sizes:
+        text = build_transcript(size)
+        n_words = len(text.split())
+        for name, func in build_cases(analyzer, feedback_generator, text).items():
+            durations = time_case(func, min_time=min_time)
+            median = statistics.median(durations)
+            rows.append({
+                'case': name,
+                'words': n_words,
+                'runs': len(durations),
+                'median_s': median,
+                'min_s': min(durations),
+                'words_per_s': n_words / median if median else float('inf'),
+                'peak_bytes': peak_memory(func),
+            })
+            print(f"{name:>10} {n_words:>7} mots  {median * 1000:10.3f} ms  "
+                  f"{rows[-1]['words_per_s']:14,.0f} mots/s  "
+                  f"{rows[-1]['peak_bytes'] / 1024:10.1f} Kio", file=sys.stderr)
+    return rows
+
+
+def compare(rows: list, baseline: list, max_regression: float) -> list:
+    """
+    Compare les mesures à une référence.
+
+    Retourne:
+        list : Messages décrivant les régressions au-delà de la tolérance
+    """
+    reference = {(row['case'], row['words']): row for row in baseline}
+    regressions = []
+    for row in rows:
+        previous = reference.get((row['case'], row['words']))
+        if previous is None:
+            continue
+        ratio = row['median_s'] / previous['median_s'] if previous['median_s'] else 1.0
+        if ratio > 1 + max_regression:
+            regressions.append(
+                f"{row['case']} ({row['words']} mots) : {previous['median_s'] * 1000:.3f} ms "
+                f"-> {row['median_s'] * 1000:.3f} ms (x{ratio:.2f})"
+            )
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Bancs d'essai du pipeline d'analyse.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="tailles des discours en mots")
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help="durée minimale de mesure par cas (secondes)")
+    parser.add_argument('--output', help="fichier JSON où écrire les mesures")
+    parser.add_argument('--baseline', help="fichier JSON de référence à comparer")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="ralentissement toléré par rapport à la référence (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    rows = run(args.sizes, min_time=args.min_time)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'results': rows}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(rows, baseline, args.max_regression)
+        for message in regressions:
+            print(f"RÉGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
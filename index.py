@@ -6,59 +6,183 @@ import speech_recognition as sr
 import os
 import datetime
 import time
+import io
+from src.analyzer import SpeechAnalyzer
+from src.streaming import IncrementalAnalyzer
+from src.rolling import RollingWindow
+from src.transcription import LISTEN_TIMEOUT, TranscriptionJob, TranscriptionService
+from src.audio import (analyze_audio, audio_duration, load_audio, spoken_word_count,
+                       stitch_segments, transcribe_file)
+from src.recognizers import BackendChain, get_backend
+
+# debut des messages d'echec: un morceau dont le texte commence ainsi n'est pas
+# analyse par collect_transcription (les erreurs du service arrivent dans chunk.error)
+TRANSCRIPTION_ERRORS = (
+    "Desole", "Aucune parole", "Erreur", "Une erreur", "API non specifiee"
+)
+
+# objets longs a construire, crees une seule fois et partages entre les reruns
+@st.cache_resource
+def get_analyzer():
+    # modeles NLTK et lexiques charges avant la premiere phrase reconnue
+    return SpeechAnalyzer().warmup()
+
+# moteur de reconnaissance associe a chaque choix d'API (voir src/recognizers.py)
+API_BACKENDS = {
+    "Google Speech Recognition (Web)": "google",
+    "Sphinx (Hors Ligne)": "sphinx",
+    "Microsoft Azure": "azure",
+    "Wit.ai (Meta)": "wit",
+    "Autres API (Deepgram, AssemblyAI)": "google",
+}
+
+# avertissements affiches quand la cle d'une API n'est pas configuree
+API_WARNINGS = {
+    "Microsoft Azure": "Cette API necessite la cle d'abonnement azure (variable AZURE_SPEECH_KEY).",
+    "Wit.ai (Meta)": "Ctette API necessite la cle du developpeur de Wit.ai (variable WIT_AI_KEY).",
+    "Autres API (Deepgram, AssemblyAI)": "Les API externes necessite des bibliotheques supplementaires.",
+}
+
+# choix "pas d'API de secours"
+NO_FALLBACK = "Aucune"
+
+# duree maximale d'un morceau ecoute par le service de transcription (secondes)
+PHRASE_TIME_LIMIT = 10
+
+# durees possibles de la fenetre glissante des indicateurs en direct (secondes)
+ROLLING_WINDOWS = [30, 60, 120, 300]
+
+# moteurs de reconnaissance: l'API choisie puis l'API de secours en cas d'erreur
+# de service. cree une seule fois: les connexions HTTP sont reutilisees
+@st.cache_resource
+def get_backend_chain(api_choice, fallback_choice, language_code):
+    backends = [get_backend(API_BACKENDS[api_choice])]
+    if fallback_choice not in (NO_FALLBACK, None, api_choice):
+        backends.append(get_backend(API_BACKENDS[fallback_choice]))
+    return BackendChain(backends, language_code)
+
+# affiche l'avertissement de l'API choisie si elle n'est pas utilisable telle quelle
+def show_api_warning(api_choice, chain):
+    if api_choice in API_WARNINGS and (not chain.backends[0].configured or api_choice.startswith("Autres")):
+        st.warning(API_WARNINGS[api_choice])
+
+# sources audio possibles
+MICROPHONE_SOURCE = "Microphone"
+FILE_SOURCE = "Fichier audio (WAV/FLAC)"
+
+# transcrit un enregistrement envoye par l'utilisateur: decoupage aux silences,
+# reconnaissance hors ligne en parallele (sphinx), puis analyse du texte recolle
+def transcribe_uploaded_file(uploaded_file, language_code):
+    with st.spinner(f"Transcription hors ligne de {uploaded_file.name}..."):
+        try:
+            # audio lu une seule fois: decoupage et mesure du debit et des pauses
+            audio = load_audio(io.BytesIO(uploaded_file.getvalue()))
+            segments = transcribe_file(audio, language=language_code or "en-US")
+        except Exception as e:
+            st.error(f"Erreur lors de la lecture du fichier audio:{e}")
+            return
+    text = stitch_segments(segments)
+    errors = [segment.error for segment in segments if segment.error]
+    if not text:
+        st.warning(errors[0] if errors else "Aucune parole detectee dans le fichier.")
+        return
+    if errors:
+        st.warning(f"{len(errors)} morceau(x) sur {len(segments)} n'ont pas pu etre transcrits.")
+    st.session_state.transcribed_text = text
+    st.session_state.api_used = "Sphinx (Hors Ligne)"
+    st.session_state.file_results = get_analyzer().analyze(text, audio=audio)
+    st.session_state.live_analyzer.feed(text)
+
+# affiche l'analyse du dernier fichier transcrit
+def show_file_results(results):
+    st.subheader("📊 Analyse du fichier")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Mots", results['stats']['word_count'])
+    col2.metric("Clarte", f"{results['clarity']['clarity_score']}/10")
+    col3.metric("Mots parasites", f"{results['fillers']['filler_rate_percent']}%")
+    col4.metric("Structure", f"{results['structure']['structure_score']}/10")
+    audio = results.get('audio')
+    if audio:
+        show_audio_metrics(audio)
+
+# affiche le debit et les pauses mesures sur l'audio
+def show_audio_metrics(audio):
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Mots par minute", audio['words_per_minute'])
+    col2.metric("Pauses", audio['pause_count'])
+    col3.metric("Pauses > 2 s", audio['long_pause_count'])
+    col4.metric("Silence", f"{audio['silence_ratio']}%")
+
+# lance l'ecoute et la transcription en arriere-plan: le script streamlit
+# n'est plus bloque et le morceau suivant est ecoute pendant la reconnaissance
+def start_transcription_job(chain):
+    # un recognizer par travail: listen() modifie son seuil d'energie, il
+    # n'est pas partage entre sessions (seule la session HTTP des moteurs l'est)
+    # listen_timeout court: pendant un silence, l'arret est pris en compte
+    # en une seconde au lieu d'attendre le debut d'une phrase
+    service = TranscriptionService(sr.Recognizer(), sr.Microphone, chain,
+                                   listen_timeout=LISTEN_TIMEOUT,
+                                   phrase_time_limit=PHRASE_TIME_LIMIT)
+    return TranscriptionJob(service).start()
+
+# recupere les morceaux reconnus depuis le dernier rerun: seuls les nouveaux
+# morceaux sont traites puis oublies (leur audio n'est pas garde), le texte
+# est ajoute a la transcription deja en session
+def collect_transcription(job):
+    texts = []
+    for chunk in job.drain():
+        if chunk.text:
+            texts.append(chunk.text)
+        if chunk.error:
+            st.warning(f"Morceau {chunk.index + 1} : {chunk.error}")
+        elif is_valid_transcription(chunk.text):
+            st.session_state.live_analyzer.update(chunk.text)
+            # debit et pauses de la derniere phrase, mesures sur son audio
+            st.session_state.last_utterance = analyze_audio(
+                chunk.audio, spoken_word_count(chunk.text)).to_dict()
+            # debit et tics de langage sur les dernieres secondes seulement
+            st.session_state.rolling_window.feed(chunk.text, chunk.captured_at,
+                                                 audio_duration(chunk.audio))
+        # audio libere des que debit et pauses sont mesures
+        chunk.audio = None
+    if texts:
+        st.session_state.transcribed_text = " ".join([st.session_state.transcribed_text] + texts).strip()
+
+# verifie qu'un texte est une vraie transcription et non un message d'erreur
+def is_valid_transcription(text):
+    return bool(text) and not text.startswith(TRANSCRIPTION_ERRORS)
+
+# affiche les indicateurs de coaching mis a jour a chaque phrase reconnue
+def show_live_metrics(live_analyzer):
+    if live_analyzer.chunk_count == 0:
+        return
+    results = live_analyzer.results()
+    st.subheader("📈 Indicateurs en direct")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Mots", results['stats']['word_count'])
+    col2.metric("Mots parasites", f"{results['fillers']['filler_rate_percent']}%")
+    col3.metric("Sentiment", results['sentiment']['sentiment'])
+    col4.metric("Transitions", results['structure']['transition_count'])
+    # memes indicateurs sur la fenetre glissante: memoire constante
+    # meme pour une reunion d'une heure
+    rolling_window = st.session_state.rolling_window
+    window = rolling_window.results()
+    if st.session_state.get('last_utterance'):
+        st.caption("Derniere phrase")
+        show_audio_metrics(st.session_state.last_utterance)
+    if window['window']['words']:
+        st.caption(f"Sur les {rolling_window.seconds} dernieres secondes")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Mots par minute", window['window']['words_per_minute'])
+        col2.metric("Mots parasites", f"{window['fillers']['filler_rate_percent']}%")
+        col3.metric("Sentiment", window['sentiment']['sentiment'])
+        col4.metric("Mots", window['window']['words'])
+    if st.button("🔄 Réinitialiser les indicateurs"):
+        live_analyzer.reset()
+        rolling_window.reset()
+        st.session_state.last_utterance = None
+        st.rerun()
 
-# definir une fonction de reconnaissence vocale
-def transcribe_speech (recognizer, source, api_choice, language_code):
-    
-    """ecoute l'audio et utilise l'API specifiee pour la trasncription"""
-    # ajustement au bruit ambiant
-    try:
-        # ecoute le bruit pandent 0.5 seconde pour ameliorer la qualite
-        recognizer.adjust_for_ambient_noise(source, duration=0.5)
-    except Exception as e:
-        st.error(f"Erreur lors de l'ajustement du bruit ambiant:{e}")
-        return "Erreur d'initiation audio."
-    
-    st.info("Parlez maintenant...") # Correction: st.infos -> st.info
-    
-    try:
-        # ecouter la parole
-        audio_text = recognizer.listen(source)
-    except sr.WaitTimeoutError: # Correction: st.WaitTimeoutError -> sr.WaitTimeoutError
-        return "Aucune parole detectee.Veuillez reessayer"
-    except Exception as e:
-        st.error(f"Erreur lors de l'ecoute:{e}")
-        return "Erreur lors de l'ecoute du microphone"
-    
-    st.info("Transcription en cours")
-            
-    try:
-        # utiliser l'API de reconnaissence vocale choisie
-        if api_choice == "Google Speech Recognition (Web)":
-            text = recognizer.recognize_google(audio_text, language=language_code)
-        elif api_choice == "Sphinx (Hors Ligne)":
-            text = recognizer.recognize_sphinx(audio_text, language=language_code) # Correction: recognise_sphinx -> recognize_sphinx
-        elif api_choice == "Microsoft Azure":
-            st.warning("Cette API necessite la cle d'abonnement azure.")
-            text = recognizer.recognize_azure(audio_text, language=language_code, key="VOTRE CLE AZURE") # Correction: lannguage -> language
-        elif api_choice == "Wit.ai (Meta)":
-            st.warning("Ctette API necessite la cle du developpeur de Wit.ai")
-            text = recognizer.recognize_wit(audio_text, key="VOTRE CLE WIT_AI") # Correction: recognise_wit -> recognize_wit
-        elif api_choice == "Autres API (Deepgram, AssemblyAI)":
-            st.warning("Les API externes necessite des bibliotheques supplementaires.")
-            text = recognizer.recognize_google(audio_text, language=language_code)
-        else:
-            text = "API non specifiee."
-            
-        return text
-    # gestion des erreurs specifiees
-    except sr.UnknownValueError:
-        return "Desole l'API n'a pas compris ce que vous avez dit."
-    except sr.RequestError as e: # Correction: suppression de l'exception précédente qui était en double
-        return f"Erreur de service ({api_choice}). Verifiez votre connexion ou votre cle API: {e}" 
-    except Exception as e:
-        return f"Une erreur inattendue s'est produite:{e}" # Ajout de la dernière exception générique
-    
 # fonction pour sauvegarder le text transcrit
 def save_transcription(text_to_save):
     # verifie si la transcription est valide avant de sauvegarder
@@ -99,9 +223,11 @@ def main():
     * Cliquez sur **▶️ Démarrer l'enregistrement**. L'application attendra que vous parliez.
     * Parlez clairement dans votre microphone après avoir vu le message **"Parlez maintenant..."**.
     * Le texte transcrit s'affichera au bas de la page.
+    * Les indicateurs en direct (débit en mots par minute, mots parasites, sentiment) sont aussi calculés sur les dernières secondes : la durée de cette fenêtre se règle dans la barre latérale.
+    * Pour un enregistrement (conférence, réunion), choisissez la source **Fichier audio** : le fichier WAV ou FLAC est découpé aux silences et transcrit hors ligne (Sphinx), sans micro ni réseau. Le débit (mots par minute), les pauses et la part de silence sont mesurés sur l'audio.
 
     ### 3. Contrôle et Sauvegarde
-    * Le bouton **⏸️ Arrêter Provisoirement** est une simulation pour indiquer que vous ne parlez plus.
+    * Le bouton **⏸️ Arrêter Provisoirement** arrête l'écoute en cours ; les morceaux déjà reconnus sont conservés.
     * Cliquez sur **💾 Enregistrer la transcription** pour sauvegarder le texte dans un fichier `.txt` unique dans le dossier `transcriptions/` sur votre ordinateur.
     """)
     st.markdown("---")
@@ -115,6 +241,14 @@ def main():
         st.session_state.is_running = False # controle letat denregistrement
     if 'api_used' not in st.session_state:
         st.session_state.api_used = "Google Speech Recognition (Web)" # Correction de l'étoile
+    if 'live_analyzer' not in st.session_state:
+        # analyse incrementale de toutes les phrases reconnues pendant la session
+        st.session_state.live_analyzer = IncrementalAnalyzer(get_analyzer())
+    if 'transcription_job' not in st.session_state:
+        # travail de transcription en arriere-plan (None si aucun)
+        st.session_state.transcription_job = None
+    if 'file_results' not in st.session_state:
+        st.session_state.file_results = None
         
         
     # barre laterale: configuration
@@ -141,31 +275,42 @@ def main():
     ]
     
     api_choice = st.sidebar.selectbox("Choisir l'API de reconnaissence", API_CHOICES, help="Les APIs autres que Google et Sphinx nécessitent des clés d'abonnement.") # Correction: slectbox -> selectbox
-    st.session_state.api_used = api_choice 
+    # API essayee automatiquement si la premiere est indisponible (RequestError)
+    fallback_choice = st.sidebar.selectbox("API de secours", [NO_FALLBACK] + [choice for choice in API_CHOICES if choice != api_choice])
+    chain = get_backend_chain(api_choice, fallback_choice, language_code)
+    # choix de la source audio
+    source_mode = st.sidebar.radio("Source audio", [MICROPHONE_SOURCE, FILE_SOURCE])
+    # duree de la fenetre glissante des indicateurs en direct
+    window_seconds = st.sidebar.select_slider("Fenetre des indicateurs (secondes)", ROLLING_WINDOWS, value=60)
+    if st.session_state.get('rolling_window') is None or st.session_state.rolling_window.seconds != window_seconds:
+        st.session_state.rolling_window = RollingWindow(get_analyzer(), seconds=window_seconds)
+    if source_mode == MICROPHONE_SOURCE:
+        st.session_state.api_used = api_choice 
     # zone principale: controle
     st.markdown("---")
+    if source_mode == FILE_SOURCE:
+        uploaded_file = st.file_uploader("Choisir un enregistrement", type=["wav", "flac", "aiff", "aif"])
     col1, col2, col3 = st.columns(3)
     
     with col1:
         # Démarrer la reconnaissance
-        if st.button("▶️ Démarrer l'enregistrement", type="primary", disabled=st.session_state.is_running):
+        if source_mode == FILE_SOURCE:
+            if st.button("📂 Transcrire le fichier", type="primary", disabled=(uploaded_file is None or st.session_state.is_running)):
+                transcribe_uploaded_file(uploaded_file, language_code)
+        elif st.button("▶️ Démarrer l'enregistrement", type="primary", disabled=st.session_state.is_running):
             st.session_state.is_running = True
-            r = sr.Recognizer()
-            # Utilisation de st.spinner pour une meilleure UX pendant l'écoute
-            with st.spinner(f"Écoute active en {lang_choice}..."):
-                with sr.Microphone() as source:
-                    text = transcribe_speech(r, source, api_choice, language_code)
-                    st.session_state.transcribed_text = text
-            st.session_state.is_running = False # Terminé
-            st.rerun() # Rafraîchit l'affichage du résultat
+            st.session_state.transcribed_text = ""
+            st.session_state.file_results = None
+            st.session_state.transcription_job = start_transcription_job(chain)
+            st.rerun() # Rafraîchit l'affichage pendant l'écoute
             
     with col2:
-        # Fonctionnalité Pause/Reprise (Simulée)
+        # Arrêt du travail de transcription en cours
         if st.session_state.is_running:
             if st.button("⏸️ Arrêter Provisoirement"):
+                st.session_state.transcription_job.cancel()
                 st.session_state.is_running = False
                 st.warning("Interruption demandée. Le flux audio va s'arrêter immédiatement.")
-                # Le st.rerun dans col1 gère l'arrêt après la transcription
         else:
             # Bouton inactif quand rien ne tourne
             st.button("⏸️ Pause (Inactif)", disabled=True)
@@ -176,6 +321,20 @@ def main():
             save_transcription(st.session_state.transcribed_text)
 
     st.markdown("---")
+
+    job = st.session_state.transcription_job
+    if job is not None:
+        show_api_warning(api_choice, chain)
+        # etat lu avant la recuperation: aucun morceau arrive entre les deux n'est perdu
+        finished = not job.running
+        collect_transcription(job)
+        if job.error is not None:
+            st.error(f"Erreur lors de l'ecoute du microphone:{job.error}")
+        if finished:
+            st.session_state.is_running = False
+            st.session_state.transcription_job = None
+        elif st.session_state.is_running:
+            st.info(f"Écoute active en {lang_choice}... Parlez maintenant.")
     
     # Affichage de la transcription
     if st.session_state.transcribed_text:
@@ -185,5 +344,15 @@ def main():
     elif not st.session_state.is_running:
         st.info("Prêt à commencer. Configurez les options à gauche et cliquez sur Démarrer.")
 
+    if st.session_state.file_results is not None:
+        show_file_results(st.session_state.file_results)
+
+    show_live_metrics(st.session_state.live_analyzer)
+
+    # relit les morceaux reconnus tant que le travail tourne
+    if st.session_state.transcription_job is not None:
+        time.sleep(0.5)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
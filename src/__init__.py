@@ -16,12 +16,29 @@ __author__ = 'Cheikh Niang'
 
 #import pour simplifier l'utilisation du package
 #cela permet d'importation depuis src
+#les modules ne sont importes qu'au premier acces (PEP 562):
+#"from src.utils import clean_text" ne charge ni nltk ni textblob
 
-from .analyzer import SpeechAnalyzer
-from .feedback_generator import FeedbackGenerator
+_LAZY_EXPORTS = {
+    'SpeechAnalyzer': '.analyzer',
+    'FeedbackGenerator': '.feedback_generator',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
 
 #liste des objets exportes publiquement
 #utiliser pas "from src import *"
 
 __all__ = ['SpeechAnalyzer','FeedbackGenerator']
-
@@ -5,18 +5,42 @@
 # Auteur : Cheikh Niang
 # Description : Analyse complète d'un discours avec techniques NLP
 
-import re
+from bisect import bisect_right
 from collections import Counter
-from textblob import TextBlob
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from functools import partial
 
-# Téléchargement des ressources NLTK si nécessaires
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    print("Téléchargement des ressources NLTK en cours...")
-    nltk.download('punkt')
+from .batch import _analyze_chunk, run_parallel
+from .cache import ResultCache
+from .document import Document
+from .lexicon import SentimentLexicon
+from .matcher import PhraseMatcher
+from .readability import measure_sentences, readability_scores
+from .metrics import StageTimer
+from .results import (AnalysisResult, ClarityResult, FillerResult, SentimentResult,
+                      Stats, StructureResult)
+from .sentences import SentenceIndex
+
+
+# Mots de remplissage détectés par défaut
+FILLER_WORDS = [
+    'euh', 'donc', 'en fait', 'genre', 'voilà',
+    'du coup', 'quoi', 'hein', 'bon', 'bah',
+    'enfin', 'en gros', 'disons'
+]
+
+# Mots de transition signalant un discours structuré
+TRANSITION_WORDS = [
+    'premièrement', 'deuxièmement', 'troisièmement',
+    'ensuite', 'puis', 'après', 'avant',
+    'enfin', 'finalement', 'en conclusion',
+    'donc', 'ainsi', 'par conséquent',
+    'cependant', 'néanmoins', 'toutefois',
+    'en effet', 'de plus', 'également',
+    'par ailleurs', 'd\'ailleurs'
+]
+
+# Texte court analysé au préchauffage (voir SpeechAnalyzer.warmup)
+WARMUP_TEXT = "Bonjour à tous. Voici une phrase de préchauffage."
 
 
 class SpeechAnalyzer:
@@ -24,73 +48,268 @@ class SpeechAnalyzer:
     Classe principale pour l'analyse de discours.
     """
     
-    def __init__(self):
+    def __init__(self, filler_words: list = None, lexicon=None, cache: ResultCache = None,
+                 profile: bool = False, metrics=None):
         """
         Constructeur de la classe SpeechAnalyzer.
+
+        Arguments:
+            filler_words : Lexique de mots de remplissage personnalisé
+                           (par défaut FILLER_WORDS)
+            lexicon : Lexique de sentiment (SentimentLexicon ou chemin
+                      d'un fichier de lexique, par défaut le lexique intégré)
+            cache : Cache de résultats facultatif (voir ResultCache)
+            profile : True pour ajouter au résultat une section 'timings'
+                      (durée, temps CPU et allocations de chaque étape)
+            metrics : Récepteur des mesures par étape, par exemple un
+                      MetricsRegistry (toute classe avec record_stage())
+        """
+        self.cache = cache
+        self.profile = profile
+        self.metrics = metrics
+        self._fingerprint = None
+        if lexicon is None:
+            lexicon = SentimentLexicon.default()
+        elif isinstance(lexicon, str):
+            lexicon = SentimentLexicon.from_file(lexicon)
+        self.lexicon = lexicon
+        self.filler_words = list(filler_words if filler_words is not None else FILLER_WORDS)
+        # Un seul automate compilé pour tous les mots de remplissage
+        self.filler_matcher = PhraseMatcher(self.filler_words)
+        self._filler_rank = {filler: rank for rank, filler in enumerate(self.filler_matcher.phrases)}
+        self.transition_words = list(TRANSITION_WORDS)
+        # L'apostrophe et le trait d'union font partie du mot :
+        # "puis" n'est pas trouvé dans "depuis", ni "après" dans "d'après"
+        self.transition_matcher = PhraseMatcher(self.transition_words, word_chars="'’-")
+    
+    def warmup(self) -> 'SpeechAnalyzer':
+        """
+        Charge à l'avance les ressources utilisées par l'analyse.
+
+        Importe NLTK et les modèles punkt, compile les expressions et
+        charge TextBlob (repli du sentiment), pour que la première
+        analyse ne paie pas ces coûts. Le cache n'est pas utilisé.
+
+        Retourne:
+            SpeechAnalyzer : l'analyseur lui-même
+        """
+        self._analyze_text(WARMUP_TEXT)
+        self._fallback_polarity(WARMUP_TEXT)
+        return self
+    
+    @property
+    def fingerprint(self) -> str:
+        """
+        Empreinte de la configuration (lexiques) utilisée comme clé de cache.
         """
-        self.filler_words = [
-            'euh', 'donc', 'en fait', 'genre', 'voilà',
-            'du coup', 'quoi', 'hein', 'bon', 'bah',
-            'enfin', 'en gros', 'disons'
-        ]
+        if self._fingerprint is None:
+            self._fingerprint = ResultCache.make_key(
+                '\n'.join(self.filler_matcher.phrases),
+                '\n'.join(self.transition_words),
+                self.lexicon.version
+            )
+        return self._fingerprint
     
-    def analyze(self, text: str) -> dict:
+    def analyze(self, text: str, compact: bool = False, sentence_index: bool = False,
+                audio=None):
         """
         Analyse complète d'un discours.
+
+        Le texte est tokenisé une seule fois (voir Document) puis
+        le document est partagé entre toutes les étapes. Si un cache
+        est configuré, un texte identique avec la même configuration
+        n'est analysé qu'une fois.
+
+        Arguments:
+            text : Discours à analyser
+            compact : True pour obtenir un AnalysisResult (objets à
+                      __slots__, plus léger en mémoire) au lieu d'un dict
+            sentence_index : True pour ajouter une section 'sentences'
+                             (mesures phrase par phrase, voir SentenceIndex)
+            audio : Enregistrement du discours (sr.AudioData, chemin ou
+                    fichier) pour ajouter une section 'audio' (débit,
+                    pauses, voir src/audio.py) ; jamais mis en cache
+
+        Retourne:
+            dict ou AnalysisResult : sections stats, sentiment, fillers,
+            clarity et structure (et audio si un enregistrement est fourni)
         """
-        return {
-            'stats': self._get_basic_stats(text),
-            'sentiment': self._analyze_sentiment(text),
-            'fillers': self._detect_fillers(text),
-            'clarity': self._analyze_clarity(text),
-            'structure': self._analyze_structure(text)
-        }
+        results = self._analyze_cached(text, compact, sentence_index)
+        if audio is None:
+            return results
+        # NumPy et SpeechRecognition ne sont chargés que pour l'audio
+        from .audio import analyze_audio, spoken_word_count
+        audio_result = analyze_audio(audio, spoken_word_count(text))
+        if compact:
+            results.audio = audio_result
+            return results
+        # Copie : le dictionnaire peut être celui du cache
+        return {**results, 'audio': audio_result.to_dict()}
+
+    def _analyze_cached(self, text: str, compact: bool, sentence_index: bool):
+        if self.cache is None:
+            results = self._analyze_text(text, sentence_index)
+            return results if compact else results.to_dict()
+        
+        key = self._cache_key(text, sentence_index)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return AnalysisResult.from_dict(cached) if compact else cached
+        
+        results = self._analyze_text(text, sentence_index)
+        # Les mesures de temps ne sont valables que pour ce calcul
+        timings, results.timings = results.timings, None
+        self.cache.set(key, results.to_dict())
+        results.timings = timings
+        return results if compact else results.to_dict()
     
-    def _get_basic_stats(self, text: str) -> dict:
+    def _cache_key(self, text: str, sentence_index: bool) -> str:
         """
-        Calcule les statistiques de base du texte.
+        Clé de cache d'une analyse (partagée avec EditSession).
         """
-        sentences = sent_tokenize(text, language='french')
-        words = word_tokenize(text.lower(), language='french')
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
-        unique_words = len(set(words))
-        vocabulary_richness = (unique_words / len(words) * 100) if words else 0
+        # Clé sur le texte exact : espaces et forme unicode changent les
+        # résultats (ex. "du  coup" n'est pas un mot de remplissage), une
+        # clé normalisée rendrait l'analyse dépendante du contenu du cache
+        kind = 'analyze-sentences' if sentence_index else 'analyze'
+        return ResultCache.make_key(kind, self.fingerprint, text)
+
+    def _analyze_text(self, text: str, sentence_index: bool = False) -> AnalysisResult:
+        """
+        Exécute toutes les étapes d'analyse sur un texte.
+        """
+        if not self.profile and self.metrics is None:
+            doc = Document(text)
+            # Occurrences relevées par les étapes pour l'index des phrases
+            hits = {} if sentence_index else None
+            return AnalysisResult(
+                stats=self._get_basic_stats(doc),
+                sentiment=self._analyze_sentiment(doc, hits=hits),
+                fillers=self._detect_fillers(doc, hits),
+                clarity=self._analyze_clarity(doc),
+                structure=self._analyze_structure(doc, hits),
+                sentences=self._build_sentence_index(doc, hits) if sentence_index else None
+            )
         
-        return {
-            'word_count': len(words),
-            'sentence_count': len(sentences),
-            'avg_sentence_length': round(avg_sentence_length, 1),
-            'unique_words': unique_words,
-            'vocabulary_richness': round(vocabulary_richness, 1)
-        }
+        # Version instrumentée : chaque étape passe par le chronomètre
+        timer = StageTimer(self.metrics)
+        results = timer.measure('total', self._run_timed_stages, text, timer, sentence_index)
+        if self.profile:
+            results.timings = timer.timings
+        return results
     
-    def _analyze_sentiment(self, text: str) -> dict:
+    def _run_timed_stages(self, text: str, timer: StageTimer,
+                          sentence_index: bool = False) -> AnalysisResult:
+        doc = timer.measure('tokenize', Document, text)
+        hits = {} if sentence_index else None
+        return AnalysisResult(
+            stats=timer.measure('stats', self._get_basic_stats, doc),
+            sentiment=timer.measure('sentiment', self._analyze_sentiment, doc, timer, hits),
+            fillers=timer.measure('fillers', self._detect_fillers, doc, hits),
+            clarity=timer.measure('clarity', self._analyze_clarity, doc),
+            structure=timer.measure('structure', self._analyze_structure, doc, hits),
+            sentences=(timer.measure('sentences', self._build_sentence_index, doc, hits)
+                       if sentence_index else None)
+        )
+    
+    def analyze_many(self, texts, workers: int = None, chunksize: int = 16,
+                     ordered: bool = True, compact: bool = False):
         """
-        Analyse le sentiment du texte en français.
+        Analyse plusieurs discours en parallèle sur un pool de processus.
+
+        Chaque processus reçoit une copie de cet analyseur une seule fois
+        (ressources NLTK et lexiques chargés au démarrage du processus).
+
+        Arguments:
+            texts : Liste ou itérable de discours
+            workers : Nombre de processus (par défaut : nombre de cœurs,
+                      1 pour tout analyser dans le processus courant)
+            chunksize : Nombre de discours envoyés à un processus à la fois
+            ordered : True pour obtenir les résultats dans l'ordre des textes
+            compact : True pour obtenir des AnalysisResult (voir analyze)
+
+        Retourne:
+            générateur : les résultats de analyze() dans l'ordre si ordered,
+            sinon des couples (index, résultat) au fil de l'eau
         """
-        mots_positifs = [
-            'excellent', 'bon', 'bien', 'super', 'génial', 'parfait',
-            'formidable', 'magnifique', 'merveilleux', 'fantastique',
-            'réussi', 'positif', 'agréable', 'efficace', 'performant',
-            'qualité', 'satisfait', 'heureux', 'content', 'enthousiaste'
-        ]
+        if workers == 1:
+            results = (self.analyze(text, compact=compact) for text in texts)
+            return results if ordered else enumerate(results)
+        task = partial(_analyze_chunk, compact=compact)
+        return run_parallel(task, texts, workers=workers,
+                            chunksize=chunksize, ordered=ordered, analyzer=self)
+    
+    def _get_basic_stats(self, doc: Document) -> Stats:
+        """
+        Calcule les statistiques de base du texte.
+        """
+        words = doc.lower_tokens
+        return self._stats_from_counts(len(words), len(doc.sentences), len(set(words)))
+    
+    def _stats_from_counts(self, word_count: int, sentence_count: int,
+                           unique_words: int) -> Stats:
+        """
+        Construit les statistiques à partir des compteurs de mots et de phrases.
+        """
+        avg_sentence_length = word_count / sentence_count if sentence_count else 0
+        vocabulary_richness = (unique_words / word_count * 100) if word_count else 0
         
-        mots_negatifs = [
-            'mauvais', 'mal', 'problème', 'échec', 'erreur', 'difficile',
-            'négatif', 'désagréable', 'inefficace', 'médiocre',
-            'insatisfait', 'malheureux', 'triste', 'inquiet', 'critique'
-        ]
+        return Stats(
+            word_count=word_count,
+            sentence_count=sentence_count,
+            avg_sentence_length=round(avg_sentence_length, 1),
+            unique_words=unique_words,
+            vocabulary_richness=round(vocabulary_richness, 1)
+        )
+    
+    def _analyze_sentiment(self, doc: Document, timer: StageTimer = None,
+                           hits: dict = None) -> SentimentResult:
+        """
+        Analyse le sentiment du texte en français.
         
-        words = word_tokenize(text.lower(), language='french')
-        score_positif = sum(1 for word in words if word in mots_positifs)
-        score_negatif = sum(1 for word in words if word in mots_negatifs)
+        Si un chronomètre est fourni, le repli TextBlob est mesuré à part
+        (étape 'textblob_fallback', incluse dans la durée de 'sentiment').
+        Si hits est fourni, les scores de chaque phrase y sont ajoutés
+        (clé 'sentiment'), calculés dans le même passage.
+        """
+        words = doc.lower_tokens
+        if hits is None:
+            scores = self.lexicon.score(words)
+        else:
+            scores, hits['sentiment'] = self.lexicon.score_sentences(
+                words, [len(tokens) for tokens in doc.sentence_tokens]
+            )
+        score_positif, score_negatif, total_mots_sentiment = scores
+        if timer is None:
+            fallback = lambda: self._fallback_polarity(doc.text)
+        else:
+            fallback = lambda: timer.measure('textblob_fallback', self._fallback_polarity, doc.text)
+        return self._sentiment_from_scores(
+            score_positif, score_negatif, total_mots_sentiment, len(words), fallback
+        )
+    
+    @staticmethod
+    def _fallback_polarity(text: str) -> float:
+        """
+        Polarité TextBlob, utilisée quand le lexique ne trouve aucun mot.
+        """
+        # TextBlob n'est importé que lorsque le repli sert réellement
+        from textblob import TextBlob
+        return TextBlob(text).sentiment.polarity
+    
+    def _sentiment_from_scores(self, score_positif: float, score_negatif: float,
+                               total_mots_sentiment: int, word_count: int,
+                               fallback) -> SentimentResult:
+        """
+        Construit le résultat de sentiment à partir des scores du lexique.
         
-        total_mots_sentiment = score_positif + score_negatif
+        Arguments:
+            fallback : Fonction sans argument retournant la polarité de
+                       repli, appelée seulement si aucun mot n'est trouvé
+        """
         if total_mots_sentiment > 0:
-            polarity = (score_positif - score_negatif) / total_mots_sentiment
+            polarity = (score_positif - score_negatif) / (score_positif + score_negatif)
         else:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
+            polarity = fallback()
         
         if polarity > 0.2:
             sentiment = 'Positif'
@@ -99,45 +318,80 @@ class SpeechAnalyzer:
         else:
             sentiment = 'Neutre'
         
-        subjectivity = total_mots_sentiment / len(words) if words else 0
+        subjectivity = total_mots_sentiment / word_count if word_count else 0
         
-        return {
-            'sentiment': sentiment,
-            'polarity_score': round(polarity, 2),
-            'subjectivity': round(min(1.0, subjectivity * 5), 2)
-        }
+        return SentimentResult(
+            sentiment=sentiment,
+            polarity_score=round(polarity, 2),
+            subjectivity=round(min(1.0, subjectivity * 5), 2)
+        )
+    
+    def find_fillers(self, text: str) -> list:
+        """
+        Trouve les mots de remplissage et leur position dans le texte.
+
+        Retourne:
+            list : Couples (début, fin, mot de remplissage)
+        """
+        return self.filler_matcher.find(text)
     
-    def _detect_fillers(self, text: str) -> dict:
+    def _detect_fillers(self, doc: Document, hits: dict = None) -> FillerResult:
         """
         Détecte les mots de remplissage dans le discours.
+
+        Si hits est fourni, les occurrences (début, fin, mot) y sont
+        ajoutées (clé 'fillers').
         """
-        text_lower = text.lower()
-        fillers_found = {}
-        total_fillers = 0
-        
-        for filler in self.filler_words:
-            pattern = r'\b' + re.escape(filler) + r'\b'
-            count = len(re.findall(pattern, text_lower))
-            if count > 0:
-                fillers_found[filler] = count
-                total_fillers += count
-        
-        words = word_tokenize(text_lower, language='french')
-        filler_rate = (total_fillers / len(words) * 100) if words else 0
-        
-        return {
-            'total_fillers': total_fillers,
-            'filler_details': fillers_found,
-            'filler_rate_percent': round(filler_rate, 2)
+        if hits is None:
+            counts = self.filler_matcher.count(doc.text)
+        else:
+            spans = hits['fillers'] = self.filler_matcher.find(doc.text)
+            counts = Counter(phrase for _, _, phrase in spans)
+        return self._fillers_from_counts(counts, len(doc.lower_tokens))
+    
+    def _fillers_from_counts(self, counts: dict, word_count: int) -> FillerResult:
+        """
+        Construit le résultat des mots de remplissage à partir des comptes.
+        """
+        # Conserver l'ordre du lexique dans le détail
+        fillers_found = {
+            filler: counts[filler]
+            for filler in sorted(counts, key=self._filler_rank.__getitem__)
+            if counts[filler] > 0
         }
+        total_fillers = sum(fillers_found.values())
+        filler_rate = (total_fillers / word_count * 100) if word_count else 0
+        
+        return FillerResult(
+            total_fillers=total_fillers,
+            filler_details=fillers_found,
+            filler_rate_percent=round(filler_rate, 2)
+        )
     
-    def _analyze_clarity(self, text: str) -> dict:
+    def _analyze_clarity(self, doc: Document) -> ClarityResult:
         """
         Analyse la clarté du discours.
+
+        Le niveau et le score viennent de la longueur moyenne des phrases ;
+        les indices de lisibilité sont calculés sur les mots déjà tokenisés.
         """
-        sentences = sent_tokenize(text, language='french')
-        words = word_tokenize(text, language='french')
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
+        syllables, long_words, sentence_lengths = measure_sentences(
+            doc.lower_tokens, [len(tokens) for tokens in doc.sentence_tokens]
+        )
+        return self._clarity_from_counts(len(doc.tokens), len(doc.sentences),
+                                         sentence_lengths, syllables, long_words)
+    
+    def _clarity_from_counts(self, word_count: int, sentence_count: int,
+                             sentence_lengths=(), syllables: int = 0,
+                             long_words: int = 0) -> ClarityResult:
+        """
+        Construit le résultat de clarté à partir des compteurs.
+
+        Arguments:
+            sentence_lengths : Nombre de mots (sans ponctuation) de chaque phrase
+            syllables, long_words : Nombre de syllabes et de mots longs
+        """
+        avg_sentence_length = word_count / sentence_count if sentence_count else 0
         
         if avg_sentence_length < 15:
             clarity = 'Très clair'
@@ -152,43 +406,96 @@ class SpeechAnalyzer:
             clarity = 'Complexe'
             score = 3
         
-        return {
-            'clarity_level': clarity,
-            'clarity_score': score,
-            'avg_sentence_length': round(avg_sentence_length, 1)
-        }
+        return ClarityResult(
+            clarity_level=clarity,
+            clarity_score=score,
+            avg_sentence_length=round(avg_sentence_length, 1),
+            **readability_scores(sentence_lengths, syllables, long_words)
+        )
     
-    def _analyze_structure(self, text: str) -> dict:
+    def _analyze_structure(self, doc: Document, hits: dict = None) -> StructureResult:
         """
         Analyse la structure du discours.
+
+        Si hits est fourni, les transitions de chaque phrase y sont
+        ajoutées (clé 'transitions').
         """
-        sentences = sent_tokenize(text, language='french')
-        
-        transition_words = [
-            'premièrement', 'deuxièmement', 'troisièmement',
-            'ensuite', 'puis', 'après', 'avant',
-            'enfin', 'finalement', 'en conclusion',
-            'donc', 'ainsi', 'par conséquent',
-            'cependant', 'néanmoins', 'toutefois',
-            'en effet', 'de plus', 'également',
-            'par ailleurs', 'd\'ailleurs'
-        ]
+        if hits is None:
+            transitions_found = self._count_transitions(doc)
+        else:
+            sentence_hits = hits['transitions'] = self.find_transitions(doc)
+            transitions_found = sum(1 for found in sentence_hits if found)
+        return self._structure_from_counts(transitions_found, len(doc.sentences))
+    
+    def find_transitions(self, doc: Document) -> list:
+        """
+        Trouve les mots de transition de chaque phrase en un seul passage.
         
-        transitions_found = 0
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            for transition in transition_words:
-                if transition in sentence_lower:
-                    transitions_found += 1
-                    break
+        Le texte entier est parcouru une fois par l'automate ; chaque
+        occurrence est rattachée à sa phrase d'après sa position.
         
-        structure_score = min(10, (transitions_found / len(sentences) * 20)) if sentences else 0
+        Retourne:
+            list : Pour chaque phrase, la liste des (début, fin, transition),
+                   positions exprimées dans le texte d'origine
+        """
+        hits = [[] for _ in doc.sentences]
+        if not hits:
+            return hits
+        starts = [start for start, _ in doc.sentence_spans]
+        for match in self.transition_matcher.finditer(doc.text):
+            index = bisect_right(starts, match[0]) - 1
+            if index >= 0:
+                hits[index].append(match)
+        return hits
+    
+    def _count_transitions(self, doc: Document) -> int:
+        """
+        Compte les phrases contenant au moins un mot de transition.
+        """
+        return sum(1 for sentence_hits in self.find_transitions(doc) if sentence_hits)
+    
+    def _build_sentence_index(self, doc: Document, hits: dict) -> SentenceIndex:
+        """
+        Construit l'index des phrases à partir des occurrences relevées
+        par les étapes d'analyse (clés 'fillers', 'sentiment' et
+        'transitions' de hits) : aucun texte n'est parcouru une seconde fois.
+        """
+        starts = [start for start, _ in doc.sentence_spans]
+        filler_counts = [0] * len(starts)
+        filler_starts, filler_ends, filler_sentences = [], [], []
+        for start, end, _ in hits['fillers']:
+            index = max(0, bisect_right(starts, start) - 1)
+            filler_counts[index] += 1
+            filler_starts.append(start)
+            filler_ends.append(end)
+            filler_sentences.append(index)
+        sentiment = hits['sentiment']
+
+        return SentenceIndex(
+            starts=starts,
+            ends=[end for _, end in doc.sentence_spans],
+            token_counts=[len(tokens) for tokens in doc.sentence_tokens],
+            filler_counts=filler_counts,
+            sentiment_hits=[scores[2] for scores in sentiment],
+            positive=[scores[0] for scores in sentiment],
+            negative=[scores[1] for scores in sentiment],
+            transition_counts=[len(found) for found in hits['transitions']],
+            filler_starts=filler_starts,
+            filler_ends=filler_ends,
+            filler_sentences=filler_sentences
+        )
+    
+    def _structure_from_counts(self, transitions_found: int, sentence_count: int) -> StructureResult:
+        """
+        Construit le résultat de structure à partir des compteurs.
+        """
+        structure_score = min(10, (transitions_found / sentence_count * 20)) if sentence_count else 0
         
-        return {
-            'has_structure': transitions_found > 0,
-            'transition_count': transitions_found,
-            'structure_score': round(structure_score, 1)
-        }
+        return StructureResult(
+            has_structure=transitions_found > 0,
+            transition_count=transitions_found,
+            structure_score=round(structure_score, 1)
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,339 @@
+# coding: utf-8
+# ============================================
+# MODULE : TRANSCRIPTION DE FICHIERS AUDIO
+# ============================================
+# Transcription hors ligne d'enregistrements longs (WAV, AIFF, FLAC) :
+# le fichier est découpé aux silences, les morceaux sont reconnus en
+# parallèle par recognize_sphinx dans un pool de processus, puis le
+# texte est recollé dans l'ordre pour SpeechAnalyzer.
+#
+# analyze_audio() mesure le débit et les pauses d'un enregistrement ou
+# d'une phrase reconnue à partir de l'énergie de ses trames (section
+# 'audio' de SpeechAnalyzer.analyze(text, audio=...)).
+
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import speech_recognition as sr
+
+from .batch import run_parallel
+from .results import AudioResult
+
+# Type des échantillons selon leur largeur en octets
+_SAMPLE_TYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+# Nombre de trames converties en flottants à la fois (voir frame_rms)
+_RMS_BLOCK = 4096
+
+# Silence minimal compté comme une pause, et pause longue (secondes)
+MIN_PAUSE = 0.25
+LONG_PAUSE = 2.0
+
+# Mot prononcé (les apostrophes et traits d'union ne coupent pas le mot)
+_SPOKEN_WORD = re.compile(r"\w+(?:['’-]\w+)*")
+
+# Objets propres à chaque processus, initialisés par _init_recognizer
+_worker_recognizer = None
+_worker_recognize = None
+_worker_language = None
+
+
+@dataclass(slots=True)
+class AudioSegment:
+    """
+    Morceau d'enregistrement transcrit.
+
+    Attributs:
+        index : Position du morceau dans l'enregistrement
+        start, end : Début et fin du morceau (secondes)
+        text : Texte reconnu ('' si rien n'a été compris ou en cas d'erreur)
+        error : Message d'erreur éventuel
+    """
+    index: int
+    start: float
+    end: float
+    text: str = ''
+    error: str = None
+
+
+def load_audio(source) -> sr.AudioData:
+    """
+    Charge un fichier audio entier.
+
+    Arguments:
+        source : Chemin ou objet fichier (WAV, AIFF ou FLAC)
+    """
+    with sr.AudioFile(source) as audio_file:
+        return sr.Recognizer().record(audio_file)
+
+
+def audio_duration(audio: sr.AudioData) -> float:
+    """
+    Durée d'un audio en secondes.
+    """
+    return len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+
+
+def frame_rms(frame_data, sample_width: int, frame_samples: int) -> np.ndarray:
+    """
+    Calcule l'énergie (RMS) de chaque trame d'un signal mono.
+
+    Les échantillons sont lus sans copie depuis les octets bruts et
+    convertis en flottants par blocs de trames (mémoire bornée même pour
+    un enregistrement d'une heure) ; la dernière trame incomplète est ignorée.
+
+    Arguments:
+        frame_data : Octets bruts (ex. AudioData.frame_data)
+        sample_width : Largeur d'un échantillon en octets (1, 2 ou 4)
+        frame_samples : Nombre d'échantillons par trame
+
+    Retourne:
+        ndarray : Une valeur RMS par trame
+    """
+    samples = np.frombuffer(memoryview(frame_data), dtype=_SAMPLE_TYPES[sample_width])
+    count = len(samples) // frame_samples
+    frames = samples[:count * frame_samples].reshape(count, frame_samples)
+    rms = np.empty(count)
+    for first in range(0, count, _RMS_BLOCK):
+        block = frames[first:first + _RMS_BLOCK].astype(np.float64)
+        if sample_width == 1:
+            # Échantillons 8 bits non signés centrés sur 128
+            block -= 128
+        rms[first:first + _RMS_BLOCK] = np.sqrt(np.mean(block * block, axis=1))
+    return rms
+
+
+def frame_energy(audio: sr.AudioData, frame_duration: float = 0.03,
+                 threshold: float = None) -> tuple:
+    """
+    Énergie des trames d'un enregistrement et seuil de silence.
+
+    Arguments:
+        audio : Enregistrement (sr.AudioData)
+        frame_duration : Durée d'une trame d'analyse (secondes)
+        threshold : Énergie RMS en dessous de laquelle une trame est un silence
+                    (par défaut : deux fois le bruit de fond, au moins 1 % du maximum)
+
+    Retourne:
+        tuple : (RMS de chaque trame, durée d'une trame en secondes, seuil)
+    """
+    frame_data, sample_width = audio.frame_data, audio.sample_width
+    if sample_width not in _SAMPLE_TYPES:
+        frame_data, sample_width = audio.get_raw_data(convert_width=2), 2
+    frame_samples = max(1, int(audio.sample_rate * frame_duration))
+    rms = frame_rms(frame_data, sample_width, frame_samples)
+    if threshold is None and len(rms):
+        full_scale = 2 ** (8 * sample_width - 1)
+        threshold = max(2 * np.percentile(rms, 10), 0.01 * full_scale)
+    return rms, frame_samples / audio.sample_rate, threshold
+
+
+def split_on_silence(audio: sr.AudioData, min_silence: float = 0.5,
+                     threshold: float = None, frame_duration: float = 0.03,
+                     max_chunk: float = 30.0, min_voiced: float = 0.1,
+                     padding: float = 0.2) -> list:
+    """
+    Découpe un enregistrement en morceaux délimités par des silences.
+
+    Arguments:
+        audio : Enregistrement (sr.AudioData)
+        min_silence : Durée minimale d'un silence séparant deux morceaux (secondes)
+        threshold : Énergie RMS en dessous de laquelle une trame est un silence
+                    (par défaut : deux fois le bruit de fond, au moins 1 % du maximum)
+        frame_duration : Durée d'une trame d'analyse (secondes)
+        max_chunk : Durée maximale d'un morceau ; au-delà, le morceau est
+                    coupé à la trame la plus calme de sa seconde moitié
+        min_voiced : Durée minimale de parole pour garder un morceau
+        padding : Marge ajoutée avant et après chaque morceau (secondes)
+
+    Retourne:
+        list : Couples (début, fin) en secondes, dans l'ordre
+    """
+    rms, frame_time, threshold = frame_energy(audio, frame_duration, threshold)
+    if not len(rms):
+        return []
+
+    # Suites de trames sonores : débuts et fins (exclues)
+    voiced = np.concatenate(([False], rms > threshold, [False]))
+    edges = np.flatnonzero(np.diff(voiced.astype(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    if not len(starts):
+        return []
+
+    # Fusion des suites séparées par un silence trop court
+    gaps = starts[1:] - ends[:-1]
+    breaks = np.flatnonzero(gaps * frame_time >= min_silence)
+    starts = np.concatenate(([starts[0]], starts[breaks + 1]))
+    ends = np.concatenate((ends[breaks], [ends[-1]]))
+
+    duration = len(rms) * frame_time
+    max_frames = max(2, int(max_chunk / frame_time))
+    chunks = []
+    for first, last in zip(starts.tolist(), ends.tolist()):
+        if (last - first) * frame_time < min_voiced:
+            continue
+        while last - first > max_frames:
+            window = rms[first + max_frames // 2:first + max_frames]
+            cut = first + max_frames // 2 + int(np.argmin(window))
+            chunks.append([first * frame_time, cut * frame_time])
+            first = cut
+        chunks.append([first * frame_time, last * frame_time])
+
+    # Marges, sans chevauchement entre morceaux voisins
+    for i, chunk in enumerate(chunks):
+        low = chunks[i - 1][1] if i else 0.0
+        chunk[0] = max(low, chunk[0] - padding)
+        chunk[1] = min(duration, chunk[1] + padding)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        if previous[1] > chunk[0]:
+            previous[1] = chunk[0] = (previous[1] + chunk[0]) / 2
+    return [(round(start, 3), round(end, 3)) for start, end in chunks]
+
+
+def spoken_word_count(text: str) -> int:
+    """
+    Compte les mots prononcés d'une transcription (sans la ponctuation).
+    """
+    return sum(1 for _ in _SPOKEN_WORD.finditer(text))
+
+
+def analyze_audio(audio, words: int, threshold: float = None, frame_duration: float = 0.03,
+                  min_pause: float = MIN_PAUSE) -> AudioResult:
+    """
+    Mesure le débit, les pauses et la part de silence d'un enregistrement.
+
+    Les trames sous le seuil d'énergie sont des silences ; les silences
+    d'au moins min_pause secondes entre la première et la dernière trame
+    sonore sont des pauses. Le débit est rapporté à la durée de parole
+    (silences du début et de la fin exclus), l'articulation au temps de
+    parole sans les pauses.
+
+    Arguments:
+        audio : Enregistrement (sr.AudioData, chemin ou objet fichier)
+        words : Nombre de mots prononcés (voir spoken_word_count)
+        threshold, frame_duration : Voir frame_energy
+        min_pause : Durée minimale d'une pause (secondes)
+
+    Retourne:
+        AudioResult : Mesures de la section 'audio'
+    """
+    if not isinstance(audio, sr.AudioData):
+        audio = load_audio(audio)
+    duration = audio_duration(audio)
+    rms, frame_time, threshold = frame_energy(audio, frame_duration, threshold)
+    voiced = rms > threshold if len(rms) else np.zeros(0, dtype=bool)
+    sounding = np.flatnonzero(voiced)
+    if not len(sounding):
+        return AudioResult(round(duration, 2), 0.0, 0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, 0.0,
+                           100.0 if len(rms) else 0.0)
+
+    first, last = int(sounding[0]), int(sounding[-1]) + 1
+    speech_duration = (last - first) * frame_time
+    # Suites de trames silencieuses entre la première et la dernière trame sonore
+    inner = np.concatenate(([True], voiced[first:last], [True]))
+    edges = np.flatnonzero(np.diff(inner.astype(np.int8)))
+    pauses = (edges[1::2] - edges[::2]) * frame_time
+    pauses = pauses[pauses >= min_pause]
+    voiced_duration = speech_duration - float(pauses.sum())
+    if len(pauses):
+        median, p90 = np.percentile(pauses, [50, 90])
+        pause_stats = (round(float(pauses.mean()), 2), round(float(median), 2),
+                       round(float(p90), 2), round(float(pauses.max()), 2))
+    else:
+        pause_stats = (0.0, 0.0, 0.0, 0.0)
+    return AudioResult(
+        round(duration, 2),
+        round(speech_duration, 2),
+        round(words / speech_duration * 60, 1),
+        round(words / voiced_duration * 60, 1) if voiced_duration > 0 else 0.0,
+        len(pauses),
+        int((pauses >= LONG_PAUSE).sum()),
+        *pause_stats,
+        round(100 - float(voiced.mean()) * 100, 1)
+    )
+
+
+def recognize_sphinx(recognizer, audio, language: str) -> str:
+    """
+    Reconnaissance hors ligne (PocketSphinx) d'un morceau.
+    """
+    return recognizer.recognize_sphinx(audio, language=language)
+
+
+def _init_recognizer(recognize, language):
+    """
+    Initialise un processus de reconnaissance (un seul Recognizer par processus).
+    """
+    global _worker_recognizer, _worker_recognize, _worker_language
+    _worker_recognizer = sr.Recognizer()
+    _worker_recognize = recognize
+    _worker_language = language
+
+
+def _recognize_segment(recognizer, recognize, language, item) -> AudioSegment:
+    index, start, end, frame_data, sample_rate, sample_width = item
+    segment = AudioSegment(index, start, end)
+    try:
+        audio = sr.AudioData(frame_data, sample_rate, sample_width)
+        segment.text = recognize(recognizer, audio, language) or ''
+    except sr.UnknownValueError:
+        segment.error = "Parole non comprise"
+    except sr.RequestError as e:
+        segment.error = f"Erreur de service : {e}"
+    return segment
+
+
+def _recognize_chunk(items: list) -> list:
+    return [_recognize_segment(_worker_recognizer, _worker_recognize, _worker_language, item)
+            for item in items]
+
+
+def iter_segments(audio: sr.AudioData, bounds: list):
+    """
+    Extrait les octets de chaque morceau : (index, début, fin, octets, fréquence, largeur).
+    """
+    bytes_per_second = audio.sample_rate * audio.sample_width
+    for index, (start, end) in enumerate(bounds):
+        first = int(start * bytes_per_second) // audio.sample_width * audio.sample_width
+        last = int(end * bytes_per_second) // audio.sample_width * audio.sample_width
+        yield (index, start, end, audio.frame_data[first:last],
+               audio.sample_rate, audio.sample_width)
+
+
+def transcribe_file(source, language: str = 'fr-FR', workers: int = None,
+                    recognize=recognize_sphinx, **split_options) -> list:
+    """
+    Transcrit un enregistrement long, morceau par morceau, en parallèle.
+
+    Arguments:
+        source : Chemin ou objet fichier (WAV, AIFF ou FLAC), ou sr.AudioData
+        language : Langue de reconnaissance
+        workers : Nombre de processus (par défaut : nombre de cœurs ; 1 pour
+                  tout faire dans le processus courant)
+        recognize : Fonction (recognizer, audio, language) -> texte, définie au
+                    niveau d'un module pour pouvoir être envoyée aux processus
+        split_options : Paramètres de split_on_silence
+
+    Retourne:
+        list : AudioSegment dans l'ordre de l'enregistrement
+    """
+    audio = source if isinstance(source, sr.AudioData) else load_audio(source)
+    bounds = split_on_silence(audio, **split_options)
+    items = iter_segments(audio, bounds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(bounds) <= 1:
+        recognizer = sr.Recognizer()
+        return [_recognize_segment(recognizer, recognize, language, item) for item in items]
+    return list(run_parallel(_recognize_chunk, items, workers=min(workers, len(bounds)),
+                             chunksize=1, initializer=_init_recognizer,
+                             initargs=(recognize, language)))
+
+
+def stitch_segments(segments: list) -> str:
+    """
+    Recolle le texte des morceaux dans l'ordre de l'enregistrement.
+    """
+    ordered = sorted(segments, key=lambda segment: segment.index)
+    return ' '.join(segment.text.strip() for segment in ordered if segment.text.strip())
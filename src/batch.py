@@ -0,0 +1,135 @@
+# coding: utf-8
+# ============================================
+# MODULE : TRAITEMENT PAR LOTS
+# ============================================
+# Répartit l'analyse de nombreux discours sur plusieurs processus.
+# Chaque processus reçoit une seule fois l'analyseur et le générateur
+# de feedback (ressources NLTK et lexiques chargés au démarrage),
+# puis traite des paquets de discours.
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+# Objets propres à chaque processus, initialisés par _init_worker
+_worker_analyzer = None
+_worker_feedback = None
+
+
+def _init_worker(analyzer, feedback_generator):
+    """
+    Initialise un processus de calcul.
+
+    Appelé une seule fois par processus : l'analyseur est préchauffé
+    pour que le premier discours ne paie pas le chargement de punkt.
+    """
+    global _worker_analyzer, _worker_feedback
+    _worker_analyzer = analyzer
+    _worker_feedback = feedback_generator
+    if analyzer is not None:
+        analyzer.warmup()
+
+
+def _analyze_chunk(texts: list, compact: bool = False) -> list:
+    return [_worker_analyzer.analyze(text, compact=compact) for text in texts]
+
+
+def _generate_chunk(results: list, compact: bool = False) -> list:
+    return _worker_feedback.generate_batch(results, compact=compact)
+
+
+def analyze_with_feedback(items: list, analyzer, feedback_generator) -> list:
+    """
+    Analyse un paquet de discours et génère leur feedback.
+
+    Arguments:
+        items : Couples (texte, sentence_index)
+        analyzer, feedback_generator : Objets utilisés pour le paquet
+
+    Retourne:
+        list : Dictionnaires {'analysis': ..., 'feedback': ...}, dans l'ordre
+    """
+    results = [analyzer.analyze(text, sentence_index=sentence_index)
+               for text, sentence_index in items]
+    feedbacks = feedback_generator.generate_batch(results)
+    return [{'analysis': result, 'feedback': feedback}
+            for result, feedback in zip(results, feedbacks)]
+
+
+def _serve_chunk(items: list) -> list:
+    return analyze_with_feedback(items, _worker_analyzer, _worker_feedback)
+
+
+def iter_chunks(items, size: int):
+    """
+    Découpe un itérable en listes de taille size (la dernière peut être plus courte).
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_parallel(task, items, workers: int = None, chunksize: int = 16,
+                 ordered: bool = True, analyzer=None, feedback_generator=None,
+                 initializer=None, initargs: tuple = ()):
+    """
+    Exécute task sur des paquets d'éléments dans un pool de processus.
+
+    L'itérable est consommé au fur et à mesure : au plus deux paquets
+    par processus sont en attente, ce qui permet de traiter des archives
+    qui ne tiennent pas en mémoire.
+
+    Arguments:
+        task : Fonction appliquée à chaque paquet (_analyze_chunk, _generate_chunk)
+        items : Liste ou itérable d'éléments à traiter
+        workers : Nombre de processus (par défaut : nombre de cœurs)
+        chunksize : Nombre d'éléments envoyés à un processus à la fois
+        ordered : True pour conserver l'ordre d'entrée
+        analyzer, feedback_generator : Objets transmis une fois à chaque processus
+        initializer, initargs : Initialisation propre à d'autres tâches
+                                (remplace _init_worker, ex. reconnaissance audio)
+
+    Retourne:
+        générateur : les résultats dans l'ordre si ordered, sinon des
+        couples (index, résultat) dès qu'ils sont disponibles
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, chunksize)
+    chunks = enumerate(iter_chunks(items, chunksize))
+    max_pending = workers * 2
+    if initializer is None:
+        initializer, initargs = _init_worker, (analyzer, feedback_generator)
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initializer,
+        initargs=initargs
+    )
+    try:
+        if ordered:
+            pending = deque()
+            for _, chunk in islice(chunks, max_pending):
+                pending.append(pool.submit(task, chunk))
+            while pending:
+                results = pending.popleft().result()
+                for _, chunk in islice(chunks, 1):
+                    pending.append(pool.submit(task, chunk))
+                yield from results
+        else:
+            pending = {}
+            for number, chunk in islice(chunks, max_pending):
+                pending[pool.submit(task, chunk)] = number * chunksize
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start = pending.pop(future)
+                    for number, chunk in islice(chunks, 1):
+                        pending[pool.submit(task, chunk)] = number * chunksize
+                    for offset, result in enumerate(future.result()):
+                        yield start + offset, result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
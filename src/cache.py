@@ -0,0 +1,162 @@
+# coding: utf-8
+# ============================================
+# MODULE : CACHE DES RÉSULTATS
+# ============================================
+# Mémorise les résultats d'analyse et de feedback, indexés par
+# l'empreinte du texte et de la configuration de l'analyseur.
+# Deux niveaux : un cache LRU en mémoire et un cache SQLite
+# facultatif sur disque, partagé entre processus et redémarrages.
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Cache de résultats (dictionnaires JSON) à deux niveaux.
+
+    Les résultats sont stockés sous forme JSON : chaque lecture retourne
+    une copie neuve, qu'un appelant peut modifier sans corrompre le cache.
+    Le niveau mémoire évince les entrées les moins récemment utilisées
+    dès que le nombre d'entrées ou la taille totale dépasse sa limite.
+
+    Exemple:
+        >>> cache = ResultCache(max_entries=100)
+        >>> key = ResultCache.make_key('analyze', 'bonjour')
+        >>> cache.set(key, {'score': 7})
+        >>> cache.get(key)
+        {'score': 7}
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 path: str = None):
+        """
+        Arguments:
+            max_entries : Nombre maximal d'entrées en mémoire
+            max_bytes : Taille maximale (en octets JSON) des entrées en mémoire
+            path : Fichier SQLite du cache disque (None pour le désactiver)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self._setup()
+
+    def _setup(self):
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    # Le cache peut être transmis aux processus de calcul (analyze_many) :
+    # chacun repart d'un cache mémoire vide et rouvre le fichier SQLite.
+    def __getstate__(self):
+        return {'max_entries': self.max_entries, 'max_bytes': self.max_bytes,
+                'path': self.path}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Calcule une clé SHA-256 à partir de plusieurs chaînes.
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """
+        Retourne une copie du résultat mémorisé, ou None si absent.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = row[0]
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+            if value is None:
+                self.misses += 1
+                return None
+        return json.loads(value)
+
+    def set(self, key: str, result: dict):
+        """
+        Mémorise un résultat (en mémoire et sur disque si activé).
+        """
+        value = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, value)
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: str):
+        """
+        Ajoute une entrée en mémoire puis évince les plus anciennes si besoin.
+        """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = value
+        self._bytes += len(value)
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Vide le cache (mémoire et disque).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """
+        Retourne les compteurs du cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes
+        }
+
+    def __len__(self):
+        return len(self._entries)
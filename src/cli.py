@@ -0,0 +1,269 @@
+# coding: utf-8
+# ============================================
+# OUTIL EN LIGNE DE COMMANDE : ANALYSE D'ARCHIVES
+# ============================================
+# Analyse sans interface les transcriptions sauvegardées par index.py
+# (dossier transcriptions/) et écrit un résultat par fichier.
+#
+# Utilisation :
+#   python -m src.cli transcriptions/ -o resultats.jsonl
+#   python -m src.cli "archives/**/*.txt" -o resultats_parquet --format parquet
+#
+# Le traitement reprend là où il s'était arrêté : les fichiers déjà
+# listés dans le point de reprise (<sortie>.checkpoint) sont ignorés.
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+from .analyzer import SpeechAnalyzer
+from .batch import _serve_chunk, analyze_with_feedback, iter_chunks, run_parallel
+from .feedback_generator import FeedbackGenerator
+from .utils import parse_transcription
+
+
+def find_transcriptions(inputs: list, pattern: str = '*.txt') -> list:
+    """
+    Liste les fichiers à analyser.
+
+    Arguments:
+        inputs : Dossiers (parcourus récursivement), fichiers ou motifs glob
+        pattern : Motif des fichiers recherchés dans les dossiers
+
+    Retourne:
+        list : Chemins triés, sans doublon
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, '**', pattern), recursive=True))
+        elif os.path.isfile(item):
+            paths.add(item)
+        else:
+            paths.update(glob.glob(item, recursive=True))
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def flatten_record(record: dict) -> dict:
+    """
+    Aplatit un résultat pour un format en colonnes (Parquet).
+
+    Les sections imbriquées deviennent des colonnes "section.mesure" ;
+    les dictionnaires de détail (ex. filler_details) sont gardés en JSON.
+    """
+    row = {key: value for key, value in record.items()
+           if key not in ('analysis', 'feedback')}
+    for section, values in record['analysis'].items():
+        for name, value in values.items():
+            if isinstance(value, dict):
+                value = json.dumps(value, ensure_ascii=False)
+            row[f'{section}.{name}'] = value
+    for name, value in record['feedback'].items():
+        row[f'feedback.{name}'] = value
+    return row
+
+
+class ResultWriter:
+    """
+    Écrit les résultats par paquets et tient le point de reprise à jour.
+
+    Un fichier n'est inscrit dans le point de reprise qu'après l'écriture
+    de son résultat : une interruption ne fait perdre aucun résultat écrit.
+    Les chemins déjà présents dans la sortie sont aussi ignorés à la
+    reprise : une interruption entre les deux écritures ne crée pas de
+    doublon.
+    """
+
+    def __init__(self, output: str, fmt: str, batch_size: int = 500):
+        self.output = output
+        self.format = fmt
+        self.batch_size = batch_size
+        self.checkpoint = output.rstrip('/\\') + '.checkpoint'
+        self._pending = []
+        self._part = 0
+        if fmt == 'parquet':
+            os.makedirs(output, exist_ok=True)
+            self._part = len(glob.glob(os.path.join(output, 'part-*.parquet')))
+
+    def done(self) -> set:
+        """
+        Retourne les chemins déjà traités lors d'une exécution précédente
+        (point de reprise et résultats déjà écrits).
+        """
+        done = self._written()
+        if os.path.exists(self.checkpoint):
+            with open(self.checkpoint, encoding='utf-8') as f:
+                done.update(line.rstrip('\n') for line in f if line.strip())
+        return done
+
+    def _written(self) -> set:
+        """
+        Chemins dont le résultat est déjà dans la sortie.
+
+        Une dernière ligne JSONL incomplète (interruption pendant
+        l'écriture) est retirée : son fichier sera réanalysé.
+        """
+        if self.format == 'parquet':
+            parts = glob.glob(os.path.join(self.output, 'part-*.parquet'))
+            if not parts:
+                return set()
+            import pandas as pd
+            paths = set()
+            for part in parts:
+                paths.update(pd.read_parquet(part, columns=['path'])['path'])
+            return paths
+        if not os.path.exists(self.output):
+            return set()
+        paths = set()
+        complete = 0
+        with open(self.output, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                complete += len(line)
+                try:
+                    paths.add(json.loads(line)['path'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        if complete < os.path.getsize(self.output):
+            with open(self.output, 'r+b') as f:
+                f.truncate(complete)
+        return paths
+
+    def reset(self):
+        """
+        Efface les résultats et le point de reprise d'une exécution précédente.
+        """
+        if self.format == 'parquet':
+            for path in glob.glob(os.path.join(self.output, 'part-*.parquet')):
+                os.remove(path)
+            self._part = 0
+        elif os.path.exists(self.output):
+            os.remove(self.output)
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    def add(self, record: dict):
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        if self.format == 'parquet':
+            import pandas as pd
+            frame = pd.DataFrame([flatten_record(record) for record in self._pending])
+            path = os.path.join(self.output, f'part-{self._part:05d}.parquet')
+            # Fichier renommé une fois complet : jamais de partie tronquée
+            frame.to_parquet(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+            self._part += 1
+        else:
+            with open(self.output, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n'
+                                for record in self._pending))
+        with open(self.checkpoint, 'a', encoding='utf-8') as f:
+            for record in self._pending:
+                f.write(record['path'] + '\n')
+        self._pending = []
+
+
+def run(paths: list, writer: ResultWriter, workers: int = None, chunksize: int = 16,
+        analyzer: SpeechAnalyzer = None, feedback_generator: FeedbackGenerator = None,
+        progress=None) -> int:
+    """
+    Analyse les fichiers en parallèle et envoie chaque résultat au writer.
+
+    L'analyse et le feedback sont calculés dans les processus de calcul.
+
+    Retourne:
+        int : Nombre de fichiers analysés
+    """
+    analyzer = analyzer or SpeechAnalyzer()
+    feedback_generator = feedback_generator or FeedbackGenerator()
+    headers = []
+
+    def read_texts():
+        # Les fichiers sont lus au fur et à mesure que le pool les demande
+        for path in paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                transcription = parse_transcription(f.read())
+            headers.append({'path': path, 'date': transcription['date'],
+                            'api': transcription['api']})
+            yield transcription['text']
+
+    items = ((text, False) for text in read_texts())
+    if workers == 1:
+        results = enumerate(
+            result for chunk in iter_chunks(items, chunksize)
+            for result in analyze_with_feedback(chunk, analyzer, feedback_generator))
+    else:
+        results = run_parallel(_serve_chunk, items, workers=workers, chunksize=chunksize,
+                               ordered=False, analyzer=analyzer,
+                               feedback_generator=feedback_generator)
+
+    count = 0
+    for index, result in results:
+        record = dict(headers[index])
+        record.update(result)
+        writer.add(record)
+        count += 1
+        if progress is not None:
+            progress(count)
+    writer.flush()
+    return count
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description="Analyse en lot des transcriptions sauvegardées."
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help="dossiers, fichiers ou motifs glob (ex: 'archives/**/*.txt')")
+    parser.add_argument('-o', '--output', required=True,
+                        help="fichier JSONL ou dossier Parquet de sortie")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'],
+                        help="format de sortie (par défaut parquet si la sortie se termine "
+                             "par 'parquet', jsonl sinon)")
+    parser.add_argument('--pattern', default='*.txt',
+                        help="motif des fichiers recherchés dans les dossiers")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help="nombre de fichiers envoyés à un processus à la fois")
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help="nombre de résultats écrits entre deux points de reprise")
+    parser.add_argument('--restart', action='store_true',
+                        help="effacer la sortie et le point de reprise, puis tout réanalyser")
+    parser.add_argument('--rules', default=None,
+                        help="fichier de règles de feedback JSON ou YAML "
+                             "(défaut : src/feedback_rules.json)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('parquet' if args.output.rstrip('/\\').endswith('parquet') else 'jsonl')
+    writer = ResultWriter(args.output, fmt, batch_size=args.batch_size)
+    if args.restart:
+        writer.reset()
+
+    paths = find_transcriptions(args.inputs, args.pattern)
+    done = writer.done()
+    todo = [path for path in paths if path not in done]
+    print(f"{len(paths)} fichiers trouvés, {len(paths) - len(todo)} déjà traités, "
+          f"{len(todo)} à analyser", file=sys.stderr)
+
+    def progress(count):
+        if count % 1000 == 0:
+            print(f"  {count}/{len(todo)} fichiers analysés", file=sys.stderr)
+
+    count = run(todo, writer, workers=args.workers, chunksize=args.chunksize,
+                feedback_generator=FeedbackGenerator(rules=args.rules), progress=progress)
+    print(f"Terminé : {count} fichiers analysés -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# coding: utf-8
+# ============================================
+# MODULE : ANALYSE D'UN CORPUS DE DISCOURS
+# ============================================
+# Range de nombreux résultats de SpeechAnalyzer.analyze() dans un
+# DataFrame (une ligne par discours, une colonne par mesure) et calcule
+# scores, percentiles, agrégations et indicateurs de feedback par
+# opérations vectorisées, sans boucle Python par discours.
+
+import json
+
+import pandas as pd
+
+from .feedback_generator import FeedbackGenerator
+from .rules import FeedbackRules
+
+# Colonnes numériques produites par analyze() ("section.mesure")
+METRIC_COLUMNS = [
+    'stats.word_count', 'stats.sentence_count', 'stats.avg_sentence_length',
+    'stats.unique_words', 'stats.vocabulary_richness',
+    'sentiment.polarity_score', 'sentiment.subjectivity',
+    'fillers.total_fillers', 'fillers.filler_rate_percent',
+    'clarity.clarity_score', 'clarity.avg_sentence_length',
+    'clarity.readability_score', 'clarity.syllables_per_word', 'clarity.long_word_ratio',
+    'clarity.lix', 'clarity.sentence_length_median', 'clarity.sentence_length_p90',
+    'clarity.sentence_length_max',
+    'structure.transition_count', 'structure.structure_score',
+    'audio.words_per_minute', 'audio.articulation_rate', 'audio.pause_count',
+    'audio.long_pause_count', 'audio.pause_median', 'audio.silence_ratio',
+]
+
+# Colonne du score global : score lu par read_results() ou recalculé par
+# global_scores(), agrégé avec les mesures
+SCORE_COLUMN = 'score_global'
+
+
+def results_to_frame(results, metadata=None, details: bool = False) -> pd.DataFrame:
+    """
+    Construit un tableau en colonnes à partir de résultats d'analyse.
+
+    Arguments:
+        results : Liste ou itérable de résultats de SpeechAnalyzer.analyze()
+                  (dictionnaires ou AnalysisResult)
+        metadata : Liste de dictionnaires (ex. orateur, date) alignée sur
+                   results, ajoutés comme colonnes
+        details : True pour garder le détail des mots de remplissage
+                  (colonne 'fillers.filler_details', dictionnaires)
+
+    Retourne:
+        DataFrame : Une ligne par discours, colonnes "section.mesure"
+    """
+    columns = {}
+    count = 0
+    for result in results:
+        if hasattr(result, 'to_dict'):
+            result = result.to_dict()
+        for section, values in result.items():
+            if section in ('timings', 'sentences'):
+                continue
+            for name, value in values.items():
+                if isinstance(value, dict) and not details:
+                    continue
+                columns.setdefault(f'{section}.{name}', [None] * count).append(value)
+        count += 1
+        for values in columns.values():
+            if len(values) < count:
+                values.append(None)
+
+    frame = pd.DataFrame(columns, index=pd.RangeIndex(count))
+    if metadata is not None:
+        meta = pd.DataFrame(list(metadata), index=frame.index)
+        frame = pd.concat([meta, frame], axis=1)
+    if 'date' in frame.columns:
+        frame['date'] = pd.to_datetime(frame['date'], errors='coerce')
+    return frame
+
+
+def read_results(path: str, details: bool = False) -> pd.DataFrame:
+    """
+    Charge le fichier JSONL écrit par l'outil en ligne de commande (src.cli).
+
+    Les champs path, date et api deviennent des colonnes, ainsi que le
+    score global du feedback (SCORE_COLUMN, même colonne que global_scores()).
+    """
+    results, metadata = [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            results.append(record['analysis'])
+            meta = {key: value for key, value in record.items()
+                    if key not in ('analysis', 'feedback')}
+            if 'feedback' in record:
+                meta[SCORE_COLUMN] = record['feedback']['score_global']
+            metadata.append(meta)
+    return results_to_frame(results, metadata, details=details)
+
+
+def global_scores(frame: pd.DataFrame, generator: FeedbackGenerator = None) -> pd.Series:
+    """
+    Recalcule le score global de tous les discours en une opération.
+
+    Même pondération que FeedbackGenerator (termes 'score' de la table de
+    règles), appliquée aux colonnes entières.
+    """
+    return _rules(generator).scores(frame)
+
+
+def feedback_flags(frame: pd.DataFrame, generator: FeedbackGenerator = None) -> pd.DataFrame:
+    """
+    Évalue les seuils du feedback pour tous les discours à la fois.
+
+    Retourne:
+        DataFrame : Une colonne booléenne par règle de feedback (nom de la règle)
+    """
+    return _rules(generator).flags(frame)
+
+
+def _rules(generator: FeedbackGenerator = None) -> FeedbackRules:
+    return generator.rules if generator is not None else FeedbackRules.default()
+
+
+def percentiles(frame: pd.DataFrame, columns: list = None,
+                q: tuple = (0.1, 0.25, 0.5, 0.75, 0.9)) -> pd.DataFrame:
+    """
+    Calcule les percentiles des mesures (une ligne par percentile).
+    """
+    columns = columns or [c for c in METRIC_COLUMNS if c in frame.columns]
+    return frame[columns].quantile(list(q))
+
+
+def aggregate(frame: pd.DataFrame, by, columns: list = None,
+              funcs: tuple = ('mean', 'median', 'count'), freq: str = None) -> pd.DataFrame:
+    """
+    Agrège les mesures par groupe (orateur, date, API...).
+
+    Arguments:
+        by : Colonne ou liste de colonnes de regroupement
+        columns : Mesures à agréger (par défaut toutes les mesures numériques)
+        funcs : Fonctions d'agrégation pandas
+        freq : Période de regroupement de la colonne 'date' (ex. 'D', 'W', 'MS')
+
+    Retourne:
+        DataFrame : Une ligne par groupe, colonnes (mesure, fonction)
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    if freq is not None:
+        by = [pd.Grouper(key='date', freq=freq) if key == 'date' else key for key in by]
+    columns = columns or [c for c in METRIC_COLUMNS if c in frame.columns]
+    if SCORE_COLUMN in frame.columns and SCORE_COLUMN not in columns:
+        columns = columns + [SCORE_COLUMN]
+    return frame.groupby(by)[columns].agg(list(funcs))
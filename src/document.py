@@ -0,0 +1,95 @@
+# coding: utf-8
+# ============================================
+# MODULE : DOCUMENT PRÉ-TRAITÉ
+# ============================================
+# Tokenise un discours une seule fois (phrases, mots, positions)
+# pour que toutes les étapes d'analyse partagent le même résultat.
+#
+# NLTK n'est importé qu'à la première tokenisation : importer le
+# package src reste rapide (outils en ligne de commande, processus
+# de calcul de courte durée).
+
+_tokenizers = None
+
+
+def ensure_nltk_resources():
+    """
+    Importe NLTK et vérifie la présence des ressources punkt.
+
+    Les ressources manquantes sont téléchargées au premier appel.
+
+    Retourne:
+        tuple : Les fonctions (sent_tokenize, word_tokenize)
+    """
+    global _tokenizers
+    if _tokenizers is None:
+        import nltk
+        from nltk.tokenize import sent_tokenize, word_tokenize
+
+        for resource in ('punkt_tab', 'punkt'):
+            try:
+                nltk.data.find(f'tokenizers/{resource}')
+            except LookupError:
+                print("Téléchargement des ressources NLTK en cours...")
+                nltk.download(resource)
+        _tokenizers = (sent_tokenize, word_tokenize)
+    return _tokenizers
+
+
+class Document:
+    """
+    Discours découpé en phrases et en mots, construit une fois par analyse.
+
+    Attributs:
+        text : Texte d'origine
+        lower : Texte en minuscules
+        sentences : Liste des phrases (sous-chaînes de text)
+        sentence_spans : Positions (début, fin) de chaque phrase dans text
+        sentence_tokens : Mots de chaque phrase
+        tokens : Tous les mots du discours
+        lower_tokens : Tous les mots en minuscules
+    """
+
+    def __init__(self, text: str, language: str = 'french'):
+        """
+        Tokenise le texte.
+
+        word_tokenize() découpe d'abord en phrases puis tokenise chaque
+        phrase : on fait la même chose ici en réutilisant les phrases,
+        ce qui donne exactement les mêmes mots en un seul passage.
+        """
+        sent_tokenize, word_tokenize = ensure_nltk_resources()
+        self.text = text
+        self.lower = text.lower()
+        self.sentences = sent_tokenize(text, language=language)
+        self.sentence_spans = self._locate(text, self.sentences)
+        self.sentence_tokens = [
+            word_tokenize(sentence, language=language, preserve_line=True)
+            for sentence in self.sentences
+        ]
+        self.tokens = [token for tokens in self.sentence_tokens for token in tokens]
+        self.lower_tokens = [token.lower() for token in self.tokens]
+
+    @staticmethod
+    def _locate(text: str, sentences: list) -> list:
+        """
+        Retrouve la position de chaque phrase dans le texte d'origine.
+        """
+        spans = []
+        position = 0
+        for sentence in sentences:
+            start = text.find(sentence, position)
+            if start < 0:
+                start = position
+            end = start + len(sentence)
+            spans.append((start, end))
+            position = end
+        return spans
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
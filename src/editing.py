@@ -0,0 +1,210 @@
+# coding: utf-8
+# ============================================
+# MODULE : RÉANALYSE INCRÉMENTALE À L'ÉDITION
+# ============================================
+# Quand l'utilisateur modifie son discours puis relance l'analyse,
+# seules les phrases nouvelles ou modifiées sont retokenisées et
+# notées : les mesures de chaque phrase sont gardées en cache (clé :
+# le texte de la phrase) et les mesures du document sont réagrégées.
+# Un texte déjà analysé est repris du cache de l'analyseur s'il en a un.
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from .analyzer import SpeechAnalyzer
+from .document import Document, ensure_nltk_resources
+from .readability import measure_sentences
+from .results import AnalysisResult
+from .sentences import SentenceIndex
+
+
+@dataclass(slots=True)
+class SentenceRecord:
+    """
+    Mesures d'une phrase, indépendantes de sa position dans le texte.
+
+    Attributs:
+        token_count : Nombre de mots
+        vocabulary : Mots distincts en minuscules
+        fillers : Mots de remplissage (début, fin, mot), positions dans la phrase
+        positive, negative, sentiment_hits : Scores du lexique de sentiment
+        transition_count : Nombre de mots de transition
+        word_count, syllables, long_words : Mesures de lisibilité (mots sans
+                                            la ponctuation, syllabes, mots longs)
+    """
+    token_count: int
+    vocabulary: frozenset
+    fillers: tuple
+    positive: float
+    negative: float
+    sentiment_hits: int
+    transition_count: int
+    word_count: int
+    syllables: int
+    long_words: int
+
+
+class EditSession:
+    """
+    Analyse un discours qui change peu d'une version à la suivante.
+
+    Le texte est redécoupé en phrases à chaque appel ; une phrase déjà
+    vue (même texte exact) reprend ses mesures du cache, les autres sont
+    tokenisées et notées. Les résultats sont identiques à ceux de
+    SpeechAnalyzer.analyze() sur le texte complet.
+
+    Exemple:
+        >>> session = EditSession()
+        >>> results = session.analyze(text)
+        >>> results = session.analyze(text_modifie)  # phrases modifiées seulement
+        >>> session.last_computed
+        1
+    """
+
+    def __init__(self, analyzer: SpeechAnalyzer = None, max_sentences: int = 4096,
+                 language: str = 'french'):
+        """
+        Arguments:
+            analyzer : Analyseur fournissant lexiques et règles de calcul
+                       (par défaut un SpeechAnalyzer standard)
+            max_sentences : Nombre maximal de phrases gardées en cache
+            language : Langue de la tokenisation
+        """
+        self.analyzer = analyzer or SpeechAnalyzer()
+        self.max_sentences = max_sentences
+        self.language = language
+        self._records = OrderedDict()
+        # Phrases reprises du cache et recalculées au dernier appel
+        self.last_reused = 0
+        self.last_computed = 0
+
+    def clear(self):
+        """
+        Vide le cache des phrases.
+        """
+        self._records.clear()
+
+    def _record(self, sentence: str) -> SentenceRecord:
+        record = self._records.get(sentence)
+        if record is not None:
+            self._records.move_to_end(sentence)
+            self.last_reused += 1
+            return record
+
+        _, word_tokenize = ensure_nltk_resources()
+        analyzer = self.analyzer
+        words = [token.lower() for token in
+                 word_tokenize(sentence, language=self.language, preserve_line=True)]
+        positive, negative, hits = analyzer.lexicon.score(words)
+        syllables, long_words, lengths = measure_sentences(words, [len(words)])
+        record = SentenceRecord(
+            token_count=len(words),
+            vocabulary=frozenset(words),
+            fillers=tuple(analyzer.filler_matcher.finditer(sentence)),
+            positive=positive,
+            negative=negative,
+            sentiment_hits=hits,
+            transition_count=sum(1 for _ in analyzer.transition_matcher.finditer(sentence)),
+            word_count=int(lengths[0]),
+            syllables=syllables,
+            long_words=long_words
+        )
+        self._records[sentence] = record
+        if len(self._records) > self.max_sentences:
+            self._records.popitem(last=False)
+        self.last_computed += 1
+        return record
+
+    def _split(self, text: str) -> tuple:
+        """
+        Découpe le texte en phrases et retourne (phrases, mesures de chaque phrase).
+        """
+        sent_tokenize, _ = ensure_nltk_resources()
+        sentences = sent_tokenize(text, language=self.language)
+        self.last_reused = self.last_computed = 0
+        return sentences, [self._record(sentence) for sentence in sentences]
+
+    def word_count(self, text: str) -> int:
+        """
+        Compte les mots du texte (même résultat que word_tokenize) avec le cache.
+        """
+        return sum(record.token_count for record in self._split(text)[1])
+
+    def analyze(self, text: str, compact: bool = False, sentence_index: bool = False):
+        """
+        Analyse le texte en ne recalculant que les phrases modifiées.
+
+        Les résultats étant identiques à ceux de SpeechAnalyzer.analyze(),
+        le cache de l'analyseur (s'il est configuré) est partagé : un texte
+        déjà analysé, par cette session ou par l'analyseur, n'est pas
+        redécoupé.
+
+        Arguments:
+            text : Discours à analyser
+            compact : True pour obtenir un AnalysisResult au lieu d'un dict
+            sentence_index : True pour ajouter la section 'sentences'
+
+        Retourne:
+            dict ou AnalysisResult : même format que SpeechAnalyzer.analyze()
+        """
+        analyzer = self.analyzer
+        cache = analyzer.cache
+        if cache is not None:
+            key = analyzer._cache_key(text, sentence_index)
+            cached = cache.get(key)
+            if cached is not None:
+                self.last_reused = self.last_computed = 0
+                return AnalysisResult.from_dict(cached) if compact else cached
+        sentences, records = self._split(text)
+        word_count = sum(record.token_count for record in records)
+        sentence_count = len(sentences)
+        filler_counts = Counter(filler for record in records for _, _, filler in record.fillers)
+        results = AnalysisResult(
+            stats=analyzer._stats_from_counts(
+                word_count, sentence_count,
+                len(frozenset().union(*(record.vocabulary for record in records)))
+            ),
+            sentiment=analyzer._sentiment_from_scores(
+                sum(record.positive for record in records),
+                sum(record.negative for record in records),
+                sum(record.sentiment_hits for record in records),
+                word_count, lambda: analyzer._fallback_polarity(text)
+            ),
+            fillers=analyzer._fillers_from_counts(filler_counts, word_count),
+            clarity=analyzer._clarity_from_counts(
+                word_count, sentence_count,
+                [record.word_count for record in records],
+                sum(record.syllables for record in records),
+                sum(record.long_words for record in records)
+            ),
+            structure=analyzer._structure_from_counts(
+                sum(1 for record in records if record.transition_count), sentence_count
+            ),
+            sentences=self._sentence_index(text, sentences, records) if sentence_index else None
+        )
+        if cache is not None:
+            cache.set(key, results.to_dict())
+        return results if compact else results.to_dict()
+
+    @staticmethod
+    def _sentence_index(text: str, sentences: list, records: list) -> SentenceIndex:
+        spans = Document._locate(text, sentences)
+        filler_starts, filler_ends, filler_sentences = [], [], []
+        for index, ((start, _), record) in enumerate(zip(spans, records)):
+            for filler_start, filler_end, _ in record.fillers:
+                filler_starts.append(start + filler_start)
+                filler_ends.append(start + filler_end)
+                filler_sentences.append(index)
+        return SentenceIndex(
+            starts=[start for start, _ in spans],
+            ends=[end for _, end in spans],
+            token_counts=[record.token_count for record in records],
+            filler_counts=[len(record.fillers) for record in records],
+            sentiment_hits=[record.sentiment_hits for record in records],
+            positive=[record.positive for record in records],
+            negative=[record.negative for record in records],
+            transition_counts=[record.transition_count for record in records],
+            filler_starts=filler_starts,
+            filler_ends=filler_ends,
+            filler_sentences=filler_sentences
+        )
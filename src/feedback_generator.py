@@ -7,6 +7,19 @@
 #   - Points à améliorer
 #   - Recommandations concrètes
 
+import json
+from functools import partial
+
+from .batch import _generate_chunk, run_parallel
+from .cache import ResultCache
+from .results import AnalysisResult, Feedback
+from .rules import FeedbackRules
+
+# Sections d'analyse sans effet sur le feedback, exclues de la clé de cache
+# (les durées par étape changent à chaque analyse)
+UNSCORED_SECTIONS = ('timings', 'sentences')
+
+
 class FeedbackGenerator:
     """
     Classe qui génère un feedback structuré à partir des résultats d'analyse.
@@ -15,12 +28,36 @@ class FeedbackGenerator:
     et donne des actions concrètes pour s'améliorer.
     """
     
-    def generate(self, analysis_results: dict) -> dict:
+    def __init__(self, cache: ResultCache = None, rules=None):
+        """
+        Arguments:
+            cache : Cache de résultats facultatif (voir ResultCache)
+            rules : Règles de feedback (FeedbackRules ou chemin d'un fichier
+                    JSON/YAML ; par défaut src/feedback_rules.json)
+        """
+        self.cache = cache
+        if rules is None:
+            rules = FeedbackRules.default()
+        elif isinstance(rules, str):
+            rules = FeedbackRules.from_file(rules)
+        self.rules = rules
+    
+    @property
+    def fingerprint(self) -> str:
+        """
+        Version des règles de feedback : change avec la table de règles
+        (invalide les feedbacks mémorisés dans le cache).
+        """
+        return f'feedback-{self.rules.version}'
+    
+    def generate(self, analysis_results, compact: bool = False):
         """
         Génère un feedback complet à partir des résultats d'analyse.
         
         Arguments:
-            analysis_results : Dictionnaire retourné par SpeechAnalyzer.analyze()
+            analysis_results : Dictionnaire ou AnalysisResult retourné par
+                               SpeechAnalyzer.analyze()
+            compact : True pour obtenir un objet Feedback au lieu d'un dict
             
         Retourne:
             dict : Feedback structuré contenant :
@@ -29,164 +66,89 @@ class FeedbackGenerator:
                 - points_amelioration : Liste des aspects à améliorer
                 - recommandations : Conseils concrets et actionnables
         """
-        # Initialiser la structure du feedback
-        feedback = {
-            'score_global': self._calculate_global_score(analysis_results),
-            'points_forts': [],
-            'points_amelioration': [],
-            'recommandations': []
-        }
-        
-        # Analyser chaque aspect du discours
-        # Chaque méthode remplit les listes du feedback
-        self._feedback_stats(analysis_results['stats'], feedback)
-        self._feedback_sentiment(analysis_results['sentiment'], feedback)
-        self._feedback_fillers(analysis_results['fillers'], feedback)
-        self._feedback_clarity(analysis_results['clarity'], feedback)
-        self._feedback_structure(analysis_results['structure'], feedback)
+        if self.cache is None:
+            feedback = self._generate(analysis_results)
+        else:
+            if isinstance(analysis_results, AnalysisResult):
+                analysis_results = analysis_results.to_dict()
+            scored = {name: section for name, section in analysis_results.items()
+                      if name not in UNSCORED_SECTIONS}
+            key = ResultCache.make_key(
+                'generate', self.fingerprint,
+                json.dumps(scored, sort_keys=True, ensure_ascii=False)
+            )
+            feedback = self.cache.get(key)
+            if feedback is None:
+                feedback = self._generate(analysis_results)
+                self.cache.set(key, feedback)
+        return Feedback.from_dict(feedback) if compact else feedback
+    
+    def _generate(self, analysis_results: dict) -> dict:
+        """
+        Construit le feedback (sans passer par le cache).
         
-        return feedback
+        Chaque règle de la table compare une mesure à un seuil et ajoute
+        ses messages aux points forts, points à améliorer ou recommandations.
+        """
+        return self.rules.evaluate(analysis_results)
     
-    def _calculate_global_score(self, results: dict) -> float:
+    def generate_batch(self, results, compact: bool = False) -> list:
         """
-        Calcule le score global sur 10 basé sur tous les critères.
+        Génère le feedback d'un lot de résultats dans le processus courant.
         
-        La formule pondère différents aspects :
-        - Clarté : 40% (le plus important)
-        - Structure : 40% (très important aussi)
-        - Absence de mots parasites : 20%
+        Sans cache, les règles préparées sont appliquées directement à
+        chaque résultat (voir FeedbackRules.evaluate_many).
         
         Arguments:
-            results : Résultats complets de l'analyse
+            results : Liste ou itérable de résultats de SpeechAnalyzer.analyze()
+            compact : True pour obtenir des objets Feedback
             
         Retourne:
-            float : Score sur 10
-        """
-        # Récupérer les scores individuels
-        clarity_score = results['clarity']['clarity_score']
-        structure_score = results['structure']['structure_score']
-        
-        # Calculer la pénalité pour les mots parasites
-        # Plus il y a de mots parasites, plus la pénalité est forte
-        # On limite la pénalité à 3 points maximum
-        filler_penalty = min(3, results['fillers']['filler_rate_percent'] / 2)
-        
-        # Calculer le score global avec pondération
-        # 40% clarté + 40% structure + 20% absence de parasites
-        score = (
-            clarity_score * 0.4 + 
-            structure_score * 0.4 + 
-            (10 - filler_penalty) * 0.2
-        )
-        
-        # S'assurer que le score reste entre 0 et 10
-        # min() garantit qu'on ne dépasse pas 10
-        # max() garantit qu'on ne descend pas sous 0
-        return round(min(10, max(0, score)), 1)
-    
-    def _feedback_stats(self, stats: dict, feedback: dict):
-        """
-        Génère le feedback sur les statistiques de base.
-        
-        Évalue principalement la longueur du discours.
+            list : Les feedbacks, dans l'ordre des résultats
         """
-        word_count = stats['word_count']
-        
-        # Évaluer la longueur
-        # Pour un discours standard, 100-500 mots est une bonne longueur
-        if 100 <= word_count <= 500:
-            feedback['points_forts'].append(
-                f"Longueur appropriée ({word_count} mots)"
-            )
-        elif word_count < 100:
-            feedback['points_amelioration'].append(
-                f"Discours un peu court ({word_count} mots)"
-            )
-            feedback['recommandations'].append(
-                "Développez davantage vos arguments avec des exemples concrets"
-            )
+        if self.cache is None:
+            feedbacks = self.rules.evaluate_many(results)
         else:
-            feedback['points_amelioration'].append(
-                f"Discours un peu long ({word_count} mots)"
-            )
-            feedback['recommandations'].append(
-                "Concentrez-vous sur l'essentiel, soyez plus concis"
-            )
+            feedbacks = [self.generate(result) for result in results]
+        return [Feedback.from_dict(feedback) for feedback in feedbacks] if compact else feedbacks
     
-    def _feedback_sentiment(self, sentiment: dict, feedback: dict):
+    def generate_many(self, results, workers: int = None, chunksize: int = 64,
+                      ordered: bool = True, compact: bool = False):
         """
-        Génère le feedback sur le sentiment du discours.
+        Génère le feedback de plusieurs analyses en parallèle.
+        
+        Arguments:
+            results : Liste ou itérable de résultats de SpeechAnalyzer.analyze()
+            workers : Nombre de processus (1 pour rester dans le processus courant)
+            chunksize : Nombre de résultats envoyés à un processus à la fois
+            ordered : True pour conserver l'ordre d'entrée
+            compact : True pour obtenir des objets Feedback
+            
+        Retourne:
+            générateur : les feedbacks dans l'ordre si ordered,
+            sinon des couples (index, feedback) au fil de l'eau
         """
-        # Un ton positif est généralement apprécié
-        if sentiment['sentiment'] == 'Positif':
-            feedback['points_forts'].append(
-                "Ton positif et engageant"
-            )
-        elif sentiment['sentiment'] == 'Négatif':
-            feedback['points_amelioration'].append(
-                "Ton un peu négatif"
-            )
-            feedback['recommandations'].append(
-                "Essayez d'adopter un ton plus positif et constructif"
-            )
+        if workers == 1:
+            feedbacks = (self.generate(result, compact=compact) for result in results)
+            return feedbacks if ordered else enumerate(feedbacks)
+        task = partial(_generate_chunk, compact=compact)
+        return run_parallel(task, results, workers=workers,
+                            chunksize=chunksize, ordered=ordered,
+                            feedback_generator=self)
     
-    def _feedback_fillers(self, fillers: dict, feedback: dict):
+    def _calculate_global_score(self, results: dict) -> float:
         """
-        Génère le feedback sur les mots de remplissage.
+        Calcule le score global sur 10 basé sur tous les critères.
         
-        Les mots parasites sont un indicateur important de la qualité
-        de la préparation et de la maîtrise du sujet.
-        """
-        filler_rate = fillers['filler_rate_percent']
+        La pondération vient de la table de règles ('score') ; par défaut :
+        - Clarté : 40% (le plus important)
+        - Structure : 40% (très important aussi)
+        - Absence de mots parasites : 20% (pénalité limitée à 3 points)
         
-        # Seuils d'évaluation
-        if filler_rate < 2:
-            feedback['points_forts'].append(
-                "Très peu de mots de remplissage"
-            )
-        elif filler_rate > 5:
-            feedback['points_amelioration'].append(
-                f"Trop de mots de remplissage ({filler_rate}%)"
-            )
+        Arguments:
+            results : Résultats complets de l'analyse
             
-            # Identifier les mots les plus fréquents
-            if fillers['filler_details']:
-                most_common = max(fillers['filler_details'], 
-                                key=fillers['filler_details'].get)
-                feedback['recommandations'].append(
-                    f"Vous utilisez beaucoup '{most_common}'. "
-                    "Faites des pauses silencieuses à la place."
-                )
-    
-    def _feedback_clarity(self, clarity: dict, feedback: dict):
-        """
-        Génère le feedback sur la clarté du discours.
-        """
-        if clarity['clarity_score'] >= 7:
-            feedback['points_forts'].append(
-                f"Message clair ({clarity['clarity_level']})"
-            )
-        else:
-            feedback['points_amelioration'].append(
-                f"Clarté à améliorer ({clarity['clarity_level']})"
-            )
-            feedback['recommandations'].append(
-                "Utilisez des phrases plus courtes et simples (15-20 mots maximum)"
-            )
-    
-    def _feedback_structure(self, structure: dict, feedback: dict):
-        """
-        Génère le feedback sur la structure du discours.
+        Retourne:
+            float : Score sur 10
         """
-        if structure['has_structure']:
-            feedback['points_forts'].append(
-                f"Bonne structure avec {structure['transition_count']} transitions"
-            )
-        else:
-            feedback['points_amelioration'].append(
-                "Structure peu visible"
-            )
-            feedback['recommandations'].append(
-                "Ajoutez des mots de transition : 'Premièrement...', "
-                "'Ensuite...', 'Enfin...'"
-            )
\ No newline at end of file
+        return self.rules.score(results)
@@ -0,0 +1,209 @@
+# coding: utf-8
+# ============================================
+# MODULE : LEXIQUE DE SENTIMENT
+# ============================================
+# Dictionnaire mot -> poids chargé une seule fois, utilisé pour
+# noter le sentiment d'un discours en un seul passage sur ses mots.
+
+import hashlib
+import os
+
+# Lexique intégré (poids +1 / -1)
+MOTS_POSITIFS = frozenset([
+    'excellent', 'bon', 'bien', 'super', 'génial', 'parfait',
+    'formidable', 'magnifique', 'merveilleux', 'fantastique',
+    'réussi', 'positif', 'agréable', 'efficace', 'performant',
+    'qualité', 'satisfait', 'heureux', 'content', 'enthousiaste'
+])
+
+MOTS_NEGATIFS = frozenset([
+    'mauvais', 'mal', 'problème', 'échec', 'erreur', 'difficile',
+    'négatif', 'désagréable', 'inefficace', 'médiocre',
+    'insatisfait', 'malheureux', 'triste', 'inquiet', 'critique'
+])
+
+# Noms de colonnes reconnus dans l'en-tête d'un fichier de lexique
+_WORD_COLUMNS = {'word', 'mot', 'terme', 'term', 'lemma', 'lemme'}
+_VALUE_COLUMNS = {'polarity', 'polarite', 'polarité', 'sentiment',
+                  'score', 'weight', 'poids', 'valence'}
+
+# Étiquettes de polarité reconnues à la place d'un poids numérique
+_LABELS = {
+    'positive': 1.0, 'positif': 1.0, 'pos': 1.0,
+    'negative': -1.0, 'négatif': -1.0, 'negatif': -1.0, 'neg': -1.0
+}
+
+
+class SentimentLexicon:
+    """
+    Lexique de sentiment : dictionnaire mot -> poids.
+
+    Un poids positif marque un mot positif, un poids négatif un mot
+    négatif. La recherche d'un mot est en temps constant : noter un
+    discours coûte un passage sur ses mots, quelle que soit la taille
+    du lexique.
+    """
+
+    def __init__(self, weights: dict, name: str = 'personnalisé'):
+        """
+        Arguments:
+            weights : Dictionnaire mot -> poids (les poids nuls sont ignorés)
+            name : Nom du lexique (affiché et utilisé pour l'identifier)
+        """
+        self.weights = {
+            word.lower(): float(weight) for word, weight in weights.items() if weight
+        }
+        self.name = name
+        self._version = None
+
+    @property
+    def version(self) -> str:
+        """
+        Empreinte du contenu du lexique (change dès qu'un poids change).
+        """
+        if self._version is None:
+            digest = hashlib.sha256()
+            for word, weight in sorted(self.weights.items()):
+                digest.update(f'{word}\t{weight!r}\n'.encode('utf-8'))
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __contains__(self, word):
+        return word in self.weights
+
+    @classmethod
+    def default(cls) -> 'SentimentLexicon':
+        """
+        Retourne le lexique intégré (mots positifs et négatifs de base).
+        """
+        weights = dict.fromkeys(MOTS_POSITIFS, 1.0)
+        weights.update(dict.fromkeys(MOTS_NEGATIFS, -1.0))
+        return cls(weights, name='défaut')
+
+    @classmethod
+    def from_file(cls, path: str, name: str = None, encoding: str = 'utf-8') -> 'SentimentLexicon':
+        """
+        Charge un lexique depuis un fichier texte délimité.
+
+        Formats acceptés (séparateur tabulation, point-virgule ou virgule) :
+            - "mot;poids" ou "mot;positive" (une entrée par ligne)
+            - fichier avec en-tête, ex. FEEL : "id;word;polarity;joy;..."
+            - NRC EmoLex : "mot<TAB>positive<TAB>1"
+        Les lignes vides ou commençant par # sont ignorées.
+
+        Arguments:
+            path : Chemin du fichier
+            name : Nom du lexique (par défaut le nom du fichier)
+            encoding : Encodage du fichier
+
+        Retourne:
+            SentimentLexicon : Le lexique chargé
+        """
+        weights = {}
+        delimiter = None
+        word_index, value_index = 0, 1
+
+        with open(path, encoding=encoding) as f:
+            for line_number, line in enumerate(f):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if delimiter is None:
+                    delimiter = next((d for d in ('\t', ';', ',') if d in line), None)
+                    fields = [field.strip().lower() for field in line.split(delimiter)]
+                    header_words = [i for i, field in enumerate(fields) if field in _WORD_COLUMNS]
+                    header_values = [i for i, field in enumerate(fields) if field in _VALUE_COLUMNS]
+                    if header_words and header_values:
+                        word_index, value_index = header_words[0], header_values[0]
+                        continue
+
+                fields = [field.strip() for field in line.split(delimiter)]
+                if len(fields) <= max(word_index, value_index):
+                    raise ValueError(
+                        f"{path}:{line_number + 1} : ligne de lexique invalide ({line!r})"
+                    )
+                word = fields[word_index].lower()
+                weight = cls._parse_weight(fields[value_index])
+                # NRC EmoLex : mot, émotion, association (0 ou 1)
+                if len(fields) == 3 and value_index == 1 and weight is not None:
+                    weight = weight if fields[2] not in ('0', '0.0') else None
+                if weight:
+                    weights[word] = weights.get(word, 0.0) + weight
+
+        return cls(weights, name=name or os.path.basename(path))
+
+    @staticmethod
+    def _parse_weight(value: str):
+        """
+        Convertit un poids ou une étiquette de polarité en nombre.
+
+        Retourne None pour les étiquettes non reconnues (émotions, neutre).
+        """
+        label = _LABELS.get(value.lower())
+        if label is not None:
+            return label
+        try:
+            return float(value.replace(',', '.'))
+        except ValueError:
+            return None
+
+    def score(self, tokens) -> tuple:
+        """
+        Note une liste de mots en minuscules en un seul passage.
+
+        Retourne:
+            tuple : (somme des poids positifs, somme des poids négatifs
+                     en valeur absolue, nombre de mots trouvés)
+        """
+        weights = self.weights
+        positive = negative = 0.0
+        hits = 0
+        for token in tokens:
+            weight = weights.get(token)
+            if weight is None:
+                continue
+            hits += 1
+            if weight > 0:
+                positive += weight
+            else:
+                negative -= weight
+        return positive, negative, hits
+
+    def score_sentences(self, tokens, lengths) -> tuple:
+        """
+        Note une liste de mots phrase par phrase, en un seul passage.
+
+        Arguments:
+            tokens : Mots en minuscules du discours
+            lengths : Nombre de mots de chaque phrase, dans l'ordre de tokens
+
+        Retourne:
+            tuple : (scores du discours entier, identiques à score(tokens),
+                     liste des scores de chaque phrase)
+        """
+        weights = self.weights
+        positive = negative = 0.0
+        hits = 0
+        sentences = []
+        position = 0
+        for length in lengths:
+            sentence_positive = sentence_negative = 0.0
+            sentence_hits = 0
+            for token in tokens[position:position + length]:
+                weight = weights.get(token)
+                if weight is None:
+                    continue
+                sentence_hits += 1
+                if weight > 0:
+                    positive += weight
+                    sentence_positive += weight
+                else:
+                    negative -= weight
+                    sentence_negative -= weight
+            hits += sentence_hits
+            sentences.append((sentence_positive, sentence_negative, sentence_hits))
+            position += length
+        return (positive, negative, hits), sentences
@@ -0,0 +1,106 @@
+# coding: utf-8
+# ============================================
+# MODULE : RECHERCHE DE LOCUTIONS
+# ============================================
+# Recherche simultanée de nombreuses expressions (mots de remplissage,
+# mots de transition...) en un seul passage sur le texte.
+
+import re
+from collections import Counter
+
+
+class PhraseMatcher:
+    """
+    Trouve toutes les occurrences d'une liste d'expressions en un seul passage.
+
+    Les expressions sont rangées dans un arbre de préfixes (trie) puis
+    converties en une seule expression régulière compilée. Chaque position
+    du texte ne suit qu'une branche de l'arbre : le coût dépend de la
+    longueur du texte et non du nombre d'expressions. À position égale,
+    l'expression la plus longue l'emporte ("en fait" plutôt que "en").
+
+    Exemple:
+        >>> matcher = PhraseMatcher(['du coup', 'euh'])
+        >>> matcher.find("Euh, du coup...")
+        [(0, 3, 'euh'), (5, 12, 'du coup')]
+    """
+
+    def __init__(self, phrases, word_chars: str = ''):
+        """
+        Arguments:
+            phrases : Expressions à rechercher (insensible à la casse)
+            word_chars : Caractères considérés comme faisant partie d'un mot
+                         en plus des lettres et chiffres (ex: "'" pour que
+                         "après" ne soit pas trouvé dans "d'après")
+        """
+        self.phrases = tuple(dict.fromkeys(phrase.lower() for phrase in phrases if phrase))
+        # Expression du lexique pour chaque texte trouvé : IGNORECASE
+        # accepte des variantes dont .lower() n'est pas dans le lexique
+        # (ex. "diſons" pour "disons"), rattachées par casefold()
+        self._canonical = {phrase: phrase for phrase in self.phrases}
+        for phrase in self.phrases:
+            self._canonical.setdefault(phrase.casefold(), phrase)
+        boundary = r'\w' if not word_chars else r'[\w' + re.escape(word_chars) + ']'
+        trie = {}
+        for phrase in self.phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[''] = True
+        body = self._to_regex(trie) if self.phrases else '(?!)'
+        self.pattern = re.compile(
+            '(?<!' + boundary + ')(?:' + body + ')(?!' + boundary + ')',
+            re.IGNORECASE
+        )
+
+    @classmethod
+    def _to_regex(cls, node: dict) -> str:
+        """
+        Convertit un nœud du trie en expression régulière.
+
+        Une fin d'expression au milieu d'une branche devient un groupe
+        optionnel gourmand : la variante la plus longue est essayée d'abord.
+        """
+        branches = [
+            re.escape(char) + cls._to_regex(child)
+            for char, child in sorted(node.items()) if char != ''
+        ]
+        if not branches:
+            return ''
+        if len(branches) == 1:
+            regex = branches[0]
+        else:
+            regex = '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            regex = '(?:' + regex + ')?'
+        return regex
+
+    def finditer(self, text: str, start: int = 0, end: int = None):
+        """
+        Parcourt les occurrences sous forme de couples (début, fin, expression).
+        """
+        end = len(text) if end is None else end
+        for match in self.pattern.finditer(text, start, end):
+            yield match.start(), match.end(), self._phrase(match.group())
+
+    def find(self, text: str) -> list:
+        """
+        Retourne la liste des occurrences (début, fin, expression).
+        """
+        return list(self.finditer(text))
+
+    def count(self, text: str) -> Counter:
+        """
+        Compte les occurrences de chaque expression.
+        """
+        return Counter(self._phrase(match.group()) for match in self.pattern.finditer(text))
+
+    def _phrase(self, matched: str) -> str:
+        """
+        Expression du lexique correspondant au texte trouvé.
+        """
+        canonical = self._canonical
+        phrase = canonical.get(matched.lower())
+        if phrase is None:
+            phrase = canonical.get(matched.casefold(), matched.lower())
+        return phrase
@@ -0,0 +1,219 @@
+# coding: utf-8
+# ============================================
+# MODULE : MESURES DE PERFORMANCE
+# ============================================
+# Chronométrage des étapes de l'analyse et registre de métriques
+# (compteurs, jauges, histogrammes) au format texte de Prometheus.
+
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+# Bornes (secondes) des histogrammes de durée
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Counter:
+    """
+    Compteur croissant, éventuellement découpé par étiquettes.
+    """
+
+    def __init__(self, name: str, documentation: str = ''):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        # Copie sous verrou : inc() peut être appelé pendant la lecture
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f'{self.name}{_format_labels(labels)} {value}')
+        return lines
+
+
+class Gauge:
+    """
+    Valeur instantanée (ex. taille d'une file d'attente), éventuellement
+    découpée par étiquettes.
+    """
+
+    def __init__(self, name: str, documentation: str = ''):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f'{self.name}{_format_labels(labels)} {value}')
+        return lines
+
+
+class Histogram:
+    """
+    Histogramme à bornes fixes (compte, somme et répartition par borne).
+    """
+
+    def __init__(self, name: str, documentation: str = '', buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1),
+                                              'sum': 0.0, 'count': 0}
+            series['counts'][bisect_left(self.buckets, value)] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series['count'] if series else 0
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = sorted((labels, {'counts': list(series['counts']), 'sum': series['sum'],
+                                        'count': series['count']})
+                              for labels, series in self._series.items())
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", le),))} '
+                             f'{cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {series["sum"]}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {series["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registre de métriques, utilisable comme récepteur de SpeechAnalyzer.
+
+    Tout objet possédant une méthode record_stage(stage, timing) peut
+    servir de récepteur (ex. adaptateur vers prometheus_client).
+
+    Exemple:
+        >>> registry = MetricsRegistry()
+        >>> analyzer = SpeechAnalyzer(metrics=registry)
+        >>> print(registry.render())
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.stage_seconds = self.histogram(
+            'speech_analysis_stage_seconds', "Durée de chaque étape de l'analyse")
+        self.stage_cpu_seconds = self.counter(
+            'speech_analysis_stage_cpu_seconds_total', "Temps CPU cumulé par étape")
+        self.stage_allocated_blocks = self.counter(
+            'speech_analysis_stage_allocated_blocks_total',
+            "Blocs mémoire alloués (solde) par étape")
+
+    def counter(self, name: str, documentation: str = '') -> Counter:
+        return self._get(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str = '') -> Gauge:
+        return self._get(Gauge, name, documentation)
+
+    def histogram(self, name: str, documentation: str = '',
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, documentation, buckets)
+
+    def _get(self, kind, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(name, *args)
+            elif not isinstance(metric, kind):
+                raise ValueError(f"la métrique {name!r} existe déjà avec un autre type")
+            return metric
+
+    def record_stage(self, stage: str, timing: dict):
+        """
+        Enregistre la mesure d'une étape (appelé par StageTimer).
+        """
+        self.stage_seconds.observe(timing['wall_ms'] / 1000, stage=stage)
+        self.stage_cpu_seconds.inc(timing['cpu_ms'] / 1000, stage=stage)
+        self.stage_allocated_blocks.inc(max(0, timing['allocated_blocks']), stage=stage)
+
+    def render(self) -> str:
+        """
+        Retourne toutes les métriques au format texte de Prometheus.
+        """
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        for _, metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimer:
+    """
+    Chronomètre les étapes d'une analyse.
+
+    Pour chaque étape : durée réelle, temps CPU du thread et solde des
+    blocs mémoire alloués (sys.getallocatedblocks, sans le surcoût de
+    tracemalloc). Les mesures sont gardées dans timings et transmises
+    au récepteur de métriques s'il y en a un.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.timings = {}
+
+    def measure(self, stage: str, func, *args):
+        """
+        Exécute func(*args) en mesurant l'étape stage, retourne son résultat.
+        """
+        blocks = sys.getallocatedblocks()
+        cpu = time.thread_time()
+        wall = time.perf_counter()
+        result = func(*args)
+        timing = {
+            'wall_ms': round((time.perf_counter() - wall) * 1000, 3),
+            'cpu_ms': round((time.thread_time() - cpu) * 1000, 3),
+            'allocated_blocks': sys.getallocatedblocks() - blocks
+        }
+        self.timings[stage] = timing
+        if self.sink is not None:
+            self.sink.record_stage(stage, timing)
+        return result
@@ -0,0 +1,206 @@
+# coding: utf-8
+# ============================================
+# MODULE : LISIBILITÉ DU DISCOURS
+# ============================================
+# Indices de lisibilité pour le français, calculés avec NumPy sur les
+# mots déjà tokenisés (un seul passage, sans boucle Python par mot) :
+#   - syllabes estimées (groupes de voyelles, e muet final retiré)
+#   - indice de Kandel et Moles (adaptation française de Flesch) :
+#     207 - 1,015 x (mots par phrase) - 73,6 x (syllabes par mot)
+#   - proportion de mots longs et indice LIX
+#   - distribution de la longueur des phrases (LengthHistogram en
+#     mémoire constante pour l'analyse incrémentale)
+#
+# Seuls les mots contenant au moins une lettre sont comptés (la
+# ponctuation est ignorée). NumPy n'est importé qu'au premier calcul.
+
+# Plus de LONG_WORD_LETTERS lettres : mot long (définition du LIX)
+LONG_WORD_LETTERS = 6
+
+# Longueur de phrase (mots) au-delà de laquelle LengthHistogram regroupe
+# les phrases dans une seule case
+MAX_SENTENCE_LENGTH = 256
+
+_VOWELS = 'aeiouyàâäéèêëîïôöùûüÿæœ'
+_LETTERS = _VOWELS + 'bcdfghjklmnpqrstvwxzçñ'
+
+# Tables de correspondance caractère -> voyelle / lettre (Latin-1 et
+# Latin étendu A) ; les autres caractères sont ramenés à la dernière case
+_TABLE_SIZE = 0x250
+_tables = None
+
+
+def _get_tables():
+    global _tables
+    if _tables is None:
+        import numpy as np
+        vowels = np.zeros(_TABLE_SIZE + 1, dtype=bool)
+        letters = np.zeros(_TABLE_SIZE + 1, dtype=bool)
+        vowels[[ord(c) for c in _VOWELS]] = True
+        letters[[ord(c) for c in _LETTERS]] = True
+        _tables = (np, vowels, letters)
+    return _tables
+
+
+def measure_tokens(lower_tokens: list) -> tuple:
+    """
+    Mesure chaque mot d'une liste de mots en minuscules.
+
+    Les mots sont mis bout à bout dans un seul tableau de caractères ;
+    voyelles, lettres et groupes de voyelles sont repérés par tables
+    de correspondance puis comptés par mot.
+
+    Retourne:
+        tuple : (syllabes, lettres) de chaque mot, tableaux NumPy
+                (0 syllabe et 0 lettre pour la ponctuation)
+    """
+    np, vowel_table, letter_table = _get_tables()
+    count = len(lower_tokens)
+    if not count:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    joined = '\0'.join(lower_tokens) + '\0'
+    codes = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+    codes = np.minimum(codes, _TABLE_SIZE)
+    is_vowel = vowel_table[codes]
+    is_letter = letter_table[codes]
+    separators = np.flatnonzero(codes == 0)
+    # Début de chaque mot (le séparateur compte avec le mot qui le précède)
+    starts = np.concatenate(([0], separators[:-1] + 1))
+
+    groups = is_vowel.copy()
+    groups[1:] &= ~is_vowel[:-1]
+    syllables = np.add.reduceat(groups, starts, dtype=np.int64)
+    letters = np.add.reduceat(is_letter, starts, dtype=np.int64)
+
+    # E muet final après consonne : "table", "tables" ("année" garde son
+    # groupe "ée" ; jamais pour les mots d'une syllabe)
+    lengths = np.diff(np.concatenate(([-1], separators))) - 1
+    last, before, third = (codes[np.maximum(separators - offset, 0)] for offset in (1, 2, 3))
+    silent = (((last == ord('e')) & ~vowel_table[before]) |
+              ((last == ord('s')) & (before == ord('e')) & ~vowel_table[third] & (lengths > 2)))
+    syllables -= silent & (syllables > 1)
+
+    is_word = letters > 0
+    syllables = np.where(is_word, np.maximum(syllables, 1), 0)
+    return syllables, letters
+
+
+def measure_sentences(lower_tokens: list, sentence_sizes: list) -> tuple:
+    """
+    Mesures de lisibilité d'un texte découpé en phrases.
+
+    Arguments:
+        lower_tokens : Tous les mots du texte, en minuscules
+        sentence_sizes : Nombre de mots (ponctuation comprise) de chaque phrase
+
+    Retourne:
+        tuple : (nombre de syllabes, nombre de mots longs,
+                 tableau du nombre de mots de chaque phrase)
+    """
+    syllables, letters = measure_tokens(lower_tokens)
+    np = _get_tables()[0]
+    sentence_ids = np.repeat(np.arange(len(sentence_sizes)), sentence_sizes)
+    lengths = np.bincount(sentence_ids, weights=letters > 0,
+                          minlength=len(sentence_sizes)).astype(np.int64)
+    return int(syllables.sum()), int((letters > LONG_WORD_LETTERS).sum()), lengths
+
+
+class LengthHistogram:
+    """
+    Répartition des longueurs de phrases en mémoire constante.
+
+    Une case par longueur jusqu'à cap mots ; les phrases plus longues
+    partagent la dernière case (comptées pour cap mots dans les centiles,
+    le total de mots et le maximum restent exacts). Les centiles sont
+    ceux de numpy.percentile (interpolation linéaire) tant qu'aucune
+    phrase ne dépasse cap.
+    """
+
+    __slots__ = ('counts', 'words', 'maximum')
+
+    def __init__(self, cap: int = MAX_SENTENCE_LENGTH):
+        np = _get_tables()[0]
+        self.counts = np.zeros(cap + 1, dtype=np.int64)
+        self.words = 0
+        self.maximum = 0
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def add(self, lengths):
+        """
+        Ajoute le nombre de mots de chaque phrase (tableau ou liste).
+        """
+        np = _get_tables()[0]
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if not len(lengths):
+            return
+        cap = len(self.counts) - 1
+        self.counts += np.bincount(np.minimum(lengths, cap), minlength=cap + 1)
+        self.words += int(lengths.sum())
+        self.maximum = max(self.maximum, int(lengths.max()))
+
+    def copy(self) -> 'LengthHistogram':
+        histogram = LengthHistogram.__new__(LengthHistogram)
+        histogram.counts = self.counts.copy()
+        histogram.words = self.words
+        histogram.maximum = self.maximum
+        return histogram
+
+    def percentile(self, q: float) -> float:
+        """
+        Centile q (0 à 100) des longueurs de phrases.
+        """
+        np = _get_tables()[0]
+        cumulative = np.cumsum(self.counts)
+        position = q / 100 * (int(cumulative[-1]) - 1)
+        lower, upper = np.searchsorted(cumulative, [np.floor(position), np.ceil(position)],
+                                       side='right')
+        return float(lower + (upper - lower) * (position - np.floor(position)))
+
+
+def readability_scores(sentence_lengths, syllables: int, long_words: int) -> dict:
+    """
+    Calcule les indices de lisibilité à partir des mesures agrégées.
+
+    Arguments:
+        sentence_lengths : Nombre de mots de chaque phrase (tableau ou
+                           liste) ou LengthHistogram
+        syllables : Nombre total de syllabes
+        long_words : Nombre total de mots longs
+
+    Retourne:
+        dict : Champs de lisibilité de ClarityResult
+    """
+    np = _get_tables()[0]
+    if isinstance(sentence_lengths, LengthHistogram):
+        histogram = sentence_lengths
+        words, count, maximum = histogram.words, len(histogram), histogram.maximum
+    else:
+        lengths = np.asarray(sentence_lengths, dtype=np.int64)
+        words, count = int(lengths.sum()), len(lengths)
+    if not words:
+        return {
+            'readability_score': 0.0, 'syllables_per_word': 0.0,
+            'long_word_ratio': 0.0, 'lix': 0.0,
+            'sentence_length_median': 0.0, 'sentence_length_p90': 0.0,
+            'sentence_length_max': 0
+        }
+    words_per_sentence = words / count
+    syllables_per_word = syllables / words
+    long_word_ratio = long_words / words * 100
+    if isinstance(sentence_lengths, LengthHistogram):
+        median, p90 = histogram.percentile(50), histogram.percentile(90)
+    else:
+        median, p90 = np.percentile(lengths, [50, 90])
+        maximum = int(lengths.max())
+    return {
+        'readability_score': round(207 - 1.015 * words_per_sentence - 73.6 * syllables_per_word, 1),
+        'syllables_per_word': round(syllables_per_word, 2),
+        'long_word_ratio': round(long_word_ratio, 1),
+        'lix': round(words_per_sentence + long_word_ratio, 1),
+        'sentence_length_median': round(float(median), 1),
+        'sentence_length_p90': round(float(p90), 1),
+        'sentence_length_max': maximum
+    }
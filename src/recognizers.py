@@ -0,0 +1,344 @@
+# coding: utf-8
+# ============================================
+# MODULE : MOTEURS DE RECONNAISSANCE VOCALE
+# ============================================
+# Registre des moteurs de reconnaissance (Google, Sphinx, Azure, Wit,
+# moteur local de test). Les moteurs web partagent une session HTTP
+# (connexions gardées ouvertes et réutilisées d'une phrase à l'autre),
+# ont des délais configurables, et une chaîne de moteurs bascule sur
+# le suivant en cas d'erreur de service (sr.RequestError).
+#
+# Les clés sont lues dans les variables d'environnement (voir env_key)
+# et l'adresse de chaque moteur web peut être remplacée, par exemple
+# par un serveur local pour les tests.
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import requests
+import speech_recognition as sr
+from requests.adapters import HTTPAdapter
+
+# Délais HTTP par défaut (connexion, lecture) en secondes
+DEFAULT_TIMEOUT = (3.05, 15)
+
+# Taille du pool de connexions par hôte
+POOL_SIZE = 8
+
+# Registre : nom du moteur -> classe
+BACKENDS = {}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def register_backend(cls):
+    """
+    Décorateur de classe : ajoute un moteur au registre sous cls.name.
+
+    Un moteur incomplet (méthode abstraite non définie) est refusé dès
+    l'enregistrement plutôt qu'en pleine transcription.
+    """
+    missing = sorted(getattr(cls, '__abstractmethods__', ()))
+    if missing:
+        raise TypeError(f"moteur {cls.__name__} incomplet : {', '.join(missing)} à définir")
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def get_session() -> requests.Session:
+    """
+    Retourne la session HTTP partagée par tous les moteurs web.
+
+    Créée au premier appel ; ses connexions restent ouvertes (keep-alive)
+    et sont réutilisées par tous les threads de reconnaissance.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+class RecognizerBackend(ABC):
+    """
+    Moteur de reconnaissance : transforme un sr.AudioData en texte.
+
+    recognize() lève sr.UnknownValueError si la parole n'a pas été
+    comprise et sr.RequestError si le service est indisponible.
+    """
+
+    name = None
+    # Variable d'environnement contenant la clé du service (None si aucune)
+    env_key = None
+
+    def __init__(self, key: str = None, timeout=DEFAULT_TIMEOUT):
+        """
+        Arguments:
+            key : Clé du service (par défaut lue dans la variable env_key)
+            timeout : Délai HTTP, en secondes ou couple (connexion, lecture)
+        """
+        self.key = key or (os.environ.get(self.env_key) if self.env_key else None)
+        self.timeout = timeout
+
+    @property
+    def configured(self) -> bool:
+        """
+        True si le moteur dispose de tout ce qu'il lui faut (clé...).
+        """
+        return self.env_key is None or bool(self.key)
+
+    @abstractmethod
+    def recognize(self, audio: sr.AudioData, language: str) -> str:
+        """
+        Retourne le texte reconnu dans audio.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class HTTPBackend(RecognizerBackend):
+    """
+    Moteur web : envoie l'audio par la session HTTP partagée.
+    """
+
+    url = None
+
+    def __init__(self, key: str = None, timeout=DEFAULT_TIMEOUT, url: str = None,
+                 session: requests.Session = None):
+        """
+        Arguments:
+            url : Adresse du service (par défaut celle du fournisseur)
+            session : Session HTTP (par défaut la session partagée)
+        """
+        super().__init__(key, timeout)
+        self.url = url or self.url
+        self.session = session
+
+    def _post(self, data: bytes, headers: dict, params: dict = None) -> str:
+        if not self.configured:
+            raise sr.RequestError(f"clé manquante pour {self.name} (variable {self.env_key})")
+        session = self.session or get_session()
+        try:
+            response = session.post(self.url, data=data, headers=headers,
+                                    params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise sr.RequestError(f"connexion à {self.name} impossible : {e}") from e
+        if response.status_code >= 400:
+            raise sr.RequestError(f"{self.name} a répondu {response.status_code} : "
+                                  f"{response.text[:200]}")
+        return response.content.decode('utf-8')
+
+
+@register_backend
+class GoogleBackend(HTTPBackend):
+    """
+    Google Speech Recognition (API web gratuite utilisée par SpeechRecognition).
+    """
+
+    name = 'google'
+    url = 'http://www.google.com/speech-api/v2/recognize'
+
+    # Clé par défaut de SpeechRecognition, cherchée une seule fois par processus
+    _default_key = None
+    _default_key_resolved = False
+
+    def __init__(self, key: str = None, timeout=DEFAULT_TIMEOUT, url: str = None,
+                 session: requests.Session = None):
+        """
+        Arguments:
+            key : Clé du service (par défaut GOOGLE_SPEECH_KEY, sinon celle
+                  de SpeechRecognition)
+        """
+        super().__init__(key or os.environ.get('GOOGLE_SPEECH_KEY'), timeout, url, session)
+
+    @classmethod
+    def default_key(cls):
+        """
+        Clé par défaut de SpeechRecognition (None si la version installée
+        ne l'expose pas : les requêtes partent alors sans clé).
+        """
+        if not GoogleBackend._default_key_resolved:
+            try:
+                from speech_recognition.recognizers.google import create_request_builder
+                key = create_request_builder(endpoint=GoogleBackend.url).key
+            except (ImportError, AttributeError, TypeError):
+                # Interface interne de SpeechRecognition absente ou modifiée
+                key = None
+            GoogleBackend._default_key = key
+            GoogleBackend._default_key_resolved = True
+        return GoogleBackend._default_key
+
+    def recognize(self, audio, language):
+        rate = None if audio.sample_rate >= 8000 else 8000
+        flac_data = audio.get_flac_data(convert_rate=rate, convert_width=2)
+        params = {'client': 'chromium', 'lang': language, 'pFilter': 0}
+        key = self.key or self.default_key()
+        if key:
+            params['key'] = key
+        response = self._post(
+            flac_data,
+            headers={'Content-Type': f'audio/x-flac; rate={rate or audio.sample_rate}'},
+            params=params
+        )
+        # Une réponse JSON par ligne, la première est souvent vide
+        for line in response.split('\n'):
+            if not line:
+                continue
+            for result in json.loads(line).get('result', []):
+                alternatives = result.get('alternative', [])
+                if alternatives and 'transcript' in alternatives[0]:
+                    return alternatives[0]['transcript']
+        raise sr.UnknownValueError()
+
+
+@register_backend
+class WitBackend(HTTPBackend):
+    """
+    Wit.ai (Meta) ; clé dans WIT_AI_KEY.
+    """
+
+    name = 'wit'
+    url = 'https://api.wit.ai/speech?v=20170307'
+    env_key = 'WIT_AI_KEY'
+
+    def recognize(self, audio, language):
+        wav_data = audio.get_wav_data(convert_rate=None if audio.sample_rate >= 8000 else 8000,
+                                      convert_width=2)
+        response = self._post(wav_data, headers={'Authorization': f'Bearer {self.key}',
+                                                 'Content-Type': 'audio/wav'})
+        text = json.loads(response).get('_text')
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+@register_backend
+class AzureBackend(HTTPBackend):
+    """
+    Microsoft Azure Speech ; clé dans AZURE_SPEECH_KEY, région dans AZURE_SPEECH_REGION.
+    """
+
+    name = 'azure'
+    env_key = 'AZURE_SPEECH_KEY'
+    URL_TEMPLATE = ('https://{region}.stt.speech.microsoft.com/speech/recognition/'
+                    'conversation/cognitiveservices/v1')
+
+    def __init__(self, key: str = None, timeout=DEFAULT_TIMEOUT, url: str = None,
+                 session: requests.Session = None, region: str = None):
+        """
+        Arguments:
+            region : Région Azure du service (par défaut AZURE_SPEECH_REGION ou westus)
+        """
+        region = region or os.environ.get('AZURE_SPEECH_REGION', 'westus')
+        super().__init__(key, timeout, url or self.URL_TEMPLATE.format(region=region), session)
+
+    def recognize(self, audio, language):
+        wav_data = audio.get_wav_data(convert_rate=16000, convert_width=2)
+        # La clé est envoyée directement : pas d'aller-retour pour un jeton
+        response = self._post(
+            wav_data,
+            headers={'Ocp-Apim-Subscription-Key': self.key,
+                     'Content-Type': 'audio/wav; codec="audio/pcm"; samplerate=16000'},
+            params={'language': language, 'format': 'simple', 'profanity': 'masked'}
+        )
+        result = json.loads(response)
+        if result.get('RecognitionStatus') != 'Success' or not result.get('DisplayText'):
+            raise sr.UnknownValueError()
+        return result['DisplayText']
+
+
+@register_backend
+class SphinxBackend(RecognizerBackend):
+    """
+    CMU Sphinx, hors ligne (nécessite pocketsphinx).
+    """
+
+    name = 'sphinx'
+
+    def __init__(self, key: str = None, timeout=DEFAULT_TIMEOUT):
+        super().__init__(key, timeout)
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, audio, language):
+        return self._recognizer.recognize_sphinx(audio, language=language)
+
+
+@register_backend
+class StubBackend(RecognizerBackend):
+    """
+    Moteur local sans réseau ni modèle, pour les tests et les démonstrations.
+
+    Retourne toujours le même texte (ou lève UnknownValueError si text est vide).
+    """
+
+    name = 'stub'
+
+    def __init__(self, key: str = None, timeout=DEFAULT_TIMEOUT, text: str = "Bonjour à tous."):
+        super().__init__(key, timeout)
+        self.text = text
+
+    def recognize(self, audio, language):
+        if not self.text:
+            raise sr.UnknownValueError()
+        return self.text
+
+
+def get_backend(name: str, **options) -> RecognizerBackend:
+    """
+    Crée un moteur du registre.
+
+    Arguments:
+        name : Nom du moteur ('google', 'sphinx', 'azure', 'wit', 'stub')
+        options : Paramètres du moteur (key, timeout, url...)
+    """
+    try:
+        return BACKENDS[name](**options)
+    except KeyError:
+        raise ValueError(f"moteur de reconnaissance inconnu : {name!r} "
+                         f"(disponibles : {', '.join(sorted(BACKENDS))})") from None
+
+
+class BackendChain:
+    """
+    Suite de moteurs essayés dans l'ordre.
+
+    En cas d'erreur de service (sr.RequestError), le moteur suivant est
+    essayé immédiatement ; une parole non comprise (sr.UnknownValueError)
+    n'est pas retentée. S'utilise directement comme fonction recognize
+    de TranscriptionService : chain(recognizer, audio).
+
+    Exemple:
+        >>> chain = BackendChain([get_backend('azure'), get_backend('google')], 'fr-FR')
+        >>> text = chain.recognize(audio)
+    """
+
+    def __init__(self, backends: list, language: str = 'fr-FR'):
+        if not backends:
+            raise ValueError("au moins un moteur de reconnaissance est nécessaire")
+        self.backends = list(backends)
+        self.language = language
+        # Nom du moteur ayant produit le dernier texte
+        self.last_backend = None
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        errors = []
+        for backend in self.backends:
+            try:
+                text = backend.recognize(audio, self.language)
+            except sr.RequestError as e:
+                errors.append(f"{backend.name} : {e}")
+                continue
+            self.last_backend = backend.name
+            return text
+        raise sr.RequestError(' ; '.join(errors))
+
+    def __call__(self, recognizer, audio):
+        return self.recognize(audio)
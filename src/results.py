@@ -0,0 +1,175 @@
+# coding: utf-8
+# ============================================
+# MODULE : RÉSULTATS COMPACTS
+# ============================================
+# Classes de résultats à __slots__ (sans dictionnaire par objet) :
+# bien plus légères que des dictionnaires imbriqués quand on garde
+# des millions de résultats en mémoire pour des rapports.
+#
+# Compatibilité : result['stats']['word_count'] fonctionne comme avec
+# un dictionnaire, et to_dict() redonne le format de analyze().
+
+from dataclasses import dataclass, fields
+
+from .sentences import SentenceIndex
+
+
+class _ResultMixin:
+    """
+    Accès par clé et conversion en dictionnaire pour les classes de résultats.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return [field.name for field in fields(self)]
+
+    def to_dict(self) -> dict:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**{field.name: data[field.name] for field in fields(cls) if field.name in data})
+
+
+@dataclass(slots=True)
+class Stats(_ResultMixin):
+    word_count: int
+    sentence_count: int
+    avg_sentence_length: float
+    unique_words: int
+    vocabulary_richness: float
+
+
+@dataclass(slots=True)
+class SentimentResult(_ResultMixin):
+    sentiment: str
+    polarity_score: float
+    subjectivity: float
+
+
+@dataclass(slots=True)
+class FillerResult(_ResultMixin):
+    total_fillers: int
+    filler_details: dict
+    filler_rate_percent: float
+
+    def to_dict(self) -> dict:
+        return {
+            'total_fillers': self.total_fillers,
+            'filler_details': dict(self.filler_details),
+            'filler_rate_percent': self.filler_rate_percent
+        }
+
+
+@dataclass(slots=True)
+class ClarityResult(_ResultMixin):
+    clarity_level: str
+    clarity_score: int
+    avg_sentence_length: float
+    # Lisibilité (voir src/readability.py)
+    readability_score: float = 0.0
+    syllables_per_word: float = 0.0
+    long_word_ratio: float = 0.0
+    lix: float = 0.0
+    sentence_length_median: float = 0.0
+    sentence_length_p90: float = 0.0
+    sentence_length_max: int = 0
+
+
+@dataclass(slots=True)
+class StructureResult(_ResultMixin):
+    has_structure: bool
+    transition_count: int
+    structure_score: float
+
+
+@dataclass(slots=True)
+class AudioResult(_ResultMixin):
+    """
+    Débit et pauses mesurés sur l'audio (voir src/audio.py, analyze_audio).
+
+    Durées en secondes, débits en mots par minute, silence_ratio en %.
+    """
+
+    duration: float
+    speech_duration: float
+    words_per_minute: float
+    articulation_rate: float
+    pause_count: int
+    long_pause_count: int
+    pause_mean: float
+    pause_median: float
+    pause_p90: float
+    pause_max: float
+    silence_ratio: float
+
+
+@dataclass(slots=True)
+class AnalysisResult(_ResultMixin):
+    """
+    Résultat complet d'une analyse (voir SpeechAnalyzer.analyze).
+
+    Les sections facultatives valent None quand elles n'ont pas été
+    calculées et n'apparaissent alors pas dans to_dict().
+    """
+
+    stats: Stats
+    sentiment: SentimentResult
+    fillers: FillerResult
+    clarity: ClarityResult
+    structure: StructureResult
+    timings: dict = None
+    sentences: SentenceIndex = None
+    audio: AudioResult = None
+
+    # Sections toujours présentes et classe de chacune
+    SECTIONS = {
+        'stats': Stats,
+        'sentiment': SentimentResult,
+        'fillers': FillerResult,
+        'clarity': ClarityResult,
+        'structure': StructureResult,
+    }
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name).to_dict() for name in self.SECTIONS}
+        if self.timings is not None:
+            data['timings'] = self.timings
+        if self.sentences is not None:
+            data['sentences'] = self.sentences.to_dict()
+        if self.audio is not None:
+            data['audio'] = self.audio.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AnalysisResult':
+        sections = {name: kind.from_dict(data[name]) for name, kind in cls.SECTIONS.items()}
+        sentences = data.get('sentences')
+        if sentences is not None:
+            sentences = SentenceIndex.from_dict(sentences)
+        audio = data.get('audio')
+        if audio is not None:
+            audio = AudioResult.from_dict(audio)
+        return cls(timings=data.get('timings'), sentences=sentences, audio=audio, **sections)
+
+
+@dataclass(slots=True)
+class Feedback(_ResultMixin):
+    """
+    Feedback généré par FeedbackGenerator.generate.
+    """
+
+    score_global: float
+    points_forts: list
+    points_amelioration: list
+    recommandations: list
@@ -0,0 +1,201 @@
+# coding: utf-8
+# ============================================
+# MODULE : MESURES SUR FENÊTRE GLISSANTE
+# ============================================
+# Pour les longues sessions en direct (réunion d'une heure), les mesures
+# de l'ensemble de la session bougent de moins en moins : ce module suit
+# le débit (mots par minute), le taux de mots de remplissage et le
+# sentiment sur les dernières secondes ou les derniers mots.
+#
+# Chaque mot entre dans un tampon circulaire (deque) avec son instant,
+# son poids de sentiment et ses mots de remplissage ; les sommes de la
+# fenêtre sont mises à jour à l'entrée et à la sortie de chaque mot.
+# Le coût par mot est constant et la mémoire bornée (max_words mots),
+# quelle que soit la durée de la session.
+
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+
+from .analyzer import SpeechAnalyzer
+from .document import Document
+
+# Nombre maximal de mots gardés par défaut dans une fenêtre en secondes
+MAX_WINDOW_WORDS = 5000
+
+_NO_FILLERS = ()
+
+
+class RollingWindow:
+    """
+    Mesures du discours sur une fenêtre glissante.
+
+    La fenêtre couvre les seconds dernières secondes, les words derniers
+    mots, ou les deux (le plus restrictif s'applique).
+
+    Exemple:
+        >>> window = RollingWindow(seconds=60)
+        >>> window.feed("Euh, bonjour à tous.", timestamp=time.monotonic(), duration=2.0)
+        >>> window.results()['window']['words_per_minute']
+    """
+
+    def __init__(self, analyzer: SpeechAnalyzer = None, seconds: float = None,
+                 words: int = None, max_words: int = MAX_WINDOW_WORDS, clock=time.monotonic):
+        """
+        Arguments:
+            analyzer : Analyseur fournissant lexiques et règles de calcul
+                       (par défaut un SpeechAnalyzer standard)
+            seconds : Durée de la fenêtre en secondes
+            words : Nombre de mots de la fenêtre
+            max_words : Nombre maximal de mots gardés (borne la mémoire
+                        d'une fenêtre en secondes)
+            clock : Horloge en secondes (celle des instants passés à feed())
+        """
+        if seconds is None and words is None:
+            raise ValueError("la fenêtre doit être définie en secondes ou en mots")
+        self.analyzer = analyzer or SpeechAnalyzer()
+        self.seconds = seconds
+        self.words = words
+        self.capacity = min(words, max_words) if words else max_words
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """
+        Vide la fenêtre.
+        """
+        # Un élément par mot : (instant, poids de sentiment, mots de remplissage)
+        self._tokens = deque()
+        self._filler_counts = Counter()
+        self._positive = 0.0
+        self._negative = 0.0
+        self._hits = 0
+        # Début de la fenêtre : début de la session, puis instant du
+        # dernier mot sorti de la fenêtre
+        self._start = None
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def push(self, instant: float, weight: float = 0.0, fillers: tuple = _NO_FILLERS):
+        """
+        Ajoute un mot à la fenêtre (coût constant).
+
+        Arguments:
+            instant : Instant où le mot a été prononcé (horloge clock)
+            weight : Poids du mot dans le lexique de sentiment (0 si absent)
+            fillers : Mots de remplissage commençant à ce mot
+        """
+        if self._start is None:
+            self._start = instant
+        self._tokens.append((instant, weight, fillers))
+        if weight > 0:
+            self._positive += weight
+            self._hits += 1
+        elif weight < 0:
+            self._negative -= weight
+            self._hits += 1
+        for filler in fillers:
+            self._filler_counts[filler] += 1
+        if len(self._tokens) > self.capacity:
+            self._pop()
+
+    def _pop(self):
+        instant, weight, fillers = self._tokens.popleft()
+        self._start = instant
+        if weight > 0:
+            self._positive -= weight
+            self._hits -= 1
+        elif weight < 0:
+            self._negative += weight
+            self._hits -= 1
+        for filler in fillers:
+            self._filler_counts[filler] -= 1
+        if not self._tokens:
+            # Remise à zéro exacte (pas d'erreur d'arrondi accumulée)
+            self._positive = self._negative = 0.0
+
+    def expire(self, now: float = None):
+        """
+        Retire les mots sortis de la fenêtre en secondes.
+        """
+        if self.seconds is None:
+            return
+        limit = (self.clock() if now is None else now) - self.seconds
+        tokens = self._tokens
+        while tokens and tokens[0][0] <= limit:
+            self._pop()
+
+    def feed(self, chunk: str, timestamp: float = None, duration: float = 0.0):
+        """
+        Ajoute un morceau de transcription.
+
+        Les mots sont répartis régulièrement sur la durée du morceau ; la
+        ponctuation n'est pas comptée (taux de mots de remplissage et débit
+        rapportés aux mots prononcés).
+
+        Arguments:
+            chunk : Texte reconnu
+            timestamp : Fin du morceau (horloge clock, par défaut maintenant)
+            duration : Durée de l'audio du morceau en secondes
+        """
+        if not chunk or not chunk.strip():
+            return
+        timestamp = self.clock() if timestamp is None else timestamp
+        analyzer = self.analyzer
+        doc = Document(chunk)
+        # Mots prononcés seulement : la ponctuation ne compte pas dans le débit
+        spans = Document._locate(doc.text, doc.tokens)
+        kept = [(start, word) for (start, _), word in zip(spans, doc.lower_tokens)
+                if any(char.isalnum() for char in word)]
+        if not kept:
+            return
+        starts = [start for start, _ in kept]
+        words = [word for _, word in kept]
+
+        # Mots de remplissage rattachés au mot où ils commencent
+        fillers = {}
+        for start, _, filler in analyzer.filler_matcher.finditer(doc.text):
+            index = max(0, bisect_right(starts, start) - 1)
+            fillers[index] = fillers.get(index, _NO_FILLERS) + (filler,)
+
+        weights = analyzer.lexicon.weights
+        begin = timestamp - duration
+        step = duration / len(words)
+        if self._start is None:
+            self._start = begin
+        for index, word in enumerate(words):
+            self.push(begin + step * (index + 1), weights.get(word, 0.0),
+                      fillers.get(index, _NO_FILLERS))
+        self.expire(timestamp)
+
+    def results(self, now: float = None) -> dict:
+        """
+        Retourne les mesures de la fenêtre.
+
+        Le sentiment ne compte que les mots du lexique (pas de repli
+        TextBlob) : une fenêtre sans mot du lexique est 'Neutre'.
+
+        Retourne:
+            dict : Sections 'window' (mots, secondes couvertes, mots par
+                   minute), 'fillers' et 'sentiment' (format de analyze())
+        """
+        now = self.clock() if now is None else now
+        self.expire(now)
+        count = len(self._tokens)
+        start = self._start if self._start is not None else now
+        if self.seconds is not None:
+            start = max(start, now - self.seconds)
+        span = max(0.0, now - start)
+        analyzer = self.analyzer
+        return {
+            'window': {
+                'words': count,
+                'seconds': round(span, 1),
+                'words_per_minute': round(count / span * 60, 1) if span > 0 else 0.0,
+            },
+            'fillers': analyzer._fillers_from_counts(self._filler_counts, count).to_dict(),
+            'sentiment': analyzer._sentiment_from_scores(
+                self._positive, self._negative, self._hits, count, lambda: 0.0
+            ).to_dict(),
+        }
@@ -0,0 +1,348 @@
+# coding: utf-8
+# ============================================
+# MODULE : RÈGLES DE FEEDBACK
+# ============================================
+# Table déclarative des règles de coaching (mesure, comparaison, seuil,
+# messages) et des termes du score global, lue dans un fichier JSON ou
+# YAML puis préparée une seule fois (lecteurs de mesures, comparaisons,
+# messages) pour être appliquée sans la relire.
+# Les règles s'appliquent à un résultat d'analyse ou à tout un lot à la
+# fois (colonnes NumPy, DataFrame du module corpus) : pour adapter le
+# coaching à un public, on change le fichier de règles, pas le code.
+#
+# Format d'une règle :
+#   {"name": "discours_court",
+#    "metric": "stats.word_count", "op": "<", "value": 100,
+#    "points_amelioration": "Discours un peu court ({stats.word_count} mots)",
+#    "recommandations": "Développez davantage vos arguments..."}
+# Une règle dont la mesure est absente (section facultative comme
+# 'audio', ou None) ne s'applique pas. Les messages reprennent les
+# mesures entre accolades (format Python, ex. {audio.pause_max:.1f}) ;
+# un message dont une mesure est absente ou vaut None (section facultative,
+# mesure calculée de DERIVED_METRICS) n'est pas émis.
+
+import hashlib
+import json
+import operator
+import os
+from itertools import groupby
+from string import Formatter
+
+# Table de règles par défaut (feedback historique de FeedbackGenerator)
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), 'feedback_rules.json')
+
+# Listes du feedback qu'une règle peut remplir
+FEEDBACK_LISTS = ('points_forts', 'points_amelioration', 'recommandations')
+
+_default_rules = None
+
+
+def _top_filler(results):
+    details = (results.get('fillers') or {}).get('filler_details')
+    return max(details, key=details.get) if details else None
+
+
+# Mesures calculées à partir d'un résultat, utilisables comme les autres
+DERIVED_METRICS = {
+    'fillers.top_filler': _top_filler,
+}
+
+
+def _between(value, bounds):
+    low, high = bounds
+    return (value >= low) & (value <= high)
+
+
+def _array_in(values, choices):
+    import numpy as np
+    return np.isin(values, list(choices))
+
+
+def _array_true(values, _):
+    return values.astype(bool)
+
+
+def _array_false(values, _):
+    return ~values.astype(bool)
+
+
+# Comparaisons : nom -> (test d'une mesure m contre le seuil v,
+# fonction appliquée à une colonne NumPy)
+COMPARATORS = {
+    '<': (operator.lt, operator.lt),
+    '<=': (operator.le, operator.le),
+    '>': (operator.gt, operator.gt),
+    '>=': (operator.ge, operator.ge),
+    '==': (operator.eq, operator.eq),
+    '!=': (operator.ne, operator.ne),
+    'between': (lambda m, v: v[0] <= m <= v[1], _between),
+    'in': (lambda m, v: m in v, _array_in),
+    'true': (lambda m, _: bool(m), _array_true),
+    'false': (lambda m, _: not m, _array_false),
+}
+
+
+def _split_path(path: str) -> tuple:
+    section, _, name = path.partition('.')
+    if not section or not name:
+        raise ValueError(f"mesure invalide : {path!r} (format attendu 'section.mesure')")
+    return section, name
+
+
+def _compile_template(template: str) -> tuple:
+    """
+    Transforme un message en chaîne de format positionnelle.
+
+    Retourne:
+        tuple : (chaîne de format, mesures lues dans l'ordre des champs)
+    """
+    pieces, fields = [], []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if conversion:
+            raise ValueError(f"conversion !{conversion} non prise en charge : {template!r}")
+        pieces.append(f'{{{len(fields)}:{spec}}}' if spec else f'{{{len(fields)}}}')
+        fields.append(field)
+    return ''.join(pieces), fields
+
+
+def _reader(path: str):
+    """
+    Fonction qui lit une mesure dans un résultat d'analyse.
+
+    Retourne:
+        callable : results -> valeur (None si la section ou la mesure est absente)
+    """
+    derived = DERIVED_METRICS.get(path)
+    if derived is not None:
+        return derived
+    section, name = _split_path(path)
+
+    def read(results):
+        values = results.get(section)
+        return None if values is None else values.get(name)
+    return read
+
+
+class FeedbackRules:
+    """
+    Règles de feedback et pondération du score global, préparées.
+
+    Exemple:
+        >>> rules = FeedbackRules.from_file('regles_etudiants.json')
+        >>> feedback = rules.evaluate(results)
+        >>> feedbacks = rules.evaluate_many(liste_de_resultats)
+    """
+
+    def __init__(self, table: dict, name: str = None):
+        """
+        Arguments:
+            table : Table de règles (clés 'score' et 'rules', voir feedback_rules.json)
+            name : Nom de la table (par défaut table['name'])
+        """
+        self.table = table
+        self.name = name or table.get('name', 'personnalisé')
+        self._version = None
+        self._compile()
+
+    @property
+    def version(self) -> str:
+        """
+        Empreinte du contenu de la table (change dès qu'une règle change).
+        """
+        if self._version is None:
+            content = json.dumps(self.table, sort_keys=True, ensure_ascii=False)
+            self._version = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        return self._version
+
+    def __len__(self):
+        return len(self._rules)
+
+    # Les lecteurs de mesures ne se sérialisent pas : seule la table est
+    # envoyée aux processus de calcul, qui la préparent une fois
+    def __getstate__(self):
+        return {'table': self.table, 'name': self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['table'], state['name'])
+
+    @classmethod
+    def default(cls) -> 'FeedbackRules':
+        """
+        Retourne la table par défaut (chargée une seule fois).
+        """
+        global _default_rules
+        if _default_rules is None:
+            _default_rules = cls.from_file(DEFAULT_RULES_PATH)
+        return _default_rules
+
+    @classmethod
+    def from_file(cls, path: str, name: str = None, encoding: str = 'utf-8') -> 'FeedbackRules':
+        """
+        Charge une table de règles depuis un fichier JSON ou YAML.
+
+        Le format YAML (extension .yaml ou .yml) nécessite PyYAML.
+
+        Arguments:
+            path : Chemin du fichier
+            name : Nom de la table (par défaut celui du fichier de règles,
+                   sinon le nom du fichier)
+            encoding : Encodage du fichier
+
+        Retourne:
+            FeedbackRules : Les règles préparées
+        """
+        with open(path, encoding=encoding) as f:
+            if path.endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("PyYAML est nécessaire pour lire des règles YAML "
+                                      "(pip install pyyaml)") from None
+                table = yaml.safe_load(f)
+            else:
+                table = json.load(f)
+        return cls(table, name=name or table.get('name') or os.path.basename(path))
+
+    def _compile(self):
+        """
+        Prépare la table : pour chaque règle, le lecteur de sa mesure, son
+        test et ses messages. Les règles consécutives sur la même mesure
+        forment un groupe : la mesure est lue et vérifiée une seule fois.
+        """
+        score = self.table.get('score', {})
+        self._terms = []
+        for term in score.get('terms', ()):
+            section, name = _split_path(term['metric'])
+            self._terms.append((
+                term['metric'], section, name, term.get('weight', 1),
+                'scale' in term or 'offset' in term, term.get('scale', 1), term.get('offset', 0),
+                term.get('min'), term.get('max')
+            ))
+        self._score_min = score.get('min', 0)
+        self._score_max = score.get('max', 10)
+        self._score_digits = score.get('digits', 1)
+
+        self._rules = []
+        for position, rule in enumerate(self.table.get('rules', ())):
+            name = rule.get('name', f'regle_{position}')
+            if rule.get('op') not in COMPARATORS:
+                raise ValueError(f"règle {name!r} : comparaison inconnue {rule.get('op')!r} "
+                                 f"(disponibles : {', '.join(COMPARATORS)})")
+            messages = []
+            for target in FEEDBACK_LISTS:
+                if target in rule:
+                    template, fields = _compile_template(rule[target])
+                    messages.append((target, template, [_reader(field) for field in fields]))
+            if not messages:
+                raise ValueError(f"règle {name!r} : aucun message "
+                                 f"(clés possibles : {', '.join(FEEDBACK_LISTS)})")
+            self._rules.append((name, rule['metric'], rule['op'], rule.get('value'), messages))
+
+        self._groups = [
+            (_reader(path), [(COMPARATORS[op][0], value, messages)
+                             for _, _, op, value, messages in rules])
+            for path, rules in groupby(self._rules, key=lambda rule: rule[1])
+        ]
+
+    @property
+    def rule_names(self) -> list:
+        return [rule[0] for rule in self._rules]
+
+    def score(self, results) -> float:
+        """
+        Calcule le score global d'un résultat d'analyse.
+        """
+        total = 0.0
+        for _, section, name, weight, transform, scale, offset, low, high in self._terms:
+            value = results[section][name]
+            if transform:
+                value = value * scale + offset
+            if low is not None:
+                value = max(low, value)
+            if high is not None:
+                value = min(high, value)
+            total += value * weight
+        return round(min(self._score_max, max(self._score_min, total)), self._score_digits)
+
+    def evaluate(self, results) -> dict:
+        """
+        Applique les règles à un résultat de SpeechAnalyzer.analyze().
+
+        Retourne:
+            dict : Feedback (score_global, points_forts, points_amelioration,
+                   recommandations)
+        """
+        feedback = {target: [] for target in FEEDBACK_LISTS}
+        for read, rules in self._groups:
+            metric = read(results)
+            if metric is None:
+                continue
+            for test, value, messages in rules:
+                if not test(metric, value):
+                    continue
+                for target, template, fields in messages:
+                    if not fields:
+                        feedback[target].append(template)
+                        continue
+                    # Mesures du message : lues seulement si la règle s'applique
+                    values = [field(results) for field in fields]
+                    if any(field_value is None for field_value in values):
+                        continue
+                    feedback[target].append(template.format(*values))
+        return {'score_global': self.score(results), **feedback}
+
+    def evaluate_many(self, results) -> list:
+        """
+        Applique les règles à un lot de résultats.
+
+        Retourne:
+            list : Feedbacks, dans l'ordre des résultats
+        """
+        evaluate = self.evaluate
+        return [evaluate(result) for result in results]
+
+    def flags(self, frame):
+        """
+        Évalue les conditions de toutes les règles sur un DataFrame (module corpus),
+        colonne par colonne.
+
+        Retourne:
+            DataFrame : Une colonne booléenne par règle
+        """
+        import numpy as np
+        import pandas as pd
+        flags = {}
+        for name, path, op, value, _ in self._rules:
+            if path not in frame:
+                # Section absente du corpus (ex. 'audio') : règle jamais vérifiée
+                flags[name] = np.zeros(len(frame), dtype=bool)
+                continue
+            column = frame[path]
+            flags[name] = column.notna().to_numpy() & COMPARATORS[op][1](column.to_numpy(), value)
+        return pd.DataFrame(flags, index=frame.index)
+
+    def scores(self, frame):
+        """
+        Calcule le score global de toutes les lignes d'un DataFrame, colonne par colonne.
+
+        Retourne:
+            Series : Score global de chaque discours ('score_global')
+        """
+        import numpy as np
+        import pandas as pd
+        total = np.zeros(len(frame))
+        for path, _, _, weight, transform, scale, offset, low, high in self._terms:
+            value = frame[path].to_numpy(float)
+            if transform:
+                value = value * scale + offset
+            if low is not None:
+                value = np.maximum(low, value)
+            if high is not None:
+                value = np.minimum(high, value)
+            total = total + value * weight
+        total = np.clip(total, self._score_min, self._score_max)
+        return pd.Series(np.round(total, self._score_digits), index=frame.index,
+                         name='score_global')
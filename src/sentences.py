@@ -0,0 +1,120 @@
+# coding: utf-8
+# ============================================
+# MODULE : INDEX DES PHRASES
+# ============================================
+# Mesures phrase par phrase (positions, mots, mots de remplissage,
+# mots de sentiment, transitions) rangées dans des tableaux compacts
+# (module array) : l'interface peut surligner les phrases à revoir et
+# retrouver les pires phrases sans retokeniser le texte.
+
+from array import array
+
+# Nombre de mots au-delà duquel une phrase est jugée trop longue
+# (seuil du niveau 'Complexe' de la clarté)
+LONG_SENTENCE_TOKENS = 25
+
+# Tableaux par phrase et leur type (voir module array)
+SENTENCE_FIELDS = {
+    'starts': 'q',
+    'ends': 'q',
+    'token_counts': 'l',
+    'filler_counts': 'l',
+    'sentiment_hits': 'l',
+    'positive': 'd',
+    'negative': 'd',
+    'transition_counts': 'l',
+}
+
+# Tableaux par occurrence de mot de remplissage
+FILLER_FIELDS = {
+    'filler_starts': 'q',
+    'filler_ends': 'q',
+    'filler_sentences': 'l',
+}
+
+
+class SentenceIndex:
+    """
+    Index des phrases d'un discours (voir SpeechAnalyzer.analyze(sentence_index=True)).
+
+    Les positions sont exprimées en caractères dans le texte analysé.
+
+    Exemple:
+        >>> results = analyzer.analyze(text, compact=True, sentence_index=True)
+        >>> for sentence in results.sentences.worst(5):
+        ...     print(text[sentence['start']:sentence['end']])
+    """
+
+    __slots__ = tuple(SENTENCE_FIELDS) + tuple(FILLER_FIELDS)
+
+    def __init__(self, **columns):
+        for name, typecode in {**SENTENCE_FIELDS, **FILLER_FIELDS}.items():
+            setattr(self, name, array(typecode, columns.get(name, ())))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> dict:
+        """
+        Retourne les mesures d'une phrase.
+        """
+        if index < 0:
+            index += len(self)
+        return {
+            'index': index,
+            'start': self.starts[index],
+            'end': self.ends[index],
+            'token_count': self.token_counts[index],
+            'filler_count': self.filler_counts[index],
+            'sentiment_hits': self.sentiment_hits[index],
+            'positive': self.positive[index],
+            'negative': self.negative[index],
+            'transition_count': self.transition_counts[index],
+        }
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def __eq__(self, other):
+        if not isinstance(other, SentenceIndex):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def fillers(self, index: int = None) -> list:
+        """
+        Positions (début, fin) des mots de remplissage, d'une phrase ou de tout le texte.
+        """
+        return [(start, end) for start, end, sentence
+                in zip(self.filler_starts, self.filler_ends, self.filler_sentences)
+                if index is None or sentence == index]
+
+    def worst(self, n: int = 5, key='token_count') -> list:
+        """
+        Retourne les n phrases les moins bonnes selon un critère.
+
+        Arguments:
+            n : Nombre de phrases
+            key : Mesure à classer par ordre décroissant ('token_count',
+                  'filler_count'...) ou fonction prenant les mesures d'une
+                  phrase et retournant un nombre
+
+        Retourne:
+            list : Mesures des phrases (voir __getitem__), la pire d'abord
+        """
+        sentences = list(self)
+        if callable(key):
+            return sorted(sentences, key=key, reverse=True)[:n]
+        return sorted(sentences, key=lambda sentence: sentence[key], reverse=True)[:n]
+
+    def long_sentences(self, threshold: int = LONG_SENTENCE_TOKENS) -> list:
+        """
+        Retourne les phrases de plus de threshold mots, dans l'ordre du texte.
+        """
+        return [self[index] for index, count in enumerate(self.token_counts) if count > threshold]
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name).tolist() for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SentenceIndex':
+        return cls(**data)
@@ -0,0 +1,496 @@
+# coding: utf-8
+# ============================================
+# MODULE : SERVICE HTTP D'ANALYSE
+# ============================================
+# Expose SpeechAnalyzer et FeedbackGenerator en HTTP/JSON pour que
+# plusieurs interfaces (applications Streamlit, scripts) partagent un
+# même service dont les modèles sont déjà chargés.
+#
+# Les requêtes concurrentes sont regroupées en paquets (envoyés dès
+# batch_size discours ou après max_delay secondes) et analysées par un
+# pool de processus persistant, préchauffé au démarrage. La file
+# d'attente est bornée : quand elle est pleine, le service répond 503
+# au lieu d'accumuler du retard.
+#
+# Utilisation :
+#   python -m src.server --port 8765 --workers 4
+#   curl -X POST localhost:8765/analyze -d '{"text": "Bonjour à tous."}'
+#   curl localhost:8765/health
+#   curl localhost:8765/metrics
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .analyzer import SpeechAnalyzer
+from .batch import _init_worker, _serve_chunk, analyze_with_feedback
+from .feedback_generator import FeedbackGenerator
+from .metrics import MetricsRegistry
+
+DEFAULT_PORT = 8765
+
+# Taille maximale du corps d'une requête (octets)
+MAX_BODY_BYTES = 2_000_000
+
+# Délai maximal d'attente d'un résultat avant de répondre 504 (secondes)
+REQUEST_TIMEOUT = 60.0
+
+# Bornes des histogrammes de taille de paquet
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Marque d'arrêt déposée dans la file d'attente
+_STOP = object()
+
+
+class ServiceOverloaded(RuntimeError):
+    """
+    File d'attente pleine : la requête doit être renvoyée plus tard (HTTP 503).
+    """
+
+
+class AnalysisService:
+    """
+    Analyse et feedback par paquets dans un pool de processus persistant.
+
+    Exemple:
+        >>> with AnalysisService(workers=2) as service:
+        ...     service.analyze("Bonjour à tous.")['feedback']['score_global']
+    """
+
+    def __init__(self, analyzer: SpeechAnalyzer = None,
+                 feedback_generator: FeedbackGenerator = None, workers: int = None,
+                 batch_size: int = 16, max_delay: float = 0.01, max_queue: int = 256,
+                 metrics: MetricsRegistry = None):
+        """
+        Arguments:
+            analyzer, feedback_generator : Objets copiés une fois dans
+                                           chaque processus (par défaut standard)
+            workers : Nombre de processus (par défaut : nombre de cœurs ;
+                      1 pour analyser dans le processus courant)
+            batch_size : Nombre maximal de discours par paquet
+            max_delay : Attente maximale (secondes) avant d'envoyer un
+                        paquet incomplet
+            max_queue : Nombre maximal de discours en attente
+            metrics : Registre de métriques (par défaut un registre propre)
+        """
+        self.analyzer = analyzer or SpeechAnalyzer()
+        self.feedback_generator = feedback_generator or FeedbackGenerator()
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.metrics = metrics or MetricsRegistry()
+        self._queue = queue.Queue(maxsize=max_queue)
+        # Sérialise les mises en file : la place libre vérifiée pour une
+        # requête ne peut alors que croître jusqu'à ce qu'elle soit enfilée
+        self._submit_lock = threading.Lock()
+        # Au plus deux paquets en cours par processus : au-delà, les
+        # discours restent dans la file bornée (contre-pression)
+        self._slots = threading.BoundedSemaphore(self.workers * 2)
+        self._pool = None
+        self._thread = None
+
+        self.requests = self.metrics.counter(
+            'speech_server_requests_total', "Requêtes HTTP par route et statut")
+        self.rejected = self.metrics.counter(
+            'speech_server_rejected_total', "Discours refusés (file d'attente pleine)")
+        self.queue_depth = self.metrics.gauge(
+            'speech_server_queue_depth', "Discours en attente d'un paquet")
+        self.batch_sizes = self.metrics.histogram(
+            'speech_server_batch_size', "Nombre de discours par paquet", BATCH_SIZE_BUCKETS)
+        self.latency = self.metrics.histogram(
+            'speech_server_analysis_seconds', "Durée entre la mise en file et le résultat")
+
+    def start(self) -> 'AnalysisService':
+        """
+        Démarre le pool (préchauffé) et le thread de regroupement.
+        """
+        if self.running:
+            return self
+        if self.workers == 1:
+            self.analyzer.warmup()
+        else:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.analyzer, self.feedback_generator)
+            )
+            # Un paquet vide par processus : tous sont lancés et ont chargé
+            # leurs modèles avant la première requête
+            for future in [self._pool.submit(_serve_chunk, []) for _ in range(self.workers)]:
+                future.result()
+        self._thread = threading.Thread(target=self._run, name='analysis-batcher', daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self):
+        """
+        Termine les paquets en cours puis arrête le pool.
+        """
+        if self.running:
+            with self._submit_lock:
+                self._queue.put(_STOP)
+            self._thread.join()
+        # Discours arrivés pendant l'arrêt : jamais analysés
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[2].set_exception(RuntimeError("le service d'analyse est arrêté"))
+        if self._pool is not None:
+            # Attend la fin des paquets encore dans le pool
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, text: str, sentence_index: bool = False) -> Future:
+        """
+        Met un discours en file d'attente.
+
+        Retourne:
+            Future : Résultat {'analysis': ..., 'feedback': ...}
+
+        Lève:
+            ServiceOverloaded : si la file d'attente est pleine
+        """
+        return self.submit_many([text], sentence_index)[0]
+
+    def submit_many(self, texts: list, sentence_index: bool = False) -> list:
+        """
+        Met plusieurs discours en file d'attente, tous ou aucun.
+
+        Arguments:
+            texts : Discours d'une même requête
+
+        Retourne:
+            list : Un Future par discours, dans l'ordre de texts
+
+        Lève:
+            ServiceOverloaded : si la file n'a pas la place pour tous les discours
+            ValueError : si texts dépasse la capacité totale de la file
+        """
+        if not self.running:
+            raise RuntimeError("le service d'analyse n'est pas démarré")
+        if len(texts) > self.max_queue:
+            raise ValueError(f"plus de {self.max_queue} discours dans une requête")
+        with self._submit_lock:
+            if self.max_queue - self._queue.qsize() < len(texts):
+                self.rejected.inc(len(texts))
+                raise ServiceOverloaded(
+                    f"file d'attente pleine ({self.max_queue} discours)")
+            queued_at = time.perf_counter()
+            futures = [Future() for _ in texts]
+            for text, future in zip(texts, futures):
+                # Place réservée ci-dessus : ne peut pas lever queue.Full
+                self._queue.put_nowait((text, sentence_index, future, queued_at))
+        self.queue_depth.set(self._queue.qsize())
+        return futures
+
+    def analyze(self, text: str, sentence_index: bool = False, timeout: float = None) -> dict:
+        """
+        Analyse un discours et génère son feedback (bloquant).
+        """
+        return self.submit(text, sentence_index).result(timeout)
+
+    def health(self) -> dict:
+        """
+        État du service (route /health).
+        """
+        return {
+            'status': 'ok' if self.running else 'stopped',
+            'workers': self.workers,
+            'queue': self._queue.qsize(),
+            'max_queue': self.max_queue,
+            'batch_size': self.batch_size,
+            'analyzer': self.analyzer.fingerprint,
+            'feedback': self.feedback_generator.fingerprint,
+        }
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list):
+        self.queue_depth.set(self._queue.qsize())
+        self.batch_sizes.observe(len(batch))
+        items = [(text, sentence_index) for text, sentence_index, _, _ in batch]
+        if self._pool is None:
+            try:
+                results = analyze_with_feedback(items, self.analyzer, self.feedback_generator)
+            except Exception as e:
+                self._fail(batch, e)
+            else:
+                self._resolve(batch, results)
+            return
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(_serve_chunk, items)
+        except Exception as e:
+            self._slots.release()
+            self._fail(batch, e)
+            return
+        future.add_done_callback(partial(self._collect, batch))
+
+    def _collect(self, batch: list, future: Future):
+        self._slots.release()
+        error = future.exception()
+        if error is not None:
+            self._fail(batch, error)
+        else:
+            self._resolve(batch, future.result())
+
+    def _resolve(self, batch: list, results: list):
+        now = time.perf_counter()
+        for (_, _, future, queued), result in zip(batch, results):
+            self.latency.observe(now - queued)
+            future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: list, error: Exception):
+        for _, _, future, _ in batch:
+            future.set_exception(error)
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    """
+    Routes du service :
+        POST /analyze  {"text": "..."} ou {"texts": [...]}, option
+                       "sentence_index" ; retourne {"analysis", "feedback"}
+                       (une liste pour "texts")
+        GET /health    État du service (JSON)
+        GET /metrics   Métriques au format texte de Prometheus
+    """
+
+    # Connexions persistantes : un client réutilise sa connexion
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SpeechAnalysis/1.0'
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service
+
+    def do_GET(self):
+        route = urlsplit(self.path).path
+        if route == '/health':
+            health = self.service.health()
+            self._send_json(route, 200 if health['status'] == 'ok' else 503, health)
+        elif route == '/metrics':
+            self._send(route, 200, self.service.metrics.render().encode('utf-8'),
+                       'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._send_json(route, 404, {'error': f"route inconnue : {route}"})
+
+    def do_POST(self):
+        route = urlsplit(self.path).path
+        if route != '/analyze':
+            self.close_connection = True
+            self._send_json(route, 404, {'error': f"route inconnue : {route}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            # Longueur illisible : le corps ne peut pas être lu, ni la connexion réutilisée
+            self.close_connection = True
+            self._send_json(route, 400, {'error': "en-tête Content-Length invalide"})
+            return
+        if length > MAX_BODY_BYTES:
+            # Corps non lu : la connexion ne peut pas être réutilisée
+            self.close_connection = True
+            self._send_json(route, 413, {'error': f"requête de plus de {MAX_BODY_BYTES} octets"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            single = 'text' in payload
+            texts = [payload['text']] if single else payload['texts']
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise ValueError
+            sentence_index = bool(payload.get('sentence_index', False))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._send_json(route, 400, {'error': "corps attendu : {\"text\": \"...\"} "
+                                                  "ou {\"texts\": [\"...\"]}"})
+            return
+
+        try:
+            futures = self.service.submit_many(texts, sentence_index)
+        except ValueError as e:
+            self._send_json(route, 413, {'error': str(e)})
+            return
+        except ServiceOverloaded as e:
+            self._send_json(route, 503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        try:
+            results = [future.result(REQUEST_TIMEOUT) for future in futures]
+        except FutureTimeoutError:
+            self._send_json(route, 504, {'error': "analyse trop longue"})
+            return
+        except Exception as e:
+            self._send_json(route, 500, {'error': f"erreur d'analyse : {e}"})
+            return
+        self._send_json(route, 200, results[0] if single else results)
+
+    def _send_json(self, route: str, status: int, body, headers: dict = None):
+        self._send(route, status, json.dumps(body, ensure_ascii=False).encode('utf-8'),
+                   'application/json; charset=utf-8', headers)
+
+    def _send(self, route: str, status: int, body: bytes, content_type: str,
+              headers: dict = None):
+        self.service.requests.inc(route=route, status=status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            # Prévient le client : la connexion n'est pas réutilisable
+            self.send_header('Connection', 'close')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    Serveur HTTP (un thread par connexion) devant un AnalysisService.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, service: AnalysisService, verbose: bool = False):
+        super().__init__(address, AnalysisHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+class AnalysisClient:
+    """
+    Client du service HTTP d'analyse (connexion réutilisée entre les appels).
+
+    Exemple:
+        >>> client = AnalysisClient('http://127.0.0.1:8765')
+        >>> client.analyze("Bonjour à tous.")['feedback']
+    """
+
+    def __init__(self, url: str = f'http://127.0.0.1:{DEFAULT_PORT}',
+                 timeout: float = REQUEST_TIMEOUT, session=None):
+        import requests
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def analyze(self, text: str, sentence_index: bool = False) -> dict:
+        """
+        Retourne {'analysis': ..., 'feedback': ...} pour un discours.
+        """
+        return self._post({'text': text, 'sentence_index': sentence_index})
+
+    def analyze_many(self, texts: list, sentence_index: bool = False) -> list:
+        """
+        Analyse plusieurs discours en une seule requête.
+        """
+        return self._post({'texts': list(texts), 'sentence_index': sentence_index})
+
+    def health(self) -> dict:
+        return self.session.get(f'{self.url}/health', timeout=self.timeout).json()
+
+    def _post(self, payload: dict):
+        response = self.session.post(f'{self.url}/analyze', json=payload, timeout=self.timeout)
+        if response.status_code == 503:
+            raise ServiceOverloaded(response.json().get('error', 'service saturé'))
+        response.raise_for_status()
+        return response.json()
+
+
+def serve(host: str = '127.0.0.1', port: int = DEFAULT_PORT, verbose: bool = False,
+          **service_options):
+    """
+    Démarre le service et répond aux requêtes jusqu'à l'interruption (Ctrl+C).
+
+    Arguments:
+        service_options : Paramètres de AnalysisService
+    """
+    with AnalysisService(**service_options) as service:
+        server = AnalysisServer((host, port), service, verbose=verbose)
+        print(f"Service d'analyse prêt sur http://{host}:{server.server_port} "
+              f"({service.workers} processus)", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.server',
+        description="Service HTTP d'analyse de discours partagé entre plusieurs interfaces."
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port d'écoute")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help="nombre maximal de discours par paquet")
+    parser.add_argument('--max-delay-ms', type=float, default=10,
+                        help="attente maximale avant d'envoyer un paquet incomplet")
+    parser.add_argument('--max-queue', type=int, default=256,
+                        help="nombre de discours en attente au-delà duquel le service répond 503")
+    parser.add_argument('--rules', default=None,
+                        help="fichier de règles de feedback JSON ou YAML "
+                             "(défaut : src/feedback_rules.json)")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="journaliser chaque requête")
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, verbose=args.verbose,
+          feedback_generator=FeedbackGenerator(rules=args.rules), workers=args.workers,
+          batch_size=args.batch_size, max_delay=args.max_delay_ms / 1000,
+          max_queue=args.max_queue)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+# coding: utf-8
+# ============================================
+# MODULE : ANALYSE INCRÉMENTALE
+# ============================================
+# Analyse un discours au fil de la transcription : chaque morceau
+# (une phrase reconnue par le micro) met à jour des compteurs, sans
+# réanalyser le texte déjà reçu.
+#
+# analyze_file() applique le même principe aux très gros fichiers de
+# transcription : le fichier est lu par blocs (mmap) et découpé aux fins
+# de phrase, sans jamais charger tout le texte en mémoire.
+
+import codecs
+import mmap
+import re
+from collections import Counter
+
+from .analyzer import SpeechAnalyzer
+from .document import Document
+from .readability import LengthHistogram, measure_sentences
+from .results import AnalysisResult
+
+# Fin de phrase : ponctuation finale, guillemets ou parenthèses fermants
+# éventuels, puis espace (l'espace reste dans le morceau qui se termine)
+_SENTENCE_END = re.compile(r'[.!?…]+["»”’)\]]*\s+')
+
+# Distance (caractères) depuis la fin du tampon où chercher une fin de phrase
+_LOOKBACK = 4096
+
+# Nombre d'octets du fichier décodés à la fois
+_BLOCK_SIZE = 1 << 20
+
+
+class IncrementalAnalyzer:
+    """
+    Analyseur qui reçoit un discours par morceaux.
+
+    Les compteurs (mots, phrases, mots de remplissage, mots de sentiment,
+    transitions) sont mis à jour à chaque morceau : le coût d'un appel à
+    feed() dépend de la taille du morceau et non du discours entier.
+    results() retourne le même format que SpeechAnalyzer.analyze().
+
+    Exemple:
+        >>> live = IncrementalAnalyzer()
+        >>> _ = live.feed("Bonjour à tous.")
+        >>> _ = live.feed("Euh, aujourd'hui je vais vous parler de l'IA.")
+        >>> live.results()['fillers']['total_fillers']
+        1
+    """
+
+    def __init__(self, analyzer: SpeechAnalyzer = None):
+        """
+        Arguments:
+            analyzer : Analyseur fournissant lexiques et règles de calcul
+                       (par défaut un SpeechAnalyzer standard)
+        """
+        self.analyzer = analyzer or SpeechAnalyzer()
+        self.reset()
+
+    def reset(self):
+        """
+        Remet tous les compteurs à zéro.
+        """
+        self.chunk_count = 0
+        self.word_count = 0
+        self.sentence_count = 0
+        self.vocabulary = set()
+        self.filler_counts = Counter()
+        self.score_positif = 0.0
+        self.score_negatif = 0.0
+        self.sentiment_hits = 0
+        self.transition_count = 0
+        # Mesures de lisibilité : syllabes, mots longs, répartition des
+        # longueurs de phrases (taille fixe, quel que soit le nombre de phrases)
+        self.syllables = 0
+        self.long_words = 0
+        self.sentence_lengths = LengthHistogram()
+        # Phrase laissée ouverte par un morceau coupé entre deux mots :
+        # (nombre de mots, contient une transition), None sinon
+        self._open_sentence = None
+        # Moyenne de la polarité TextBlob, pondérée par le nombre de mots,
+        # tant qu'aucun mot du lexique n'a été rencontré
+        self._fallback_sum = 0.0
+        self._fallback_words = 0
+
+    def feed(self, chunk: str) -> dict:
+        """
+        Ajoute un morceau de transcription et retourne les résultats à jour.
+
+        Chaque morceau est analysé comme un texte à part : une phrase ne
+        se poursuit pas d'un morceau au suivant.
+        """
+        self.update(chunk)
+        return self.results()
+
+    def update(self, chunk: str, open_end: bool = False):
+        """
+        Ajoute un morceau de transcription sans calculer les résultats.
+
+        Arguments:
+            open_end : True si la dernière phrase du morceau se poursuit
+                       dans le morceau suivant (texte coupé entre deux mots,
+                       voir analyze_file) : les deux parties comptent pour
+                       une seule phrase
+        """
+        if not chunk or not chunk.strip():
+            return
+
+        analyzer = self.analyzer
+        doc = Document(chunk)
+        words = doc.lower_tokens
+
+        self.chunk_count += 1
+        self.word_count += len(words)
+        self.vocabulary.update(words)
+        self.filler_counts.update(analyzer.filler_matcher.count(doc.text))
+        syllables, long_words, sentence_lengths = measure_sentences(
+            words, [len(tokens) for tokens in doc.sentence_tokens]
+        )
+        self.syllables += syllables
+        self.long_words += long_words
+
+        sentence_lengths = sentence_lengths.tolist()
+        transitions = [bool(found) for found in analyzer.find_transitions(doc)]
+        if self._open_sentence is not None and sentence_lengths:
+            # Fin de la phrase laissée ouverte par le morceau précédent
+            length, transition = self._open_sentence
+            sentence_lengths[0] += length
+            transitions[0] = transitions[0] or transition
+            self._open_sentence = None
+        if open_end and sentence_lengths:
+            self._open_sentence = (sentence_lengths.pop(), transitions.pop())
+        self.sentence_count += len(sentence_lengths)
+        self.transition_count += sum(transitions)
+        self.sentence_lengths.add(sentence_lengths)
+
+        positive, negative, hits = analyzer.lexicon.score(words)
+        self.score_positif += positive
+        self.score_negatif += negative
+        self.sentiment_hits += hits
+        # Le repli TextBlob ne sert que tant qu'aucun mot n'a été trouvé
+        if self.sentiment_hits == 0 and words:
+            self._fallback_sum += analyzer._fallback_polarity(chunk) * len(words)
+            self._fallback_words += len(words)
+
+    def _fallback(self) -> float:
+        if not self._fallback_words:
+            return 0.0
+        return self._fallback_sum / self._fallback_words
+
+    def results(self) -> dict:
+        """
+        Retourne l'analyse du discours reçu jusqu'ici (format de analyze()).
+        """
+        return self.compact_results().to_dict()
+
+    def compact_results(self) -> AnalysisResult:
+        """
+        Retourne l'analyse du discours reçu jusqu'ici sous forme d'AnalysisResult.
+        """
+        analyzer = self.analyzer
+        sentence_count = self.sentence_count
+        transition_count = self.transition_count
+        sentence_lengths = self.sentence_lengths
+        if self._open_sentence is not None:
+            # Phrase encore ouverte : comptée comme si elle s'arrêtait ici
+            length, transition = self._open_sentence
+            sentence_count += 1
+            transition_count += transition
+            sentence_lengths = sentence_lengths.copy()
+            sentence_lengths.add([length])
+        return AnalysisResult(
+            stats=analyzer._stats_from_counts(
+                self.word_count, sentence_count, len(self.vocabulary)
+            ),
+            sentiment=analyzer._sentiment_from_scores(
+                self.score_positif, self.score_negatif, self.sentiment_hits,
+                self.word_count, self._fallback
+            ),
+            fillers=analyzer._fillers_from_counts(self.filler_counts, self.word_count),
+            clarity=analyzer._clarity_from_counts(
+                self.word_count, sentence_count,
+                sentence_lengths, self.syllables, self.long_words
+            ),
+            structure=analyzer._structure_from_counts(transition_count, sentence_count)
+        )
+
+
+def _last_boundary(buffer: str) -> tuple:
+    """
+    Position de coupure la plus tardive du tampon (fin de phrase,
+    à défaut dernier espace), 0 si aucune.
+
+    Retourne:
+        tuple : (position, True si la coupure est une fin de phrase)
+    """
+    limit = len(buffer)
+    cut = 0
+    for start in (max(0, limit - _LOOKBACK), 0):
+        for match in _SENTENCE_END.finditer(buffer, start, limit):
+            cut = match.end()
+        if cut or start == 0:
+            break
+    if cut:
+        return cut, True
+    # Texte sans ponctuation (transcription brute) : coupure à un espace
+    return buffer.rfind(' ', 0, limit) + 1, False
+
+
+def iter_sentence_chunks(path: str, chunk_chars: int = 1 << 20, encoding: str = 'utf-8',
+                         block_size: int = _BLOCK_SIZE):
+    """
+    Lit un fichier texte par morceaux qui se terminent en fin de phrase.
+
+    Le fichier est projeté en mémoire (mmap) et décodé bloc par bloc :
+    seuls un bloc et le morceau en cours sont en mémoire à la fois. Un
+    caractère multi-octets coupé entre deux blocs est correctement décodé.
+
+    Arguments:
+        path : Chemin du fichier
+        chunk_chars : Taille visée d'un morceau (caractères)
+        encoding : Encodage du fichier
+        block_size : Nombre d'octets lus à la fois
+
+    Retourne:
+        générateur : Morceaux de texte ; leur concaténation redonne le fichier
+    """
+    for chunk, _ in _read_chunks(path, chunk_chars, encoding, block_size):
+        yield chunk
+
+
+def _read_chunks(path: str, chunk_chars: int, encoding: str, block_size: int):
+    """
+    Générateur de iter_sentence_chunks() : couples (morceau, True si le
+    morceau se termine en fin de phrase).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for position in range(0, size, block_size):
+                buffer += decoder.decode(data[position:position + block_size],
+                                         final=position + block_size >= size)
+                while len(buffer) >= chunk_chars:
+                    cut, sentence_end = _last_boundary(buffer)
+                    cut = cut or len(buffer)
+                    yield buffer[:cut], sentence_end
+                    buffer = buffer[cut:]
+    if buffer:
+        yield buffer, True
+
+
+def analyze_file(path: str, analyzer: SpeechAnalyzer = None, chunk_chars: int = 1 << 20,
+                 encoding: str = 'utf-8', compact: bool = False):
+    """
+    Analyse un très gros fichier de transcription en mémoire bornée.
+
+    Le fichier est lu par iter_sentence_chunks() et chaque morceau est
+    ajouté à un IncrementalAnalyzer : la mémoire utilisée dépend de la
+    taille des morceaux et du vocabulaire, pas de la taille du fichier.
+    Les morceaux sont coupés en fin de phrase : le résultat est celui de
+    SpeechAnalyzer.analyze() sur tout le texte, à la segmentation près
+    des rares abréviations suivies d'un point en bord de morceau.
+
+    Un texte sans ponctuation (transcription brute) est coupé entre deux
+    mots ; la phrase coupée compte pour une seule phrase (nombre, longueur,
+    transitions), mais une expression de plusieurs mots (« du coup »)
+    à cheval sur la coupure n'est pas reconnue.
+
+    Arguments:
+        path : Chemin du fichier
+        analyzer : Analyseur à utiliser (par défaut un SpeechAnalyzer standard)
+        chunk_chars : Taille visée d'un morceau (caractères)
+        encoding : Encodage du fichier
+        compact : True pour obtenir un AnalysisResult au lieu d'un dict
+
+    Retourne:
+        dict ou AnalysisResult : même format que SpeechAnalyzer.analyze()
+    """
+    live = IncrementalAnalyzer(analyzer)
+    for chunk, sentence_end in _read_chunks(path, chunk_chars, encoding, _BLOCK_SIZE):
+        live.update(chunk, open_end=not sentence_end)
+    results = live.compact_results()
+    return results if compact else results.to_dict()
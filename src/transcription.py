@@ -0,0 +1,278 @@
+# coding: utf-8
+# ============================================
+# MODULE : SERVICE DE TRANSCRIPTION ASYNCHRONE
+# ============================================
+# Capture et reconnaissance vocale hors du thread principal (Streamlit).
+# Pendant qu'un morceau est envoyé à l'API de reconnaissance, le morceau
+# suivant est déjà en cours d'écoute. Le service peut être arrêté à tout
+# moment (bouton "Arrêter") depuis un autre thread.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import speech_recognition as sr
+
+# Attente par défaut du début d'une phrase (secondes) : pendant un silence,
+# l'arrêt demandé est vérifié à chaque expiration de ce délai
+LISTEN_TIMEOUT = 1.0
+
+
+@dataclass(slots=True)
+class TranscriptionChunk:
+    """
+    Morceau de discours reconnu.
+
+    Attributs:
+        index : Numéro du morceau (ordre d'écoute)
+        text : Texte reconnu, None en cas d'échec
+        audio : Audio capturé (sr.AudioData)
+        error : Message d'erreur si la reconnaissance a échoué
+        captured_at : Fin de la capture (horloge time.monotonic())
+    """
+    index: int
+    text: str
+    audio: object = None
+    error: str = None
+    captured_at: float = None
+
+
+class TranscriptionService:
+    """
+    Service asyncio d'écoute et de reconnaissance en continu.
+
+    L'écoute se fait dans un thread dédié (la source audio n'est utilisée
+    que par ce thread), la reconnaissance dans un pool de threads. Les
+    morceaux sont rendus dans l'ordre d'écoute par stream().
+
+    Exemple:
+        >>> service = TranscriptionService(
+        ...     sr.Recognizer(), lambda: sr.AudioFile('discours.wav'),
+        ...     lambda recognizer, audio: recognizer.recognize_sphinx(audio))
+        >>> chunks = asyncio.run(service.collect())
+    """
+
+    def __init__(self, recognizer, source_factory, recognize,
+                 listen_timeout: float = LISTEN_TIMEOUT, phrase_time_limit: float = None,
+                 max_pending: int = 2, adjust_noise: float = 0.5):
+        """
+        Arguments:
+            recognizer : sr.Recognizer (ou objet équivalent) utilisé pour écouter
+            source_factory : Fonction sans argument retournant la source audio
+                             (sr.Microphone(), sr.AudioFile(chemin)...)
+            recognize : Fonction (recognizer, audio) -> texte, bloquante
+            listen_timeout : Attente maximale du début d'une phrase (secondes) ;
+                             borne le délai de prise en compte d'un arrêt
+                             pendant un silence (None : attente illimitée)
+            phrase_time_limit : Durée maximale d'un morceau (secondes) ; borne
+                                aussi le délai de prise en compte d'un arrêt
+                                pendant une phrase
+            max_pending : Nombre de morceaux en attente de reconnaissance
+            adjust_noise : Durée d'ajustement au bruit ambiant (0 pour aucun)
+        """
+        self.recognizer = recognizer
+        self.source_factory = source_factory
+        self.recognize = recognize
+        self.listen_timeout = listen_timeout
+        self.phrase_time_limit = phrase_time_limit
+        self.max_pending = max(1, max_pending)
+        self.adjust_noise = adjust_noise
+        self._stop = threading.Event()
+        self._loop = None
+        self._producer = None
+        self._current = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._stop.is_set()
+
+    def cancel(self):
+        """
+        Arrête le service (utilisable depuis n'importe quel thread).
+
+        Pendant un silence, l'écoute s'arrête au plus tard après
+        listen_timeout ; pendant une phrase, à la fin de celle-ci (au plus
+        phrase_time_limit). Son audio et les morceaux non encore reconnus
+        sont abandonnés.
+        """
+        self._stop.set()
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        for future in (self._producer, self._current):
+            if future is not None:
+                loop.call_soon_threadsafe(future.cancel)
+
+    def _listen(self, source):
+        """
+        Écoute un morceau (thread de capture). Retourne None en fin de flux.
+        """
+        while not self._stop.is_set():
+            try:
+                audio = self.recognizer.listen(source, timeout=self.listen_timeout,
+                                               phrase_time_limit=self.phrase_time_limit)
+            except sr.WaitTimeoutError:
+                # Silence : on continue d'écouter tant que le service tourne
+                continue
+            if not audio.frame_data:
+                return None
+            return audio
+        return None
+
+    def _recognize(self, index: int, audio, captured_at: float = None) -> TranscriptionChunk:
+        """
+        Reconnaît un morceau (pool de reconnaissance).
+        """
+        try:
+            return TranscriptionChunk(index, self.recognize(self.recognizer, audio), audio,
+                                      captured_at=captured_at)
+        except sr.UnknownValueError:
+            return TranscriptionChunk(index, None, audio, "Parole non comprise", captured_at)
+        except sr.RequestError as e:
+            return TranscriptionChunk(index, None, audio, f"Erreur de service : {e}", captured_at)
+
+    async def stream(self):
+        """
+        Générateur asynchrone des morceaux reconnus, dans l'ordre d'écoute.
+        """
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        capture = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture')
+        recognition = ThreadPoolExecutor(max_workers=self.max_pending,
+                                         thread_name_prefix='reconnaissance')
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        source = await loop.run_in_executor(capture, self._open)
+
+        async def produce():
+            index = 0
+            try:
+                while not self._stop.is_set():
+                    audio = await loop.run_in_executor(capture, self._listen, source)
+                    if audio is None:
+                        break
+                    future = loop.run_in_executor(recognition, self._recognize, index, audio,
+                                                  time.monotonic())
+                    await queue.put(future)
+                    index += 1
+            except asyncio.CancelledError:
+                # Arrêt : les morceaux en attente sont abandonnés pour
+                # laisser la place à la fin du flux
+                while queue.full():
+                    queue.get_nowait().cancel()
+                queue.put_nowait(None)
+                raise
+            await queue.put(None)
+
+        self._producer = loop.create_task(produce())
+        try:
+            while not self._stop.is_set():
+                self._current = await queue.get()
+                if self._current is None:
+                    break
+                try:
+                    chunk = await self._current
+                except asyncio.CancelledError:
+                    if self._stop.is_set():
+                        break
+                    raise
+                yield chunk
+        finally:
+            self._stop.set()
+            self._producer.cancel()
+            while not queue.empty():
+                future = queue.get_nowait()
+                if future is not None:
+                    future.cancel()
+            await asyncio.gather(self._producer, return_exceptions=True)
+            await loop.run_in_executor(capture, self._close, source)
+            capture.shutdown(wait=False)
+            recognition.shutdown(wait=False, cancel_futures=True)
+            self._producer = self._current = None
+
+    def _open(self):
+        source = self.source_factory()
+        source.__enter__()
+        if self.adjust_noise:
+            self.recognizer.adjust_for_ambient_noise(source, duration=self.adjust_noise)
+        return source
+
+    @staticmethod
+    def _close(source):
+        source.__exit__(None, None, None)
+
+    async def collect(self) -> list:
+        """
+        Transcrit toute la source et retourne la liste des morceaux.
+        """
+        return [chunk async for chunk in self.stream()]
+
+
+class TranscriptionJob:
+    """
+    Exécute un TranscriptionService dans un thread avec sa propre boucle asyncio.
+
+    Pensé pour Streamlit : le script lance le travail, récupère les
+    nouveaux morceaux à chaque rerun avec drain() et peut l'arrêter avec
+    cancel(). Les morceaux récupérés ne sont plus gardés par le travail :
+    la mémoire ne grandit pas avec la durée de la session.
+    """
+
+    def __init__(self, service: TranscriptionService, on_chunk=None):
+        """
+        Arguments:
+            service : Service à exécuter
+            on_chunk : Fonction appelée (dans le thread du travail) pour
+                       chaque morceau reconnu
+        """
+        self.service = service
+        self.on_chunk = on_chunk
+        self.chunks = []
+        self.error = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> 'TranscriptionJob':
+        self._thread = threading.Thread(target=self._run, name='transcription', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        async def consume():
+            async for chunk in self.service.stream():
+                with self._lock:
+                    self.chunks.append(chunk)
+                if self.on_chunk is not None:
+                    self.on_chunk(chunk)
+        try:
+            asyncio.run(consume())
+        except Exception as e:
+            self.error = e
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        self.service.cancel()
+
+    def join(self, timeout: float = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def drain(self) -> list:
+        """
+        Retourne les morceaux reconnus depuis le dernier appel et les retire
+        du travail.
+        """
+        with self._lock:
+            chunks, self.chunks = self.chunks, []
+        return chunks
+
+    def snapshot(self) -> list:
+        """
+        Retourne une copie des morceaux reconnus non encore récupérés par drain().
+        """
+        with self._lock:
+            return list(self.chunks)
@@ -69,3 +69,38 @@ def calculate_vocabulary_richness(total_words:int,unique_words:int) -> float:
     if total_words == 0:
         return 0.0
     return unique_words/total_words
+
+def parse_transcription(content:str) -> Dict[str, str]:
+    """
+    decoupe le contenu d'un fichier ecrit par save_transcription (index.py)
+    
+    format attendu:
+    Transcription(2024-01-31 14:05:12)
+    API utilisee:Google Speech Recognition (Web)
+    (ligne vide)
+    texte transcrit...
+    
+    un fichier sans en-tete est considere comme du texte brut
+    
+    argument:content (contenu du fichier)
+    retourne:dict (date, api, text), date et api valent "" si absentes
+    
+    exemple:
+    >>>parse_transcription("Transcription(2024-01-31 14:05:12)\\nAPI utilisee:Sphinx\\n\\nBonjour")
+    {'date': '2024-01-31 14:05:12', 'api': 'Sphinx', 'text': 'Bonjour'}
+    """
+    match = _TRANSCRIPTION_HEADER.match(content)
+    if match is None:
+        return {'date': '', 'api': '', 'text': content.strip()}
+    return {
+        'date': match.group('date').strip(),
+        'api': (match.group('api') or '').strip(),
+        'text': content[match.end():].strip()
+    }
+
+#en-tete ecrit par save_transcription dans index.py
+_TRANSCRIPTION_HEADER = re.compile(
+    r'\ufeff?Transcription\((?P<date>[^)]*)\)\r?\n'
+    r'(?:API utilisee:(?P<api>[^\r\n]*)\r?\n)?'
+    r'(?:\r?\n)?'
+)
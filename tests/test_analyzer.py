@@ -0,0 +1,199 @@
+# coding: utf-8
+# TESTS DE L'ANALYSEUR DE DISCOURS
+
+import pytest
+import nltk
+
+try:
+    nltk.data.find('tokenizers/punkt_tab/french')
+except LookupError:
+    pytest.skip("ressources NLTK punkt indisponibles", allow_module_level=True)
+
+from nltk.tokenize import sent_tokenize, word_tokenize
+
+from src.analyzer import SpeechAnalyzer
+from src.document import Document
+
+
+DISCOURS = (
+    "Bonjour à tous. Aujourd'hui, je vais vous parler de l'intelligence "
+    "artificielle. Premièrement, euh, il faut comprendre que l'IA transforme "
+    "notre société. Ensuite, du coup, nous verrons comment l'utiliser. "
+    "Enfin, je partagerai mes recommandations pour l'avenir."
+)
+
+
+def test_document_tokenise_comme_nltk():
+    doc = Document(DISCOURS)
+    assert doc.sentences == sent_tokenize(DISCOURS, language='french')
+    assert doc.tokens == word_tokenize(DISCOURS, language='french')
+    assert doc.lower_tokens == [token.lower() for token in doc.tokens]
+    for sentence, (start, end) in zip(doc.sentences, doc.sentence_spans):
+        assert DISCOURS[start:end] == sentence
+
+
+def test_analyze_structure_du_resultat():
+    results = SpeechAnalyzer().analyze(DISCOURS)
+    assert set(results) == {'stats', 'sentiment', 'fillers', 'clarity', 'structure'}
+    assert results['stats']['sentence_count'] == 5
+    assert results['fillers']['filler_details'] == {'euh': 1, 'du coup': 1, 'enfin': 1}
+    assert results['structure']['transition_count'] == 3
+
+
+def test_analyze_texte_vide():
+    results = SpeechAnalyzer().analyze("")
+    assert results['stats']['word_count'] == 0
+    assert results['clarity']['avg_sentence_length'] == 0
+    assert results['structure']['structure_score'] == 0
+
+
+def test_analyze_many_parallele_identique_au_sequentiel():
+    analyzer = SpeechAnalyzer()
+    texts = [DISCOURS, "Euh, bon, voilà.", "", "C'est un excellent projet."] * 3
+    expected = [analyzer.analyze(text) for text in texts]
+
+    assert list(analyzer.analyze_many(texts, workers=2, chunksize=2)) == expected
+    unordered = dict(analyzer.analyze_many(iter(texts), workers=2, chunksize=3,
+                                           ordered=False))
+    assert [unordered[i] for i in range(len(texts))] == expected
+
+
+def test_cache_des_analyses():
+    from src.cache import ResultCache
+    cache = ResultCache()
+    analyzer = SpeechAnalyzer(cache=cache)
+    first = analyzer.analyze(DISCOURS)
+    assert analyzer.analyze(DISCOURS) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    SpeechAnalyzer(filler_words=['euh'], cache=cache).analyze(DISCOURS)
+    assert cache.misses == 2
+
+
+def test_cache_sans_effet_sur_les_resultats():
+    from src.cache import ResultCache
+    import unicodedata
+    cached = SpeechAnalyzer(cache=ResultCache())
+    plain = SpeechAnalyzer()
+    for text, variant in [("Euh, du coup on commence.", "Euh, du  coup on commence."),
+                          ("C'est génial.", unicodedata.normalize('NFD', "C'est génial."))]:
+        cached.analyze(text)
+        assert cached.analyze(variant) == plain.analyze(variant)
+
+
+def test_mesures_par_etape():
+    from src.cache import ResultCache
+    from src.metrics import MetricsRegistry
+    registry = MetricsRegistry()
+    analyzer = SpeechAnalyzer(profile=True, metrics=registry, cache=ResultCache())
+    results = analyzer.analyze(DISCOURS)
+    # DISCOURS ne contient aucun mot du lexique : le repli TextBlob est mesuré
+    assert list(results['timings']) == [
+        'tokenize', 'stats', 'textblob_fallback', 'sentiment',
+        'fillers', 'clarity', 'structure', 'total'
+    ]
+    assert registry.stage_seconds.count(stage='total') == 1
+    # un résultat servi par le cache ne contient pas de mesures périmées
+    assert 'timings' not in analyzer.analyze(DISCOURS)
+    assert 'timings' not in SpeechAnalyzer().analyze(DISCOURS)
+
+
+def test_transitions_par_phrase():
+    analyzer = SpeechAnalyzer()
+    text = "Depuis hier, d'après lui, rien. Ensuite, puis enfin : fini. Avantage."
+    doc = Document(text)
+    hits = analyzer.find_transitions(doc)
+    assert [[phrase for _, _, phrase in sentence] for sentence in hits] == [
+        [], ['ensuite', 'puis', 'enfin'], []
+    ]
+    start, end, _ = hits[1][0]
+    assert text[start:end] == "Ensuite"
+    assert analyzer.analyze(text)['structure']['transition_count'] == 1
+
+
+def test_resultat_compact():
+    from src.results import AnalysisResult
+    analyzer = SpeechAnalyzer()
+    result = analyzer.analyze(DISCOURS, compact=True)
+    assert isinstance(result, AnalysisResult)
+    assert result.to_dict() == analyzer.analyze(DISCOURS)
+
+
+def test_section_audio(monkeypatch):
+    pytest.importorskip('speech_recognition')
+    import src.audio
+    from src.results import AudioResult
+    analyzer = SpeechAnalyzer()
+    audio = AudioResult(10.0, 8.0, 120.0, 140.0, 2, 0, 0.5, 0.5, 0.6, 0.6, 25.0)
+    monkeypatch.setattr(src.audio, 'analyze_audio', lambda recording, words: audio)
+    result = analyzer.analyze(DISCOURS, audio=object())
+    compact = analyzer.analyze(DISCOURS, compact=True, audio=object())
+    assert result['audio'] == audio.to_dict()
+    assert compact.audio is audio and compact.to_dict() == result
+    # Le résultat mis en cache reste sans section audio
+    assert 'audio' not in analyzer.analyze(DISCOURS)
+
+
+def test_index_des_phrases():
+    from src.cache import ResultCache
+    from src.results import AnalysisResult
+    analyzer = SpeechAnalyzer()
+    result = analyzer.analyze(DISCOURS, compact=True, sentence_index=True)
+    index = result.sentences
+    doc = Document(DISCOURS)
+    assert len(index) == len(doc.sentences)
+    assert [DISCOURS[s['start']:s['end']] for s in index] == doc.sentences
+    assert sum(index.token_counts) == len(doc.tokens)
+    assert sum(index.filler_counts) == result.fillers.total_fillers
+    assert [DISCOURS[start:end] for start, end in index.fillers()] == ['euh', 'du coup', 'Enfin']
+    assert index.fillers(3) == [(DISCOURS.index('du coup'), DISCOURS.index('du coup') + 7)]
+    assert sum(1 for count in index.transition_counts if count) == \
+        result.structure.transition_count
+    assert index.worst(1)[0]['token_count'] == max(index.token_counts)
+    assert index.worst(2, key='filler_count')[0]['filler_count'] == 1
+    assert index.long_sentences(threshold=10) == [s for s in index if s['token_count'] > 10]
+
+    # Sans l'option, pas de section ; aller-retour par dictionnaire et cache
+    assert 'sentences' not in analyzer.analyze(DISCOURS)
+    assert AnalysisResult.from_dict(result.to_dict()).sentences == index
+    cached = SpeechAnalyzer(cache=ResultCache())
+    assert cached.analyze(DISCOURS, sentence_index=True) == result.to_dict()
+    assert 'sentences' not in cached.analyze(DISCOURS)
+
+
+def test_index_des_phrases_en_un_seul_passage():
+    analyzer = SpeechAnalyzer()
+    expected = analyzer.analyze(DISCOURS)
+    calls = []
+    for matcher in (analyzer.filler_matcher, analyzer.transition_matcher):
+        finditer = matcher.finditer
+        matcher.finditer = lambda *args, finditer=finditer: calls.append(1) or finditer(*args)
+    lexicon = analyzer.lexicon
+    score, score_sentences = lexicon.score, lexicon.score_sentences
+    lexicon.score = lambda tokens: pytest.fail("lexique parcouru deux fois")
+    lexicon.score_sentences = lambda *args: calls.append(1) or score_sentences(*args)
+    result = analyzer.analyze(DISCOURS, compact=True, sentence_index=True)
+    # Un parcours du texte par automate et un seul du lexique
+    assert len(calls) == 3
+    assert {k: v for k, v in result.to_dict().items() if k != 'sentences'} == expected
+    index = result.sentences
+    assert list(zip(index.positive, index.negative, index.sentiment_hits)) == [
+        score([token.lower() for token in tokens])
+        for tokens in Document(DISCOURS).sentence_tokens
+    ]
+
+
+def test_indices_de_lisibilite():
+    from src.readability import measure_tokens
+    syllables, letters = measure_tokens(['table', 'tables', 'année', 'société', 'à', '.'])
+    assert syllables.tolist() == [1, 1, 2, 3, 1, 0]
+    assert letters.tolist() == [5, 6, 5, 7, 1, 0]
+
+    clarity = SpeechAnalyzer().analyze(DISCOURS)['clarity']
+    doc = Document(DISCOURS)
+    words = [token for token in doc.tokens if any(c.isalpha() for c in token)]
+    assert clarity['long_word_ratio'] == round(
+        sum(len(word) > 6 for word in words) / len(words) * 100, 1)
+    assert clarity['sentence_length_max'] == max(
+        sum(any(c.isalpha() for c in token) for token in tokens) for tokens in doc.sentence_tokens)
+    assert 0 < clarity['readability_score'] < 120
+    assert clarity['sentence_length_median'] <= clarity['sentence_length_p90']
@@ -0,0 +1,111 @@
+# coding: utf-8
+# TESTS DE LA TRANSCRIPTION DE FICHIERS AUDIO
+# (fichiers WAV générés, reconnaissance simulée : PocketSphinx non requis)
+
+import math
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+sr = pytest.importorskip('speech_recognition')
+
+from src.audio import (AudioSegment, analyze_audio, frame_rms, load_audio, split_on_silence,
+                       spoken_word_count, stitch_segments, transcribe_file)
+
+RATE = 16000
+
+
+def write_wav(path, segments):
+    """
+    Écrit un WAV mono 16 bits : segments = [(durée, son)] avec son True
+    pour un signal de 440 Hz et False pour du silence.
+    """
+    frames = bytearray()
+    for duration, voiced in segments:
+        for i in range(int(duration * RATE)):
+            value = int(12000 * math.sin(2 * math.pi * 440 * i / RATE)) if voiced else 0
+            frames += struct.pack('<h', value)
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(bytes(frames))
+    return str(path)
+
+
+def fake_recognize(recognizer, audio, language):
+    # Texte déduit de la durée du morceau pour vérifier l'ordre
+    seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    return f"{language} {seconds:.0f}s"
+
+
+def failing_recognize(recognizer, audio, language):
+    raise sr.UnknownValueError()
+
+
+@pytest.fixture
+def wav(tmp_path):
+    return write_wav(tmp_path / 'conference.wav',
+                     [(0.5, False), (1.0, True), (1.0, False), (2.0, True),
+                      (0.2, False), (1.0, True), (1.0, False)])
+
+
+def test_frame_rms():
+    samples = np.array([0, 0, 100, -100, 300, -300], dtype=np.int16)
+    assert frame_rms(samples.tobytes(), 2, 2).tolist() == [0.0, 100.0, 300.0]
+    # Trame incomplète ignorée, 8 bits centrés sur 128
+    assert frame_rms(bytes([128, 128, 138, 118, 128]), 1, 2).tolist() == [0.0, 10.0]
+
+
+def test_decoupage_aux_silences(wav):
+    bounds = split_on_silence(load_audio(wav), padding=0)
+    # Le silence de 0,2 s ne sépare pas les deux derniers sons
+    assert len(bounds) == 2
+    assert bounds[0] == pytest.approx((0.5, 1.5), abs=0.05)
+    assert bounds[1] == pytest.approx((2.5, 5.7), abs=0.05)
+
+
+def test_decoupage_des_morceaux_trop_longs(wav):
+    bounds = split_on_silence(load_audio(wav), padding=0, max_chunk=1.0)
+    assert all(end - start <= 1.0 + 1e-6 for start, end in bounds)
+    assert bounds[-1][1] == pytest.approx(5.7, abs=0.05)
+
+
+def test_transcription_parallele_dans_l_ordre(wav):
+    segments = transcribe_file(wav, language='fr-FR', workers=2, recognize=fake_recognize)
+    assert [segment.index for segment in segments] == [0, 1]
+    assert stitch_segments(segments) == "fr-FR 1s fr-FR 4s"
+    assert transcribe_file(wav, workers=1, recognize=fake_recognize) == segments
+
+
+def test_erreurs_de_reconnaissance(wav):
+    segments = transcribe_file(wav, workers=1, recognize=failing_recognize)
+    assert all(segment.error and segment.text == '' for segment in segments)
+    assert stitch_segments(segments) == ''
+
+
+def test_recollage_ignore_les_morceaux_vides():
+    segments = [AudioSegment(1, 2.0, 3.0, " monde "), AudioSegment(0, 0.0, 1.0, "bonjour"),
+                AudioSegment(2, 3.0, 4.0, "")]
+    assert stitch_segments(segments) == "bonjour monde"
+
+
+def test_debit_et_pauses(wav):
+    result = analyze_audio(wav, words=52)
+    assert result.duration == 6.7
+    # Parole de 0,5 s à 5,7 s ; seul le silence d'une seconde est une pause
+    assert result.speech_duration == pytest.approx(5.2, abs=0.06)
+    assert result.pause_count == 1 and result.long_pause_count == 0
+    assert result.pause_max == pytest.approx(1.0, abs=0.06)
+    assert result.words_per_minute == pytest.approx(600, rel=0.02)
+    assert result.articulation_rate == pytest.approx(52 / 4.2 * 60, rel=0.02)
+    assert result.silence_ratio == pytest.approx(2.7 / 6.7 * 100, abs=1)
+    assert spoken_word_count("Euh, bon... c'est l'avant-projet !") == 4
+
+
+def test_debit_sans_parole(tmp_path):
+    result = analyze_audio(write_wav(tmp_path / 'silence.wav', [(1.0, False)]), words=0)
+    assert result.words_per_minute == 0.0 and result.pause_count == 0
+    assert result.silence_ratio == 100.0
@@ -0,0 +1,41 @@
+# coding: utf-8
+# TESTS DU CACHE DES RÉSULTATS
+
+import pickle
+
+from src.cache import ResultCache
+
+
+def test_lru_et_compteurs():
+    cache = ResultCache(max_entries=2)
+    cache.set('a', {'v': 1})
+    cache.set('b', {'v': 2})
+    assert cache.get('a') == {'v': 1}
+    cache.set('c', {'v': 3})
+    assert cache.get('b') is None
+    assert cache.stats()['evictions'] == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_copie_independante():
+    cache = ResultCache()
+    cache.set('a', {'liste': [1]})
+    cache.get('a')['liste'].append(2)
+    assert cache.get('a') == {'liste': [1]}
+
+
+def test_limite_en_octets():
+    cache = ResultCache(max_bytes=40)
+    cache.set('a', {'texte': 'x' * 20})
+    cache.set('b', {'texte': 'y' * 20})
+    assert len(cache) == 1 and cache.get('b') is not None
+
+
+def test_niveau_disque(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    ResultCache(path=path).set('a', {'v': 1})
+    cache = ResultCache(path=path)
+    assert cache.get('a') == {'v': 1}
+    assert cache.stats()['disk_hits'] == 1
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get('a') == {'v': 1}
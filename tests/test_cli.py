@@ -0,0 +1,77 @@
+# coding: utf-8
+# TESTS DE L'ANALYSE EN LIGNE DE COMMANDE
+
+import json
+
+import pytest
+import nltk
+
+from src.utils import parse_transcription
+
+
+def test_lecture_en_tete():
+    content = ("Transcription(2024-01-31 14:05:12)\nAPI utilisee:Sphinx (Hors Ligne)\n\n"
+               "Bonjour à tous.\nMerci.")
+    assert parse_transcription(content) == {
+        'date': '2024-01-31 14:05:12',
+        'api': 'Sphinx (Hors Ligne)',
+        'text': "Bonjour à tous.\nMerci."
+    }
+    assert parse_transcription("Texte brut.")['text'] == "Texte brut."
+
+
+def test_reprise_apres_interruption(tmp_path):
+    try:
+        nltk.data.find('tokenizers/punkt_tab/french')
+    except LookupError:
+        pytest.skip("ressources NLTK punkt indisponibles")
+    from src.cli import main
+
+    archive = tmp_path / 'transcriptions'
+    archive.mkdir()
+    for i in range(3):
+        (archive / f'transcription_{i}.txt').write_text(
+            f"Transcription(2024-01-0{i + 1} 10:00:00)\nAPI utilisee:Sphinx\n\n"
+            f"Euh, bonjour {i}. Ensuite, voilà.",
+            encoding='utf-8'
+        )
+    output = tmp_path / 'resultats.jsonl'
+    assert main([str(archive), '-o', str(output), '-w', '1']) == 0
+
+    (archive / 'transcription_3.txt').write_text("Un nouveau discours.", encoding='utf-8')
+    assert main([str(archive), '-o', str(output), '-w', '1']) == 0
+
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert sorted(record['path'][-19:] for record in records) == [
+        f'transcription_{i}.txt' for i in range(4)
+    ]
+    first = next(r for r in records if r['path'].endswith('transcription_0.txt'))
+    assert first['date'] == '2024-01-01 10:00:00'
+    assert first['analysis']['fillers']['filler_details'] == {'euh': 1, 'voilà': 1}
+    assert 'score_global' in first['feedback']
+
+
+def test_reprise_sans_doublon_apres_interruption_entre_deux_ecritures(tmp_path):
+    try:
+        nltk.data.find('tokenizers/punkt_tab/french')
+    except LookupError:
+        pytest.skip("ressources NLTK punkt indisponibles")
+    from src.cli import main
+
+    archive = tmp_path / 'transcriptions'
+    archive.mkdir()
+    for i in range(3):
+        (archive / f'transcription_{i}.txt').write_text(f"Bonjour {i}. Euh, voilà.",
+                                                        encoding='utf-8')
+    output = tmp_path / 'resultats.jsonl'
+    assert main([str(archive), '-o', str(output), '-w', '1']) == 0
+    # Interruption : résultats écrits, point de reprise perdu, dernière ligne tronquée
+    (tmp_path / 'resultats.jsonl.checkpoint').unlink()
+    content = output.read_text(encoding='utf-8')
+    output.write_text(content[:-10], encoding='utf-8')
+
+    assert main([str(archive), '-o', str(output), '-w', '1']) == 0
+    records = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert sorted(record['path'][-19:] for record in records) == [
+        f'transcription_{i}.txt' for i in range(3)
+    ]
@@ -0,0 +1,75 @@
+# coding: utf-8
+# TESTS DE L'ANALYSE DE CORPUS
+
+import json
+import random
+
+from src.corpus import (aggregate, feedback_flags, global_scores, percentiles, read_results,
+                        results_to_frame)
+from src.feedback_generator import FeedbackGenerator
+
+
+def _fake_result(rng):
+    return {
+        'stats': {'word_count': rng.randint(20, 800), 'sentence_count': rng.randint(1, 40),
+                  'avg_sentence_length': 12.5, 'unique_words': 50, 'vocabulary_richness': 60.0},
+        'sentiment': {'sentiment': rng.choice(['Positif', 'Neutre', 'Négatif']),
+                      'polarity_score': 0.1, 'subjectivity': 0.2},
+        'fillers': {'total_fillers': 3, 'filler_details': {'euh': 3},
+                    'filler_rate_percent': round(rng.uniform(0, 12), 2)},
+        'clarity': {'clarity_level': 'Clair', 'clarity_score': rng.choice([3, 5, 7, 9]),
+                    'avg_sentence_length': 17.0},
+        'structure': {'has_structure': rng.random() < 0.5, 'transition_count': 2,
+                      'structure_score': round(rng.uniform(0, 10), 1)},
+    }
+
+
+def test_score_vectorise_identique_au_score_par_dictionnaire():
+    rng = random.Random(0)
+    results = [_fake_result(rng) for _ in range(500)]
+    frame = results_to_frame(results)
+    generator = FeedbackGenerator()
+    expected = [generator._calculate_global_score(result) for result in results]
+    assert global_scores(frame).tolist() == expected
+
+
+def test_indicateurs_de_feedback():
+    rng = random.Random(1)
+    results = [_fake_result(rng) for _ in range(200)]
+    flags = feedback_flags(results_to_frame(results))
+    generator = FeedbackGenerator()
+    for (_, row), result in zip(flags.iterrows(), results):
+        feedback = generator.generate(result)
+        assert row['message_clair'] == any(p.startswith('Message clair')
+                                           for p in feedback['points_forts'])
+        assert row['trop_de_parasites'] == any(p.startswith('Trop de mots')
+                                               for p in feedback['points_amelioration'])
+
+
+def test_agregations_par_orateur_et_date():
+    rng = random.Random(2)
+    results = [_fake_result(rng) for _ in range(6)]
+    metadata = [{'speaker': s, 'date': d} for s, d in
+                zip('AABBBA', ['2024-01-01', '2024-01-02', '2024-01-08'] * 2)]
+    frame = results_to_frame(results, metadata)
+    frame['score_global'] = global_scores(frame)
+    by_speaker = aggregate(frame, 'speaker')
+    assert by_speaker.loc['B', ('score_global', 'count')] == 3
+    weekly = aggregate(frame, ['speaker', 'date'], freq='W')
+    assert weekly[('stats.word_count', 'count')].sum() == 6
+    assert list(percentiles(frame, ['stats.word_count']).index) == [0.1, 0.25, 0.5, 0.75, 0.9]
+    assert frame['date'].dtype.kind == 'M'
+
+
+def test_score_du_fichier_de_resultats_agrege(tmp_path):
+    rng = random.Random(3)
+    generator = FeedbackGenerator()
+    path = tmp_path / 'resultats.jsonl'
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(4):
+            result = _fake_result(rng)
+            f.write(json.dumps({'path': f't{i}.txt', 'api': 'Sphinx' if i % 2 else 'Google',
+                                'analysis': result, 'feedback': generator.generate(result)}) + '\n')
+    frame = read_results(str(path))
+    assert frame['score_global'].tolist() == global_scores(frame).tolist()
+    assert aggregate(frame, 'api').loc['Sphinx', ('score_global', 'count')] == 2
@@ -0,0 +1,65 @@
+# coding: utf-8
+# TESTS DE LA RÉANALYSE INCRÉMENTALE À L'ÉDITION
+
+import pytest
+import nltk
+
+try:
+    nltk.data.find('tokenizers/punkt_tab/french')
+except LookupError:
+    pytest.skip("ressources NLTK punkt indisponibles", allow_module_level=True)
+
+from nltk.tokenize import word_tokenize
+
+from src.analyzer import SpeechAnalyzer
+from src.editing import EditSession
+
+DISCOURS = (
+    "Bonjour à tous. Aujourd'hui, je vais vous parler d'un projet excellent. "
+    "Premièrement, euh, il faut comprendre le problème. Ensuite, du coup, "
+    "nous verrons les solutions. Enfin, voilà ma conclusion."
+)
+
+
+def test_resultats_identiques_a_l_analyse_complete():
+    analyzer = SpeechAnalyzer()
+    session = EditSession(analyzer)
+    assert session.analyze(DISCOURS) == analyzer.analyze(DISCOURS)
+    assert session.analyze(DISCOURS, sentence_index=True) == \
+        analyzer.analyze(DISCOURS, sentence_index=True)
+    assert session.word_count(DISCOURS) == len(word_tokenize(DISCOURS, language='french'))
+
+
+def test_seules_les_phrases_modifiees_sont_recalculees():
+    analyzer = SpeechAnalyzer()
+    session = EditSession(analyzer)
+    session.analyze(DISCOURS)
+    assert session.last_computed == 5
+
+    modifie = DISCOURS.replace("le problème", "le problème difficile")
+    assert session.analyze(modifie, sentence_index=True) == \
+        analyzer.analyze(modifie, sentence_index=True)
+    assert (session.last_reused, session.last_computed) == (4, 1)
+
+    # Le compteur de mots profite du même cache
+    session.word_count(modifie + " Merci.")
+    assert (session.last_reused, session.last_computed) == (5, 1)
+
+
+def test_taille_du_cache_bornee():
+    session = EditSession(max_sentences=2)
+    session.analyze(DISCOURS)
+    assert len(session._records) == 2
+    session.clear()
+    assert session.analyze("")['stats']['word_count'] == 0
+
+
+def test_cache_de_l_analyseur_partage():
+    from src.cache import ResultCache
+    cache = ResultCache()
+    analyzer = SpeechAnalyzer(cache=cache)
+    session = EditSession(analyzer)
+    first = session.analyze(DISCOURS, sentence_index=True)
+    assert session.analyze(DISCOURS, sentence_index=True) == first
+    assert analyzer.analyze(DISCOURS, sentence_index=True) == first
+    assert (cache.hits, cache.misses) == (2, 1)
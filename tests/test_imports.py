@@ -0,0 +1,46 @@
+# coding: utf-8
+# TESTS DU TEMPS D'IMPORTATION
+# Les processus de calcul et les outils en ligne de commande importent
+# le package à chaque lancement : l'importation doit rester légère.
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Budget en secondes pour importer le package et ses modules principaux
+# (NLTK + TextBlob prennent à eux seuls 0,5 à 1 s)
+IMPORT_BUDGET = 0.25
+
+# Modules lourds qui ne doivent être chargés qu'au premier usage
+HEAVY_MODULES = ['nltk', 'textblob', 'numpy', 'pandas']
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src
+from src import SpeechAnalyzer, FeedbackGenerator
+from src.utils import clean_text
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed,
+                  'loaded': [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _measure():
+    output = subprocess.run(
+        [sys.executable, '-c', SCRIPT],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_sans_dependances_lourdes():
+    assert _measure()['loaded'] == []
+
+
+def test_budget_import():
+    # meilleur de trois mesures pour limiter le bruit de la machine
+    elapsed = min(_measure()['elapsed'] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"import en {elapsed:.3f}s (budget {IMPORT_BUDGET}s)"
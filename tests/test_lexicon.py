@@ -0,0 +1,38 @@
+# coding: utf-8
+# TESTS DU LEXIQUE DE SENTIMENT
+
+from src.lexicon import SentimentLexicon
+
+
+def test_lexique_par_defaut():
+    lexicon = SentimentLexicon.default()
+    assert lexicon.score(['un', 'excellent', 'projet', 'sans', 'échec']) == (1.0, 1.0, 2)
+
+
+def test_fichier_simple(tmp_path):
+    path = tmp_path / 'lexique.txt'
+    path.write_text("# commentaire\nravi;2\nnul;negative\nmoyen;0\n", encoding='utf-8')
+    lexicon = SentimentLexicon.from_file(str(path))
+    assert lexicon.weights == {'ravi': 2.0, 'nul': -1.0}
+    assert lexicon.name == 'lexique.txt'
+    assert lexicon.score(['ravi', 'mais', 'nul']) == (2.0, 1.0, 2)
+
+
+def test_fichier_feel_avec_en_tete(tmp_path):
+    path = tmp_path / 'FEEL.csv'
+    path.write_text(
+        "id;word;polarity;joy;fear\n1;abandon;negative;0;1\n2;Abondance;positive;1;0\n",
+        encoding='utf-8'
+    )
+    lexicon = SentimentLexicon.from_file(str(path))
+    assert lexicon.weights == {'abandon': -1.0, 'abondance': 1.0}
+
+
+def test_fichier_nrc(tmp_path):
+    path = tmp_path / 'nrc.txt'
+    path.write_text(
+        "joie\tjoy\t1\njoie\tpositive\t1\njoie\tnegative\t0\ndeuil\tnegative\t1\n",
+        encoding='utf-8'
+    )
+    lexicon = SentimentLexicon.from_file(str(path))
+    assert lexicon.weights == {'joie': 1.0, 'deuil': -1.0}
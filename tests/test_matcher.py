@@ -0,0 +1,38 @@
+# coding: utf-8
+# TESTS DE LA RECHERCHE DE LOCUTIONS
+
+from src.matcher import PhraseMatcher
+
+
+def test_expressions_multi_mots_et_positions():
+    matcher = PhraseMatcher(['en', 'en fait', 'du coup', 'euh'])
+    text = "Euh, en fait, du coup on y va en voiture."
+    assert matcher.find(text) == [
+        (0, 3, 'euh'), (5, 12, 'en fait'), (14, 21, 'du coup'), (30, 32, 'en')
+    ]
+    for start, end, phrase in matcher.find(text):
+        assert text[start:end].lower() == phrase
+
+
+def test_limites_de_mots():
+    assert PhraseMatcher(['quoi']).find("pourquoi ?") == []
+    assert PhraseMatcher(['après']).count("d'après lui") == {'après': 1}
+    assert PhraseMatcher(['après'], word_chars="'").count("d'après lui") == {}
+
+
+def test_grand_lexique():
+    phrases = ['mot%d' % i for i in range(5000)] + ['mot']
+    matcher = PhraseMatcher(phrases)
+    counts = matcher.count("mot12 mot mot4999 mot50000")
+    assert counts == {'mot12': 1, 'mot': 1, 'mot4999': 1}
+
+
+def test_lexique_vide():
+    assert PhraseMatcher([]).find("euh") == []
+
+
+def test_variantes_de_casse_rattachees_au_lexique():
+    matcher = PhraseMatcher(['disons', 'du coup'])
+    # ſ (s long) est accepté par IGNORECASE mais "diſons".lower() != "disons"
+    assert matcher.find("Diſons, DU COUP") == [(0, 6, 'disons'), (8, 15, 'du coup')]
+    assert matcher.count("diſons") == {'disons': 1}
@@ -0,0 +1,28 @@
+# coding: utf-8
+# TESTS DES MESURES DE PERFORMANCE
+
+from src.metrics import MetricsRegistry, StageTimer
+
+
+def test_chronometre_et_registre():
+    registry = MetricsRegistry()
+    timer = StageTimer(registry)
+    assert timer.measure('etape', sum, [1, 2, 3]) == 6
+    assert set(timer.timings['etape']) == {'wall_ms', 'cpu_ms', 'allocated_blocks'}
+    assert registry.stage_seconds.count(stage='etape') == 1
+
+
+def test_format_prometheus():
+    registry = MetricsRegistry()
+    requests = registry.counter('requetes_total', "Nombre de requêtes")
+    requests.inc(route='/analyze')
+    requests.inc(2, route='/analyze')
+    registry.histogram('duree_seconds', buckets=(0.1, 1.0)).observe(0.5)
+    registry.gauge('file_attente').set(4)
+    text = registry.render()
+    assert 'requetes_total{route="/analyze"} 3' in text
+    assert 'duree_seconds_bucket{le="0.1"} 0' in text
+    assert 'duree_seconds_bucket{le="1.0"} 1' in text
+    assert 'duree_seconds_bucket{le="+Inf"} 1' in text
+    assert 'duree_seconds_count 1' in text
+    assert '# TYPE file_attente gauge\nfile_attente 4' in text
@@ -0,0 +1,146 @@
+# coding: utf-8
+# TESTS DES MOTEURS DE RECONNAISSANCE
+# (serveur HTTP local à la place des services web)
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sr = pytest.importorskip('speech_recognition')
+pytest.importorskip('requests')
+
+from src.recognizers import (BACKENDS, BackendChain, GoogleBackend, RecognizerBackend,
+                             StubBackend, WitBackend, get_backend, register_backend)
+
+AUDIO = sr.AudioData(b'\x00\x10' * 16000, 16000, 2)
+
+
+class FakeService(BaseHTTPRequestHandler):
+    """
+    Imite les services web : /google, /wit, /erreur et /lent.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.requests.append((self.path, self.client_address, self.headers, body))
+        if self.path.startswith('/google'):
+            status, reply = 200, '{"result":[]}\n' + json.dumps(
+                {'result': [{'alternative': [{'transcript': 'bonjour google'}]}]})
+        elif self.path.startswith('/wit'):
+            status, reply = 200, json.dumps({'_text': 'bonjour wit'})
+        elif self.path.startswith('/lent'):
+            time.sleep(1)
+            status, reply = 200, '{}'
+        else:
+            status, reply = 500, 'panne'
+        data = reply.encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except ConnectionError:
+            # Client parti avant la réponse (délai dépassé)
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FakeService.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeService)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_registre():
+    assert {'google', 'sphinx', 'azure', 'wit', 'stub'} <= set(BACKENDS)
+    assert isinstance(get_backend('stub'), StubBackend)
+    with pytest.raises(ValueError):
+        get_backend('inconnu')
+
+
+def test_moteur_incomplet_refuse_a_l_enregistrement():
+    class Incomplet(RecognizerBackend):
+        name = 'incomplet'
+
+    with pytest.raises(TypeError):
+        register_backend(Incomplet)
+    assert 'incomplet' not in BACKENDS
+
+
+def test_google_et_connexion_reutilisee(server):
+    backend = GoogleBackend(url=server + '/google')
+    texts = [backend.recognize(AUDIO, 'fr-FR') for _ in range(3)]
+    assert texts == ['bonjour google'] * 3
+    path, _, headers, body = FakeService.requests[0]
+    assert 'lang=fr-FR' in path
+    assert headers['Content-Type'] == 'audio/x-flac; rate=16000'
+    assert body.startswith(b'fLaC')
+    # Une seule connexion pour les trois requêtes
+    assert len({client for _, client, _, _ in FakeService.requests}) == 1
+
+
+def test_cle_google_par_defaut_cherchee_une_fois(server, monkeypatch):
+    google = pytest.importorskip('speech_recognition.recognizers.google')
+    calls = []
+
+    def create_request_builder(endpoint, **options):
+        calls.append(endpoint)
+        return type('RequestBuilder', (), {'key': 'CLE_PAR_DEFAUT'})()
+
+    monkeypatch.delenv('GOOGLE_SPEECH_KEY', raising=False)
+    monkeypatch.setattr(google, 'create_request_builder', create_request_builder, raising=False)
+    monkeypatch.setattr(GoogleBackend, '_default_key_resolved', False)
+    monkeypatch.setattr(GoogleBackend, '_default_key', None)
+    backend = GoogleBackend(url=server + '/google')
+    for _ in range(3):
+        backend.recognize(AUDIO, 'fr-FR')
+    assert len(calls) == 1
+    assert all('key=CLE_PAR_DEFAUT' in path for path, _, _, _ in FakeService.requests)
+
+    monkeypatch.setenv('GOOGLE_SPEECH_KEY', 'CLE')
+    assert GoogleBackend().key == 'CLE'
+
+
+def test_cle_lue_dans_l_environnement(server, monkeypatch):
+    monkeypatch.delenv('WIT_AI_KEY', raising=False)
+    assert not WitBackend().configured
+    with pytest.raises(sr.RequestError):
+        WitBackend(url=server + '/wit').recognize(AUDIO, 'fr-FR')
+    monkeypatch.setenv('WIT_AI_KEY', 'CLE')
+    assert WitBackend(url=server + '/wit').recognize(AUDIO, 'fr-FR') == 'bonjour wit'
+    assert FakeService.requests[-1][2]['Authorization'] == 'Bearer CLE'
+
+
+def test_bascule_sur_le_moteur_suivant(server):
+    chain = BackendChain([GoogleBackend(url=server + '/erreur'),
+                          GoogleBackend(url=server + '/lent', timeout=0.2),
+                          StubBackend(text='secours')], 'fr-FR')
+    started = time.perf_counter()
+    assert chain(None, AUDIO) == 'secours'
+    assert time.perf_counter() - started < 1
+    assert chain.last_backend == 'stub'
+
+
+def test_parole_non_comprise_sans_bascule():
+    chain = BackendChain([StubBackend(text=''), StubBackend(text='secours')])
+    with pytest.raises(sr.UnknownValueError):
+        chain.recognize(AUDIO)
+
+
+def test_tous_les_moteurs_en_erreur(server):
+    chain = BackendChain([GoogleBackend(url=server + '/erreur')])
+    with pytest.raises(sr.RequestError, match='500'):
+        chain.recognize(AUDIO)
@@ -0,0 +1,45 @@
+# coding: utf-8
+# TESTS DES RÉSULTATS COMPACTS
+
+import pickle
+
+from src.feedback_generator import FeedbackGenerator
+from src.results import AnalysisResult, Feedback
+
+RESULTAT = {
+    'stats': {'word_count': 120, 'sentence_count': 8, 'avg_sentence_length': 15.0,
+              'unique_words': 80, 'vocabulary_richness': 66.7},
+    'sentiment': {'sentiment': 'Positif', 'polarity_score': 0.5, 'subjectivity': 0.3},
+    'fillers': {'total_fillers': 7, 'filler_details': {'euh': 5, 'bon': 2},
+                'filler_rate_percent': 5.83},
+    'clarity': {'clarity_level': 'Clair', 'clarity_score': 7, 'avg_sentence_length': 15.0,
+                'readability_score': 62.4, 'syllables_per_word': 1.71, 'long_word_ratio': 24.2,
+                'lix': 37.8, 'sentence_length_median': 13.5, 'sentence_length_p90': 21.0,
+                'sentence_length_max': 24},
+    'structure': {'has_structure': True, 'transition_count': 3, 'structure_score': 7.5},
+}
+
+
+def test_aller_retour_dictionnaire():
+    result = AnalysisResult.from_dict(RESULTAT)
+    assert result.to_dict() == RESULTAT
+    assert result['stats']['word_count'] == 120
+    assert result.fillers.filler_details == {'euh': 5, 'bon': 2}
+    assert not hasattr(result.stats, '__dict__')
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_anciens_resultats_sans_lisibilite():
+    # Résultats antérieurs aux indices de lisibilité (cache, fichiers JSONL)
+    ancien = dict(RESULTAT, clarity={'clarity_level': 'Clair', 'clarity_score': 7,
+                                     'avg_sentence_length': 15.0})
+    assert AnalysisResult.from_dict(ancien).clarity.readability_score == 0.0
+
+
+def test_feedback_compact():
+    generator = FeedbackGenerator()
+    expected = generator.generate(RESULTAT)
+    assert generator.generate(AnalysisResult.from_dict(RESULTAT)) == expected
+    feedback = generator.generate(RESULTAT, compact=True)
+    assert isinstance(feedback, Feedback)
+    assert feedback.to_dict() == expected
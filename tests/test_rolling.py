@@ -0,0 +1,77 @@
+# coding: utf-8
+# TESTS DES MESURES SUR FENÊTRE GLISSANTE
+
+import pytest
+import nltk
+
+try:
+    nltk.data.find('tokenizers/punkt_tab/french')
+except LookupError:
+    pytest.skip("ressources NLTK punkt indisponibles", allow_module_level=True)
+
+from src.analyzer import SpeechAnalyzer
+from src.rolling import RollingWindow
+
+ANALYZER = SpeechAnalyzer()
+
+# Morceaux de 5 mots
+CALME = "Le projet avance très bien."
+HESITANT = "Euh, du coup, c'est difficile."
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fenetre_en_secondes():
+    clock = FakeClock()
+    window = RollingWindow(ANALYZER, seconds=60, clock=clock)
+    # Une phrase calme de 5 mots toutes les 5 secondes pendant 2 minutes
+    for _ in range(24):
+        clock.now += 5
+        window.feed(CALME, timestamp=clock.now, duration=5)
+    results = window.results()
+    assert results['window'] == {'words': 60, 'seconds': 60.0, 'words_per_minute': 60.0}
+    assert results['sentiment']['sentiment'] == 'Positif'
+    assert results['fillers']['total_fillers'] == 0
+
+    # Trente secondes d'hésitations : la fenêtre bascule
+    for _ in range(6):
+        clock.now += 5
+        window.feed(HESITANT, timestamp=clock.now, duration=5)
+    results = window.results()
+    assert results['fillers']['filler_details'] == {'euh': 6, 'du coup': 6}
+    assert results['fillers']['filler_rate_percent'] == round(12 / 60 * 100, 2)
+
+    # Silence : les mots sortent de la fenêtre sans nouveau morceau
+    clock.now += 61
+    assert window.results()['window']['words'] == 0
+    assert window.results()['sentiment']['sentiment'] == 'Neutre'
+
+
+def test_fenetre_en_mots_et_memoire_bornee():
+    clock = FakeClock()
+    window = RollingWindow(ANALYZER, words=20, clock=clock)
+    for index in range(1000):
+        clock.now += 5
+        window.feed(HESITANT if index % 2 else CALME, timestamp=clock.now, duration=5)
+        assert len(window) <= 20
+    results = window.results()
+    assert results['window']['words'] == 20
+    # 20 mots prononcés en 20 secondes
+    assert results['window']['words_per_minute'] == 60.0
+    assert results['fillers']['total_fillers'] == 4
+
+    bounded = RollingWindow(ANALYZER, seconds=3600, max_words=50, clock=clock)
+    for _ in range(100):
+        bounded.feed(CALME, timestamp=clock.now)
+    assert len(bounded) == 50
+
+
+def test_fenetre_non_definie():
+    with pytest.raises(ValueError):
+        RollingWindow(ANALYZER)
@@ -0,0 +1,142 @@
+# coding: utf-8
+# TESTS DES RÈGLES DE FEEDBACK
+
+import json
+import pickle
+
+import pytest
+
+from src.feedback_generator import FeedbackGenerator
+from src.rules import FeedbackRules
+
+
+def _result(word_count=80, sentiment='Négatif', filler_rate=6.5, details=None,
+            clarity_score=5, has_structure=False):
+    return {
+        'stats': {'word_count': word_count},
+        'sentiment': {'sentiment': sentiment},
+        'fillers': {'filler_rate_percent': filler_rate,
+                    'filler_details': {'euh': 4, 'bon': 1} if details is None else details},
+        'clarity': {'clarity_score': clarity_score, 'clarity_level': 'Moyen'},
+        'structure': {'has_structure': has_structure, 'transition_count': 3,
+                      'structure_score': 4.0},
+    }
+
+
+def test_regles_par_defaut_identiques_au_feedback_historique():
+    feedback = FeedbackGenerator().generate(_result())
+    assert feedback == {
+        'score_global': 5.0,
+        'points_forts': [],
+        'points_amelioration': [
+            "Discours un peu court (80 mots)",
+            "Ton un peu négatif",
+            "Trop de mots de remplissage (6.5%)",
+            "Clarté à améliorer (Moyen)",
+            "Structure peu visible",
+        ],
+        'recommandations': [
+            "Développez davantage vos arguments avec des exemples concrets",
+            "Essayez d'adopter un ton plus positif et constructif",
+            "Vous utilisez beaucoup 'euh'. Faites des pauses silencieuses à la place.",
+            "Utilisez des phrases plus courtes et simples (15-20 mots maximum)",
+            "Ajoutez des mots de transition : 'Premièrement...', 'Ensuite...', 'Enfin...'",
+        ],
+    }
+    feedback = FeedbackGenerator().generate(_result(
+        word_count=300, sentiment='Positif', filler_rate=1.0, clarity_score=9, has_structure=True
+    ))
+    assert feedback['points_forts'] == [
+        "Longueur appropriée (300 mots)", "Ton positif et engageant",
+        "Très peu de mots de remplissage", "Message clair (Moyen)",
+        "Bonne structure avec 3 transitions",
+    ]
+    assert feedback['points_amelioration'] == feedback['recommandations'] == []
+
+
+def test_message_omis_si_mesure_calculee_absente():
+    feedback = FeedbackGenerator().generate(_result(details={}))
+    assert "Trop de mots de remplissage (6.5%)" in feedback['points_amelioration']
+    assert not any('Vous utilisez beaucoup' in r for r in feedback['recommandations'])
+
+
+def test_regles_audio_seulement_avec_la_section_audio():
+    result = _result(word_count=300)
+    result['audio'] = {'words_per_minute': 195.0, 'long_pause_count': 3, 'pause_max': 4.2}
+    feedback = FeedbackGenerator().generate(result)
+    assert "Débit rapide (195.0 mots/min)" in feedback['points_amelioration']
+    assert ("Longs silences (3 pauses de plus de 2 s, jusqu'à 4.2 s)"
+            in feedback['points_amelioration'])
+    # Sans audio (texte seul), les règles de débit ne s'appliquent pas
+    feedback = FeedbackGenerator().generate(_result(word_count=300))
+    assert not any('Débit' in point or 'silences' in point
+                   for point in feedback['points_forts'] + feedback['points_amelioration'])
+
+
+def test_message_omis_si_section_du_message_absente():
+    rules = FeedbackRules({'rules': [
+        {'name': 'debit', 'metric': 'stats.word_count', 'op': '>', 'value': 10,
+         'points_forts': "{stats.word_count} mots à {audio.words_per_minute:.0f} mots/min",
+         'recommandations': "Continuez ainsi"},
+    ]})
+    feedback = rules.evaluate(_result())
+    assert feedback['points_forts'] == []
+    assert feedback['recommandations'] == ["Continuez ainsi"]
+    result = _result()
+    result['audio'] = {'words_per_minute': 140.4}
+    assert rules.evaluate(result)['points_forts'] == ["80 mots à 140 mots/min"]
+
+
+def test_cache_du_feedback_sans_les_durees():
+    from src.cache import ResultCache
+    generator = FeedbackGenerator(cache=ResultCache())
+    first, second = _result(), _result()
+    first['timings'] = {'total': {'wall_ms': 3.2}}
+    second['timings'] = {'total': {'wall_ms': 4.1}}
+    second['sentences'] = {'starts': [0]}
+    assert generator.generate(first) == generator.generate(second)
+    assert generator.cache.stats()['hits'] == 1
+
+
+def test_table_personnalisee(tmp_path):
+    table = {
+        'name': 'étudiants',
+        'score': {'terms': [{'metric': 'clarity.clarity_score', 'weight': 1}]},
+        'rules': [
+            {'name': 'public', 'metric': 'sentiment.sentiment', 'op': 'in',
+             'value': ['Positif', 'Neutre'], 'points_forts': "Ton adapté"},
+            {'name': 'parasites', 'metric': 'fillers.filler_rate_percent', 'op': 'between',
+             'value': [3, 8], 'points_amelioration': "Parasites : {fillers.filler_rate_percent:.0f} %"},
+        ],
+    }
+    path = tmp_path / 'regles.json'
+    path.write_text(json.dumps(table, ensure_ascii=False), encoding='utf-8')
+    generator = FeedbackGenerator(rules=str(path))
+    assert generator.rules.name == 'étudiants'
+    assert generator.fingerprint != FeedbackGenerator().fingerprint
+    assert generator.generate(_result(sentiment='Neutre')) == {
+        'score_global': 5, 'points_forts': ["Ton adapté"],
+        'points_amelioration': ["Parasites : 6 %"], 'recommandations': [],
+    }
+
+    yaml = pytest.importorskip('yaml')
+    yaml_path = tmp_path / 'regles.yaml'
+    yaml_path.write_text(yaml.safe_dump(table, allow_unicode=True), encoding='utf-8')
+    assert FeedbackRules.from_file(str(yaml_path)).version == generator.rules.version
+
+
+def test_evaluation_par_lot_et_processus():
+    rules = FeedbackRules.default()
+    results = [_result(), _result(word_count=700, details={}), _result(has_structure=True)]
+    assert rules.evaluate_many(results) == [rules.evaluate(result) for result in results]
+    copy = pickle.loads(pickle.dumps(rules))
+    assert copy.evaluate(results[1]) == rules.evaluate(results[1])
+
+
+def test_regle_invalide():
+    with pytest.raises(ValueError, match='comparaison inconnue'):
+        FeedbackRules({'rules': [{'metric': 'stats.word_count', 'op': '~',
+                                  'value': 1, 'points_forts': 'x'}]})
+    with pytest.raises(ValueError, match='mesure invalide'):
+        FeedbackRules({'rules': [{'metric': 'word_count', 'op': '>',
+                                  'value': 1, 'points_forts': 'x'}]})
@@ -0,0 +1,145 @@
+# coding: utf-8
+# TESTS DU SERVICE HTTP D'ANALYSE
+
+import http.client
+import threading
+import time
+
+import pytest
+
+from src.server import AnalysisClient, AnalysisServer, AnalysisService, ServiceOverloaded
+
+
+class FakeAnalyzer:
+    fingerprint = 'analyzer-test'
+
+    def __init__(self, gate=None):
+        self.gate = gate
+
+    def warmup(self):
+        return self
+
+    def analyze(self, text, sentence_index=False):
+        if self.gate is not None:
+            self.gate.wait(5)
+        return {'stats': {'word_count': len(text.split())}}
+
+
+class FakeFeedback:
+    fingerprint = 'feedback-test'
+
+    def __init__(self):
+        self.batches = []
+
+    def generate_batch(self, results):
+        self.batches.append(len(results))
+        return [{'score_global': result['stats']['word_count']} for result in results]
+
+
+def test_regroupement_des_requetes():
+    feedback = FakeFeedback()
+    service = AnalysisService(FakeAnalyzer(), feedback, workers=1, batch_size=4, max_delay=0.2)
+    with service:
+        futures = [service.submit(f"mot {'x ' * i}") for i in range(8)]
+        results = [future.result(5) for future in futures]
+    assert [result['feedback']['score_global'] for result in results] == list(range(1, 9))
+    assert feedback.batches == [4, 4]
+    assert service.batch_sizes.count() == 2
+    assert service.latency.count() == 8
+
+
+def test_file_pleine():
+    gate = threading.Event()
+    service = AnalysisService(FakeAnalyzer(gate), FakeFeedback(), workers=1,
+                              batch_size=1, max_delay=0, max_queue=2)
+    with service:
+        first = service.submit("premier")
+        # Le premier discours est en cours d'analyse, la file se remplit
+        while service.health()['queue']:
+            time.sleep(0.01)
+        waiting = [service.submit("suivant"), service.submit("suivant")]
+        with pytest.raises(ServiceOverloaded):
+            service.submit("de trop")
+        assert service.rejected.value() == 1
+        gate.set()
+        assert first.result(5)['analysis'] == {'stats': {'word_count': 1}}
+        assert all(future.result(5) for future in waiting)
+
+
+def test_requete_multiple_refusee_sans_rien_mettre_en_file():
+    gate = threading.Event()
+    service = AnalysisService(FakeAnalyzer(gate), FakeFeedback(), workers=1,
+                              batch_size=1, max_delay=0, max_queue=3)
+    with service:
+        first = service.submit("premier")
+        while service.health()['queue']:
+            time.sleep(0.01)
+        waiting = service.submit("suivant")
+        # Deux places libres pour trois discours : aucun n'est mis en file
+        with pytest.raises(ServiceOverloaded):
+            service.submit_many(["a", "b", "c"])
+        assert service.health()['queue'] == 1
+        assert service.rejected.value() == 3
+        with pytest.raises(ValueError):
+            service.submit_many(["a"] * 4)
+        futures = service.submit_many(["a", "b c"])
+        gate.set()
+        assert [future.result(5)['analysis']['stats']['word_count']
+                for future in [first, waiting] + futures] == [1, 1, 1, 2]
+
+
+def test_pool_de_processus_identique_a_l_analyse_locale():
+    nltk = pytest.importorskip('nltk')
+    try:
+        nltk.data.find('tokenizers/punkt_tab/french')
+    except LookupError:
+        pytest.skip("ressources NLTK punkt indisponibles")
+    from src.analyzer import SpeechAnalyzer
+    from src.feedback_generator import FeedbackGenerator
+    texts = ["Bonjour à tous. Euh, du coup, nous allons commencer.",
+             "Premièrement, le projet avance. Ensuite, nous conclurons."] * 3
+    with AnalysisService(workers=2, batch_size=4) as service:
+        results = [future.result(30) for future in [service.submit(text) for text in texts]]
+        assert service.health()['status'] == 'ok'
+    analyzer, feedback = SpeechAnalyzer(), FeedbackGenerator()
+    for text, result in zip(texts, results):
+        assert result['analysis'] == analyzer.analyze(text)
+        assert result['feedback'] == feedback.generate(result['analysis'])
+
+
+@pytest.fixture
+def server():
+    service = AnalysisService(FakeAnalyzer(), FakeFeedback(), workers=1).start()
+    server = AnalysisServer(('127.0.0.1', 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def test_routes_http(server):
+    requests = pytest.importorskip('requests')
+    url = f'http://127.0.0.1:{server.server_port}'
+    client = AnalysisClient(url)
+    assert client.analyze("Bonjour à tous")['feedback'] == {'score_global': 3}
+    assert [result['feedback']['score_global']
+            for result in client.analyze_many(["un", "un deux"])] == [1, 2]
+    assert client.health()['status'] == 'ok'
+
+    assert requests.post(f'{url}/analyze', data=b'{"texte": 1}').status_code == 400
+    assert requests.get(f'{url}/inconnue').status_code == 404
+    for length in ('abc', '-1'):
+        # En-tête écrit tel quel (requests le recalculerait)
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=5)
+        connection.putrequest('POST', '/analyze')
+        connection.putheader('Content-Length', length)
+        connection.endheaders(b'{"text": "x"}')
+        response = connection.getresponse()
+        assert response.status == 400
+        assert response.getheader('Connection') == 'close'
+        connection.close()
+    metrics = requests.get(f'{url}/metrics').text
+    assert 'speech_server_requests_total{route="/analyze",status="200"} 2' in metrics
+    assert 'speech_server_requests_total{route="/analyze",status="400"} 3' in metrics
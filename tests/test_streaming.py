@@ -0,0 +1,92 @@
+# coding: utf-8
+# TESTS DE L'ANALYSE INCRÉMENTALE
+
+import pytest
+import nltk
+
+try:
+    nltk.data.find('tokenizers/punkt_tab/french')
+except LookupError:
+    pytest.skip("ressources NLTK punkt indisponibles", allow_module_level=True)
+
+from src.analyzer import SpeechAnalyzer
+from src.streaming import IncrementalAnalyzer, analyze_file, iter_sentence_chunks
+
+MORCEAUX = [
+    "Bonjour à tous.",
+    "Euh, aujourd'hui je vais vous parler d'un projet excellent.",
+    "Ensuite, du coup, nous verrons les problèmes.",
+    "",
+    "Enfin, voilà ma conclusion.",
+]
+
+
+def test_resultats_identiques_a_l_analyse_complete():
+    analyzer = SpeechAnalyzer()
+    live = IncrementalAnalyzer(analyzer)
+    for morceau in MORCEAUX:
+        live.feed(morceau)
+    assert live.chunk_count == 4
+    assert live.results() == analyzer.analyze(" ".join(MORCEAUX))
+
+
+def test_reinitialisation():
+    live = IncrementalAnalyzer()
+    live.feed("Euh, bon.")
+    live.reset()
+    assert live.results()['stats']['word_count'] == 0
+    assert live.results()['fillers']['filler_details'] == {}
+
+
+def test_morceaux_de_fichier_coupes_en_fin_de_phrase(tmp_path):
+    texte = "Première phrase évidente. " * 50 + "Dernière ?\n" + "sans ponctuation " * 40
+    chemin = tmp_path / 'archive.txt'
+    chemin.write_text(texte, encoding='utf-8')
+    # Blocs de 7 octets : les caractères accentués sont coupés entre deux blocs
+    morceaux = list(iter_sentence_chunks(str(chemin), chunk_chars=100, block_size=7))
+    assert "".join(morceaux) == texte
+    assert len(morceaux) > 10
+    assert all(m.rstrip()[-1] in ".?" for m in morceaux if "ponctuation" not in m)
+    # Sans ponctuation, la coupure se fait entre deux mots
+    assert all(m[-1].isspace() for m in morceaux[:-1])
+
+
+def test_analyse_de_fichier_identique_a_l_analyse_complete(tmp_path):
+    texte = " ".join(MORCEAUX * 30)
+    chemin = tmp_path / 'archive.txt'
+    chemin.write_text(texte, encoding='utf-8')
+    analyzer = SpeechAnalyzer()
+    assert analyze_file(str(chemin), analyzer, chunk_chars=500) == analyzer.analyze(texte)
+    assert analyze_file(str(chemin), analyzer, compact=True).to_dict() == analyzer.analyze(texte)
+
+
+def test_analyse_de_fichier_sans_ponctuation(tmp_path, monkeypatch):
+    from src import streaming
+    texte = ("Bonjour à tous. " + "euh nous parlons ensuite du projet excellent et voilà " * 20
+             + "\n" + "puis le budget reste un problème " * 10 + "fin")
+    chemin = tmp_path / 'brut.txt'
+    chemin.write_text(texte, encoding='utf-8')
+    analyzer = SpeechAnalyzer()
+    # Petits blocs : la seconde phrase est coupée entre deux mots plusieurs fois
+    monkeypatch.setattr(streaming, '_BLOCK_SIZE', 64)
+    assert len(list(iter_sentence_chunks(str(chemin), chunk_chars=100, block_size=64))) > 5
+    resultat = analyze_file(str(chemin), analyzer, chunk_chars=100)
+    assert resultat == analyzer.analyze(texte)
+    assert resultat['stats']['sentence_count'] == 2
+
+
+def test_repartition_des_longueurs_en_memoire_constante():
+    import numpy as np
+    from src.readability import LengthHistogram
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(1, 40, size=5000)
+    histogram = LengthHistogram(cap=64)
+    for part in np.array_split(lengths, 50):
+        histogram.add(part)
+    assert histogram.counts.shape == (65,)
+    assert histogram.percentile(50) == np.percentile(lengths, 50)
+    assert histogram.percentile(90) == np.percentile(lengths, 90)
+    # Phrase au-delà de la dernière case : maximum et total de mots exacts
+    histogram.add([500])
+    assert histogram.counts.shape == (65,) and histogram.counts[-1] == 1
+    assert histogram.maximum == 500 and histogram.words == int(lengths.sum()) + 500
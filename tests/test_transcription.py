@@ -0,0 +1,161 @@
+# coding: utf-8
+# TESTS DU SERVICE DE TRANSCRIPTION ASYNCHRONE
+# (fichiers WAV générés, reconnaissance simulée : ni micro ni réseau)
+
+import asyncio
+import math
+import struct
+import threading
+import time
+import wave
+
+import pytest
+
+sr = pytest.importorskip('speech_recognition')
+
+from src.transcription import TranscriptionJob, TranscriptionService
+
+RATE = 16000
+
+
+def write_wav(path, segments):
+    """
+    Écrit un WAV mono 16 bits : segments = [(durée, son)] avec son True
+    pour un signal de 440 Hz et False pour du silence.
+    """
+    frames = bytearray()
+    for duration, voiced in segments:
+        for i in range(int(duration * RATE)):
+            value = int(12000 * math.sin(2 * math.pi * 440 * i / RATE)) if voiced else 0
+            frames += struct.pack('<h', value)
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(bytes(frames))
+    return str(path)
+
+
+@pytest.fixture
+def wav(tmp_path):
+    return write_wav(tmp_path / 'discours.wav',
+                     [(0.5, False), (1.0, True), (1.0, False), (1.0, True), (1.0, False)])
+
+
+def make_service(wav, recognize, **kwargs):
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = False
+    recognizer.energy_threshold = 300
+    kwargs.setdefault('phrase_time_limit', 1.5)
+    return TranscriptionService(recognizer, lambda: sr.AudioFile(wav), recognize,
+                                listen_timeout=2, adjust_noise=0, **kwargs)
+
+
+def test_morceaux_dans_l_ordre(wav):
+    def recognize(recognizer, audio):
+        # Le premier morceau est reconnu plus lentement que les suivants
+        time.sleep(0.2 if not recognize.calls else 0)
+        recognize.calls += 1
+        return f"morceau {recognize.calls}"
+    recognize.calls = 0
+
+    chunks = asyncio.run(make_service(wav, recognize).collect())
+    assert len(chunks) >= 2
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[0].text == "morceau 1"
+    assert all(chunk.audio.frame_data for chunk in chunks)
+    # instants de capture croissants (horloge time.monotonic)
+    captured = [chunk.captured_at for chunk in chunks]
+    assert captured == sorted(captured) and captured[-1] <= time.monotonic()
+
+
+def test_ecoute_pendant_la_reconnaissance(wav):
+    listening = []
+    recognizer_listen = sr.Recognizer.listen
+
+    class Recognizer(sr.Recognizer):
+        def listen(self, *args, **kwargs):
+            listening.append(time.perf_counter())
+            return recognizer_listen(self, *args, **kwargs)
+
+    def recognize(recognizer, audio):
+        started = time.perf_counter()
+        time.sleep(0.3)
+        recognize.spans.append((started, time.perf_counter()))
+        return "texte"
+    recognize.spans = []
+
+    service = make_service(wav, recognize)
+    service.recognizer = Recognizer()
+    service.recognizer.dynamic_energy_threshold = False
+    asyncio.run(service.collect())
+    first_start, first_end = recognize.spans[0]
+    # L'écoute suivante a commencé avant la fin de la première reconnaissance
+    assert any(first_start <= t < first_end for t in listening)
+
+
+def test_erreurs_de_reconnaissance(wav):
+    def recognize(recognizer, audio):
+        raise sr.UnknownValueError()
+
+    chunks = asyncio.run(make_service(wav, recognize).collect())
+    assert chunks
+    assert all(chunk.text is None and chunk.error for chunk in chunks)
+
+
+def test_annulation_d_un_travail_en_cours(wav):
+    release = threading.Event()
+
+    def recognize(recognizer, audio):
+        release.wait(5)
+        return "texte"
+
+    job = TranscriptionJob(make_service(wav, recognize)).start()
+    time.sleep(0.2)
+    assert job.running
+    started = time.perf_counter()
+    job.cancel()
+    job.join(2)
+    release.set()
+    assert not job.running
+    assert time.perf_counter() - started < 2
+    assert job.error is None
+    assert job.snapshot() == []
+    assert job.drain() == []
+
+
+def test_arret_pendant_un_silence():
+    class SilentRecognizer:
+        # Micro sans parole : listen() expire après timeout secondes
+        def listen(self, source, timeout=None, phrase_time_limit=None):
+            assert timeout is not None
+            time.sleep(timeout)
+            raise sr.WaitTimeoutError()
+
+    class Source:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    service = TranscriptionService(SilentRecognizer(), Source, lambda recognizer, audio: "",
+                                   listen_timeout=0.2, adjust_noise=0)
+    job = TranscriptionJob(service).start()
+    time.sleep(0.5)
+    assert job.running
+    started = time.perf_counter()
+    job.cancel()
+    job.join(2)
+    assert not job.running
+    assert time.perf_counter() - started < 1
+    assert job.error is None
+
+
+def test_recuperation_des_nouveaux_morceaux(wav):
+    job = TranscriptionJob(make_service(wav, lambda recognizer, audio: "texte")).start()
+    job.join(10)
+    chunks = job.drain()
+    assert chunks and [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    # Morceaux récupérés : plus gardés par le travail
+    assert job.drain() == [] and job.snapshot() == []